@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Pool of long-lived headless LibreOffice workers for validating Office files.
+
+Each worker runs one soffice process with its own user profile, listening on a
+local socket, and converts documents to HTML over UNO, the same check that
+pack.validate_document() does with a fresh soffice per file. Workers are
+restarted when soffice dies, hangs past the timeout, or has converted
+max_files documents.
+
+pack.validate_document() submits files to shared_pool(), a pool started on
+first use and kept for the rest of the process.
+
+Requires the LibreOffice Python bindings (the "uno" module, e.g. python3-uno);
+without them, pack.validate_document() falls back to starting soffice per file.
+
+Example usage:
+    python soffice_pool.py [--workers N] [--timeout SECONDS] <office_file>...
+"""
+
+import argparse
+import atexit
+import bisect
+import concurrent.futures
+import math
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import uno
+except ImportError:
+    uno = None
+
+# HTML export filter for each document type
+HTML_FILTERS = {
+    ".docx": "HTML",
+    ".pptx": "impress_html_Export",
+    ".xlsx": "HTML (StarCalc)",
+}
+
+# Upper bounds (seconds) of the per-file latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+# Seconds to wait for a new soffice process to accept connections
+STARTUP_TIMEOUT = 60
+
+
+# Pool returned by shared_pool(), and whether it failed to start
+_shared_pool = None
+_shared_pool_failed = False
+_shared_pool_lock = threading.Lock()
+
+
+class SofficePoolError(RuntimeError):
+    """Raised when the pool cannot start or restart soffice workers."""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate Office files with a pool of soffice workers"
+    )
+    parser.add_argument("files", nargs="+", help="Office files (.docx/.pptx/.xlsx)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of soffice processes (default: 1)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30,
+        help="Seconds allowed per file before its worker is restarted (default: 30)",
+    )
+    args = parser.parse_args()
+
+    try:
+        with SofficePool(workers=args.workers, timeout=args.timeout) as pool:
+            results = pool.validate_many(args.files)
+            failed = 0
+            for path, (ok, error) in zip(args.files, results):
+                if ok:
+                    print(f"PASSED - {path}")
+                else:
+                    failed += 1
+                    print(f"FAILED - {path}: {error}")
+            print()
+            print(pool.format_stats())
+    except SofficePoolError as e:
+        sys.exit(f"Error: {e}")
+
+    sys.exit(1 if failed else 0)
+
+
+def shared_pool(workers=1):
+    """Return the process-wide pool, started on first use and closed at exit.
+
+    Args:
+        workers: Number of soffice processes, used when the pool is created
+
+    Returns:
+        SofficePool, or None if the UNO bindings or soffice are missing, or if
+        the pool failed to start on an earlier call
+
+    Raises:
+        SofficePoolError: If the pool fails to start
+    """
+    global _shared_pool, _shared_pool_failed
+    with _shared_pool_lock:
+        if _shared_pool is None and not _shared_pool_failed:
+            if not SofficePool.available():
+                return None
+            pool = SofficePool(workers=workers)
+            try:
+                pool.start()
+            except SofficePoolError:
+                _shared_pool_failed = True
+                raise
+            atexit.register(pool.close)
+            _shared_pool = pool
+        return _shared_pool
+
+
+class SofficePool:
+    """Fixed-size pool of soffice workers, safe to use from several threads.
+
+    Use as a context manager, or call start() and close(). validate() blocks
+    until a worker is free, so at most `workers` files are converted at once.
+    """
+
+    def __init__(self, workers=1, timeout=30, max_files=500, soffice="soffice"):
+        """
+        Args:
+            workers: Number of soffice processes
+            timeout: Seconds allowed per file; the worker is restarted after that
+            max_files: Restart a worker after converting this many files, to
+                bound memory growth in long-running soffice processes
+            soffice: soffice executable name or path
+        """
+        self.size = workers
+        self.timeout = timeout
+        self.max_files = max_files
+        self.soffice = soffice
+        self._workers = []
+        self._idle = queue.Queue()
+        self._temp_dir = None
+
+        self._stats_lock = threading.Lock()
+        self._files = 0
+        self._failures = 0
+        self._restarts = 0
+        self._latencies = []
+        self._histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._first_start = None
+        self._last_end = None
+
+    @classmethod
+    def available(cls, soffice="soffice"):
+        """Check whether the UNO bindings and the soffice executable exist."""
+        return uno is not None and shutil.which(soffice) is not None
+
+    def start(self):
+        """Start all workers. Raises SofficePoolError if soffice can't start."""
+        if uno is None:
+            raise SofficePoolError(
+                "LibreOffice Python bindings (uno) are not installed"
+            )
+        if self._workers:
+            return self
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="soffice-pool-")
+        try:
+            for index in range(self.size):
+                worker = _SofficeWorker(
+                    self.soffice, Path(self._temp_dir.name) / f"worker{index}"
+                )
+                self._workers.append(worker)
+                worker.start()
+                self._idle.put(worker)
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def close(self):
+        """Stop all workers and remove their profiles."""
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+        self._idle = queue.Queue()
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def validate(self, doc_path, timeout=None):
+        """Convert a document to HTML on a free worker.
+
+        Args:
+            doc_path: Path to a .docx, .pptx or .xlsx file
+            timeout: Seconds allowed for this file (default: the pool's timeout)
+
+        Returns:
+            tuple: (True, None) if the conversion succeeded, else (False, error)
+
+        Raises:
+            SofficePoolError: If a worker had to be restarted and failed to start
+        """
+        doc_path = Path(doc_path)
+        filter_name = HTML_FILTERS.get(doc_path.suffix.lower())
+        if filter_name is None:
+            return False, f"Unsupported file type: {doc_path.suffix}"
+        if not self._workers:
+            self.start()
+
+        worker = self._idle.get()
+        try:
+            # Replace workers that died, hung, or converted max_files files
+            if not worker.healthy or worker.files >= self.max_files:
+                if worker.process is not None:
+                    with self._stats_lock:
+                        self._restarts += 1
+                worker.restart()
+            started = time.perf_counter()
+            ok, error = worker.convert(
+                doc_path.resolve(), filter_name, timeout or self.timeout
+            )
+            ended = time.perf_counter()
+        finally:
+            self._idle.put(worker)
+        self._record(started, ended, ok)
+        return ok, error
+
+    def validate_many(self, paths, timeout=None):
+        """Validate several files, one per worker at a time.
+
+        Returns:
+            list: (ok, error) tuples in the order of paths
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda p: self.validate(p, timeout), paths))
+
+    def _record(self, started, ended, ok):
+        latency = ended - started
+        with self._stats_lock:
+            self._files += 1
+            if not ok:
+                self._failures += 1
+            self._latencies.append(latency)
+            self._histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            if self._first_start is None:
+                self._first_start = started
+            self._last_end = ended
+
+    def stats(self):
+        """Return throughput and latency statistics for the files validated so far.
+
+        Returns:
+            dict: files, failures, restarts, files_per_sec (over the time from
+            the first file's start to the last file's end), latency percentiles
+            in seconds, and histogram, a list of (upper bound or None, count)
+            buckets as defined by LATENCY_BUCKETS
+        """
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            elapsed = 0
+            if self._first_start is not None:
+                elapsed = self._last_end - self._first_start
+            bounds = LATENCY_BUCKETS + (None,)
+            return {
+                "files": self._files,
+                "failures": self._failures,
+                "restarts": self._restarts,
+                "files_per_sec": self._files / elapsed if elapsed else 0.0,
+                "latency_p50": _percentile(latencies, 0.50),
+                "latency_p95": _percentile(latencies, 0.95),
+                "latency_max": latencies[-1] if latencies else 0.0,
+                "histogram": list(zip(bounds, self._histogram)),
+            }
+
+    def format_stats(self):
+        """Return stats() as human-readable text."""
+        stats = self.stats()
+        lines = [
+            f"Files: {stats['files']} ({stats['failures']} failed, "
+            f"{stats['restarts']} worker restart(s))",
+            f"Throughput: {stats['files_per_sec']:.2f} files/sec",
+            f"Latency: p50 {stats['latency_p50']:.2f}s, "
+            f"p95 {stats['latency_p95']:.2f}s, max {stats['latency_max']:.2f}s",
+        ]
+        lower = 0
+        for bound, count in stats["histogram"]:
+            label = f"{lower:g}-{bound:g}s" if bound else f">{lower:g}s"
+            lines.append(f"  {label:>10}: {count}")
+            lower = bound
+        return "\n".join(lines)
+
+
+class _SofficeWorker:
+    """One headless soffice process, driven over a UNO socket connection."""
+
+    def __init__(self, soffice, profile_dir):
+        self.soffice = soffice
+        self.profile_dir = profile_dir
+        self.process = None
+        self.desktop = None
+        self.healthy = False
+        self.files = 0
+
+    def start(self):
+        try:
+            port = _free_port()
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            self.process = subprocess.Popen(
+                [
+                    self.soffice,
+                    "--headless",
+                    "--invisible",
+                    "--nologo",
+                    "--nodefault",
+                    "--norestore",
+                    "--nolockcheck",
+                    f"-env:UserInstallation={self.profile_dir.resolve().as_uri()}",
+                    f"--accept=socket,host=127.0.0.1,port={port};urp;",
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            raise SofficePoolError(f"Could not start {self.soffice}: {e}")
+
+        try:
+            self.desktop = self._connect(port)
+        except SofficePoolError:
+            self.stop()
+            raise
+        except Exception as e:  # UNO exceptions, e.g. from a broken install
+            self.stop()
+            raise SofficePoolError(f"Could not connect to soffice: {e}")
+        self.healthy = True
+        self.files = 0
+
+    def _connect(self, port):
+        """Connect once soffice listens and return its Desktop.
+
+        The first start of a worker also creates its profile, which is slow.
+        """
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        url = f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            if self.process.poll() is not None:
+                raise SofficePoolError(
+                    f"soffice exited with code {self.process.returncode} on startup"
+                )
+            try:
+                context = resolver.resolve(url)
+                break
+            except Exception as e:
+                if time.monotonic() > deadline:
+                    raise SofficePoolError(f"Could not connect to soffice: {e}")
+                time.sleep(0.25)
+
+        return context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def stop(self):
+        self.healthy = False
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass  # Already gone or hung; the process is stopped below
+            self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def convert(self, doc_path, filter_name, timeout):
+        """Convert doc_path to HTML, returning (ok, error).
+
+        The UNO calls block, so they run in a helper thread; if they don't
+        finish in time, soffice is killed and the worker marked unhealthy.
+        """
+        self.files += 1
+        result = {}
+        thread = threading.Thread(
+            target=self._convert, args=(doc_path, filter_name, result), daemon=True
+        )
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            self.healthy = False
+            self.process.kill()
+            return False, "Timeout during conversion"
+        if self.process.poll() is not None:
+            self.healthy = False
+        return result.get("ok", False), result.get("error")
+
+    def _convert(self, doc_path, filter_name, result):
+        document = None
+        try:
+            with tempfile.TemporaryDirectory(dir=self.profile_dir) as out_dir:
+                document = self.desktop.loadComponentFromURL(
+                    doc_path.as_uri(),
+                    "_blank",
+                    0,
+                    _properties(Hidden=True, ReadOnly=True),
+                )
+                if document is None:
+                    result["error"] = "Document could not be loaded"
+                    return
+                html_file = Path(out_dir) / f"{doc_path.stem}.html"
+                document.storeToURL(
+                    html_file.as_uri(), _properties(FilterName=filter_name)
+                )
+                if html_file.exists():
+                    result["ok"] = True
+                else:
+                    result["error"] = "Document validation failed"
+        except Exception as e:
+            result["error"] = str(e) or type(e).__name__
+        finally:
+            if document is not None:
+                try:
+                    document.close(True)
+                except Exception:
+                    pass  # Reported by the next conversion if soffice is broken
+
+
+def _properties(**values):
+    """Build a tuple of com.sun.star.beans.PropertyValue for UNO calls."""
+    properties = []
+    for name, value in values.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+def _free_port():
+    """Return a TCP port on localhost that is currently unused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values, fraction):
+    """Nearest-rank percentile of sorted values (0.0 if empty)."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+if __name__ == "__main__":
+    main()
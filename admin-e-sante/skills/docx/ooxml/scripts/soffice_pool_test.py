@@ -0,0 +1,177 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest import mock
+
+import pack
+import soffice_pool
+from soffice_pool import LATENCY_BUCKETS, SofficePool, SofficePoolError, _percentile
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# None of these tests need LibreOffice.
+class TestPercentile(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        self.assertEqual(_percentile([1, 2], 0.50), 1)
+        self.assertEqual(_percentile([1, 2, 3], 0.50), 2)
+        self.assertEqual(_percentile([1, 2, 3, 4], 0.50), 2)
+        values = list(range(1, 101))
+        self.assertEqual(_percentile(values, 0.50), 50)
+        self.assertEqual(_percentile(values, 0.95), 95)
+        self.assertEqual(_percentile(values, 1.0), 100)
+        self.assertEqual(_percentile([7], 0.95), 7)
+
+    def test_empty(self):
+        self.assertEqual(_percentile([], 0.95), 0.0)
+        self.assertEqual(_percentile([1, 2], 0.0), 1)
+
+
+class TestStats(unittest.TestCase):
+
+    def test_no_files(self):
+        stats = SofficePool().stats()
+        self.assertEqual(stats["files"], 0)
+        self.assertEqual(stats["files_per_sec"], 0.0)
+        self.assertEqual(stats["latency_p50"], 0.0)
+        self.assertEqual(stats["latency_max"], 0.0)
+        self.assertEqual(len(stats["histogram"]), len(LATENCY_BUCKETS) + 1)
+        self.assertTrue(all(count == 0 for _, count in stats["histogram"]))
+
+    def test_recorded_files(self):
+        pool = SofficePool()
+        # (start, end, ok): latencies 0.05, 0.1, 0.3, 1.5, 100
+        for started, latency, ok in [
+            (10.0, 0.05, True),
+            (10.0, 0.1, True),
+            (11.0, 0.3, False),
+            (12.0, 1.5, True),
+            (12.5, 100.0, True),
+        ]:
+            pool._record(started, started + latency, ok)
+
+        stats = pool.stats()
+        self.assertEqual(stats["files"], 5)
+        self.assertEqual(stats["failures"], 1)
+        self.assertEqual(stats["restarts"], 0)
+        # From the first start (10.0) to the last end (112.5)
+        self.assertAlmostEqual(stats["files_per_sec"], 5 / 102.5)
+        self.assertAlmostEqual(stats["latency_p50"], 0.3)
+        self.assertAlmostEqual(stats["latency_p95"], 100.0)
+        self.assertAlmostEqual(stats["latency_max"], 100.0)
+
+        # Bucket bounds are inclusive, the last bucket has no bound
+        histogram = dict(stats["histogram"])
+        self.assertEqual(histogram[0.1], 2)
+        self.assertEqual(histogram[0.5], 1)
+        self.assertEqual(histogram[2], 1)
+        self.assertEqual(histogram[None], 1)
+        self.assertEqual(sum(histogram.values()), 5)
+
+        lines = pool.format_stats().splitlines()
+        self.assertEqual(lines[0], "Files: 5 (1 failed, 0 worker restart(s))")
+        self.assertEqual(lines[1], "Throughput: 0.05 files/sec")
+        self.assertEqual(lines[2], "Latency: p50 0.30s, p95 100.00s, max 100.00s")
+        self.assertEqual(lines[3], "      0-0.1s: 2")
+        self.assertEqual(lines[4], "   0.1-0.25s: 0")
+        self.assertEqual(lines[-1], "        >60s: 1")
+        self.assertEqual(len(lines), 3 + len(LATENCY_BUCKETS) + 1)
+
+
+class TestMissingSoffice(unittest.TestCase):
+    """The UNO bindings are installed but the soffice executable is missing"""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.doc = Path(temp_dir.name) / "document.docx"
+        self.doc.write_bytes(b"")
+        for patcher in (
+            mock.patch.object(soffice_pool, "uno", mock.Mock()),
+            mock.patch.object(
+                soffice_pool.subprocess,
+                "Popen",
+                side_effect=FileNotFoundError(2, "No such file", "soffice"),
+            ),
+            mock.patch.multiple(
+                soffice_pool, _shared_pool=None, _shared_pool_failed=False
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_start_raises_pool_error(self):
+        pool = SofficePool(workers=2)
+        with self.assertRaisesRegex(SofficePoolError, "Could not start soffice"):
+            pool.start()
+        self.assertEqual(pool._workers, [])
+
+    def test_validate_document_falls_back(self):
+        completed = mock.Mock(stderr="")
+        stderr = io.StringIO()
+        with (
+            mock.patch.object(SofficePool, "available", return_value=True),
+            mock.patch.object(pack.subprocess, "run", return_value=completed) as run,
+            redirect_stderr(stderr),
+        ):
+            self.assertFalse(pack.validate_document(self.doc, pool=SofficePool()))
+            # The shared pool fails once, then is no longer tried
+            self.assertFalse(pack.validate_document(self.doc))
+            self.assertFalse(pack.validate_document(self.doc))
+        # The mocked soffice wrote no HTML, so each file fails validation
+        self.assertEqual(run.call_count, 3)
+        self.assertEqual(run.call_args[0][0][:2], ["soffice", "--headless"])
+        self.assertEqual(stderr.getvalue().count("soffice pool unavailable"), 2)
+        self.assertIsNone(soffice_pool.shared_pool())
+
+
+class TestSharedPool(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            soffice_pool, _shared_pool=None, _shared_pool_failed=False
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unavailable(self):
+        with mock.patch.object(SofficePool, "available", return_value=False):
+            self.assertIsNone(soffice_pool.shared_pool())
+
+    def test_created_once(self):
+        with (
+            mock.patch.object(SofficePool, "available", return_value=True),
+            mock.patch.object(SofficePool, "start") as start,
+            mock.patch.object(soffice_pool.atexit, "register") as register,
+        ):
+            pool = soffice_pool.shared_pool(workers=3)
+            self.assertIs(soffice_pool.shared_pool(workers=1), pool)
+        self.assertEqual(pool.size, 3)
+        start.assert_called_once_with()
+        register.assert_called_once_with(pool.close)
+
+    def test_validate_document_uses_shared_pool(self):
+        pool = mock.Mock()
+        pool.validate.return_value = (False, "broken")
+        stderr = io.StringIO()
+        with (
+            mock.patch.object(soffice_pool, "shared_pool", return_value=pool) as shared,
+            mock.patch.object(pack.subprocess, "run") as run,
+            redirect_stderr(stderr),
+        ):
+            self.assertFalse(pack.validate_document(Path("a.docx"), workers=2))
+            shared.assert_called_once_with(2)
+            run.assert_not_called()
+
+            # workers=0 starts soffice for the file
+            shared.reset_mock()
+            pack.validate_document(Path("a.docx"), workers=0)
+            shared.assert_not_called()
+            run.assert_called_once()
+        self.assertIn("Validation error: broken", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
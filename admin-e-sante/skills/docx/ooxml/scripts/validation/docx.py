@@ -2,13 +2,119 @@
 Validator for Word document XML files against XSD schemas.
 """
 
+import io
 import re
-import tempfile
-import zipfile
-
-import lxml.etree
 
 from .base import BaseSchemaValidator
+from .rules import ValidationRule, iterparse_elements
+
+# Word main namespace in Clark notation, for matching element tags
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+def _text_preview(text):
+    """Return a short repr of element text for error messages."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class _DocumentXmlRule(ValidationRule):
+    """Rule that only inspects document.xml parts."""
+
+    def wants_part(self, xml_file):
+        return xml_file.name == "document.xml"
+
+
+class WhitespacePreservationRule(_DocumentXmlRule):
+    """w:t elements with leading/trailing whitespace need xml:space='preserve'."""
+
+    END_TAGS = frozenset({W + "t"})
+    PART_LOCAL = True
+
+    def end(self, elem):
+        text = elem.text
+        # Check if text starts or ends with whitespace
+        if text and (re.match(r"^\s.*", text) or re.match(r".*\s$", text)):
+            # Check if xml:space="preserve" attribute exists
+            if elem.get(XML_SPACE) != "preserve":
+                self.errors.append(
+                    f"  {self.relative_path(self.xml_file)}: "
+                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+                )
+
+
+class DeletionRule(_DocumentXmlRule):
+    """w:t elements must not appear inside w:del (XSD does not catch this)."""
+
+    START_TAGS = frozenset({W + "del"})
+    END_TAGS = frozenset({W + "del", W + "t"})
+    PART_LOCAL = True
+
+    def begin_part(self, xml_file, root):
+        super().begin_part(xml_file, root)
+        self.del_depth = 0
+        return True
+
+    def start(self, elem):
+        self.del_depth += 1
+
+    def end(self, elem):
+        if elem.tag == W + "del":
+            self.del_depth -= 1
+        elif self.del_depth and elem.text:
+            self.errors.append(
+                f"  {self.relative_path(self.xml_file)}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+
+class InsertionRule(_DocumentXmlRule):
+    """w:delText is only allowed inside w:ins when nested within a w:del."""
+
+    START_TAGS = frozenset({W + "ins", W + "del"})
+    END_TAGS = frozenset({W + "ins", W + "del", W + "delText"})
+    PART_LOCAL = True
+
+    def begin_part(self, xml_file, root):
+        super().begin_part(xml_file, root)
+        self.depth = {W + "ins": 0, W + "del": 0}
+        return True
+
+    def start(self, elem):
+        self.depth[elem.tag] += 1
+
+    def end(self, elem):
+        if elem.tag in self.depth:
+            self.depth[elem.tag] -= 1
+        elif self.depth[W + "ins"] and not self.depth[W + "del"]:
+            self.errors.append(
+                f"  {self.relative_path(self.xml_file)}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
+
+
+class ParagraphCountRule(_DocumentXmlRule):
+    """Count w:p elements in document.xml (not a validation check)."""
+
+    START_TAGS = frozenset({W + "p"})
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.count = 0
+
+    def begin_part(self, xml_file, root):
+        super().begin_part(xml_file, root)
+        self.part_count = 0
+        return True
+
+    def start(self, elem):
+        self.part_count += 1
+
+    def end_part(self):
+        self.count = self.part_count
+
+    def part_error(self, xml_file, error):
+        self.errors.append(f"Error counting paragraphs in unpacked document: {error}")
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -21,6 +127,13 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    RULES = BaseSchemaValidator.RULES + (
+        WhitespacePreservationRule,
+        DeletionRule,
+        InsertionRule,
+        ParagraphCountRule,
+    )
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
@@ -73,43 +186,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors(WhitespacePreservationRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
@@ -126,39 +203,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors(DeletionRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} deletion validation violations:")
@@ -172,37 +217,27 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
     def count_paragraphs_in_unpacked(self):
         """Count the number of paragraphs in the unpacked document."""
-        count = 0
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
-            except Exception as e:
-                print(f"Error counting paragraphs in unpacked document: {e}")
-
-        return count
+        rule = self._get_rule(ParagraphCountRule)
+        for error in rule.errors:
+            print(error)
+        return rule.count
 
     def count_paragraphs_in_original(self):
         """Count the number of paragraphs in the original docx file."""
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+            if self.streaming:
+                # Stream document.xml from the original package
+                data = io.BytesIO(self.original_package.read("word/document.xml"))
+                count = sum(
+                    1
+                    for event, elem in iterparse_elements(data)
+                    if event == "start" and elem.tag == W + "p"
+                )
+            else:
+                # Parse document.xml straight from the original package
+                root = self.original_package.parse("word/document.xml").getroot()
 
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
@@ -218,37 +253,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors(InsertionRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} insertion validation violations:")
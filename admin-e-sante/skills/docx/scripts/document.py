@@ -14,14 +14,18 @@ Usage:
     node = doc["word/document.xml"].get_node(tag="w:p", line_number=10)
 
     # Add comments
-    doc.add_comment(start=node, end=node, text="Comment text")
-    doc.reply_to_comment(parent_comment_id=0, text="Reply text")
+    comment_id = doc.add_comment(start=node, end=node, text="Comment text")
+    doc.reply_to_comment(parent_comment_id=comment_id, text="Reply text")
 
     # Suggest tracked changes
     doc["word/document.xml"].suggest_deletion(node)  # Delete content
     doc["word/document.xml"].revert_insertion(ins_node)  # Reject insertion
     doc["word/document.xml"].revert_deletion(del_node)  # Reject deletion
 
+    # Apply many edits together
+    with doc.batch():
+        doc["word/document.xml"].replace_node(node, "<w:r><w:t>new</w:t></w:r>")
+
     # Save
     doc.save()
 """
@@ -30,11 +34,20 @@ import html
 import random
 import shutil
 import tempfile
-from datetime import datetime, timezone
+import time
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 
+import lxml.etree
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.pack import (
+    MANIFEST_NAME,
+    link_or_copy,
+    materialize_parts,
+    pack_document,
+    read_manifest,
+    write_manifest,
+)
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
@@ -43,6 +56,66 @@ from .utilities import XMLEditor
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Elements whose w:id values come from the same allocator, so tracked changes and
+# comments never share an ID
+ANNOTATION_ID_TAGS = (
+    "w:ins",
+    "w:del",
+    "w:comment",
+    "w:commentRangeStart",
+    "w:commentRangeEnd",
+    "w:commentReference",
+)
+
+# Namespace of the w: prefix; parts may bind it to another prefix
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# ANNOTATION_ID_TAGS as (namespace URI, local name), and in Clark notation
+_ANNOTATION_ID_NAMES = frozenset(
+    (W_NAMESPACE, tag.split(":")[1]) for tag in ANNOTATION_ID_TAGS
+)
+_ANNOTATION_ID_CLARK_TAGS = frozenset(
+    f"{{{namespace}}}{name}" for namespace, name in _ANNOTATION_ID_NAMES
+)
+
+
+class _ChangeIdAllocator:
+    """Hands out w:id values for tracked changes and comments.
+
+    Seeded once with the next free ID; IDs handed out or found in inserted
+    content move it forward, so the document is never rescanned.
+    """
+
+    def __init__(self, next_id=0):
+        self.next_id = next_id
+
+    def allocate(self):
+        """Return a new ID."""
+        change_id = self.next_id
+        self.next_id += 1
+        return change_id
+
+    def reserve(self, value):
+        """Make sure an ID already in use (a w:id string) is never handed out."""
+        try:
+            self.next_id = max(self.next_id, int(value) + 1)
+        except ValueError:
+            pass
+
+
+class _AnnotationIdScanner:
+    """lxml parser target reserving the w:id of every annotation element."""
+
+    def __init__(self, change_ids):
+        self.change_ids = change_ids
+
+    def start(self, tag, attrib):
+        if tag in _ANNOTATION_ID_CLARK_TAGS:
+            self.change_ids.reserve(attrib.get(f"{{{W_NAMESPACE}}}id", ""))
+
+    def close(self):
+        return self.change_ids
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -57,7 +130,12 @@ class DocxXMLEditor(XMLEditor):
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        change_ids=None,
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,25 +144,31 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            change_ids: ID allocator shared with other parts of the same package
+                (default: one seeded from this file on first use)
         """
         super().__init__(xml_path)
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self._change_ids = change_ids
+
+    def _get_change_ids(self):
+        """Get the change ID allocator.
+
+        Unless the editor shares its allocator with a Document, the first call
+        seeds it with one scan of the tracked change and comment elements.
+        """
+        if self._change_ids is None:
+            self._change_ids = _ChangeIdAllocator()
+            for elem in self._iter_elements(self._root_element()):
+                if (elem.namespaceURI, elem.localName) in _ANNOTATION_ID_NAMES:
+                    self._change_ids.reserve(elem.getAttributeNS(W_NAMESPACE, "id"))
+        return self._change_ids
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Allocate the next available change ID."""
+        return self._get_change_ids().allocate()
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
@@ -125,12 +209,22 @@ class DocxXMLEditor(XMLEditor):
         - w16cex:commentExtensible: gets w16cex:dateUtc
 
         Args:
-            nodes: List of DOM nodes to process
+            nodes: List of DOM nodes to process (already in the document)
         """
         from datetime import datetime, timezone
 
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
+        # Seeded before the nodes leave the lookup indexes below
+        change_ids = self._get_change_ids()
+        # Namespace declarations are added once, after the walk
+        required_namespaces = set()
+
+        def reserve_change_id(elem):
+            # Keep IDs already present in inserted content out of later allocations
+            if elem.hasAttribute("w:id"):
+                change_ids.reserve(elem.getAttribute("w:id"))
+
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
             parent = elem.parentNode
@@ -149,15 +243,15 @@ class DocxXMLEditor(XMLEditor):
                 elem.setAttribute("w:rsidP", self.rsid)
             # Add w14:paraId and w14:textId if not present
             if not elem.hasAttribute("w14:paraId"):
-                self._ensure_w14_namespace()
+                required_namespaces.add("w14")
                 elem.setAttribute("w14:paraId", _generate_hex_id())
             if not elem.hasAttribute("w14:textId"):
-                self._ensure_w14_namespace()
+                required_namespaces.add("w14")
                 elem.setAttribute("w14:textId", _generate_hex_id())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, inside_deletion):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
+            if inside_deletion:
                 if not elem.hasAttribute("w:rsidDel"):
                     elem.setAttribute("w:rsidDel", self.rsid)
             else:
@@ -166,20 +260,21 @@ class DocxXMLEditor(XMLEditor):
 
         def add_tracked_change_attrs(elem):
             # Auto-assign w:id if not present
-            if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
+            if elem.hasAttribute("w:id"):
+                reserve_change_id(elem)
+            else:
+                elem.setAttribute("w:id", str(change_ids.allocate()))
             if not elem.hasAttribute("w:author"):
                 elem.setAttribute("w:author", self.author)
             if not elem.hasAttribute("w:date"):
                 elem.setAttribute("w:date", timestamp)
             # Add w16du:dateUtc for tracked changes (same as w:date since we generate UTC timestamps)
-            if elem.tagName in ("w:ins", "w:del") and not elem.hasAttribute(
-                "w16du:dateUtc"
-            ):
-                self._ensure_w16du_namespace()
+            if not elem.hasAttribute("w16du:dateUtc"):
+                required_namespaces.add("w16du")
                 elem.setAttribute("w16du:dateUtc", timestamp)
 
         def add_comment_attrs(elem):
+            reserve_change_id(elem)
             if not elem.hasAttribute("w:author"):
                 elem.setAttribute("w:author", self.author)
             if not elem.hasAttribute("w:date"):
@@ -190,7 +285,7 @@ class DocxXMLEditor(XMLEditor):
         def add_comment_extensible_date(elem):
             # Add w16cex:dateUtc for comment extensible elements
             if not elem.hasAttribute("w16cex:dateUtc"):
-                self._ensure_w16cex_namespace()
+                required_namespaces.add("w16cex")
                 elem.setAttribute("w16cex:dateUtc", timestamp)
 
         def add_xml_space_to_t(elem):
@@ -204,62 +299,57 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+            "w:commentRangeStart": reserve_change_id,
+            "w:commentRangeEnd": reserve_change_id,
+            "w:commentReference": reserve_change_id,
+        }
+
+        # Attribute values are indexed for get_node()
+        self._unindex_nodes(nodes)
         for node in nodes:
             if node.nodeType != node.ELEMENT_NODE:
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
-
-    def replace_node(self, elem, new_content):
-        """Replace node with automatic attribute injection."""
-        nodes = super().replace_node(elem, new_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_after(self, elem, xml_content):
-        """Insert after with automatic attribute injection."""
-        nodes = super().insert_after(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_before(self, elem, xml_content):
-        """Insert before with automatic attribute injection."""
-        nodes = super().insert_before(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def append_to(self, elem, xml_content):
-        """Append to with automatic attribute injection."""
-        nodes = super().append_to(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
+            # Walk the node and its descendants once, in document order, carrying
+            # whether the current element is inside a w:del
+            stack = [(node, is_inside_deletion(node))]
+            while stack:
+                elem, inside_deletion = stack.pop()
+                tag = elem.tagName
+                if tag == "w:r":
+                    add_rsid_to_r(elem, inside_deletion)
+                elif tag in handlers:
+                    handlers[tag](elem)
+                inside_deletion = inside_deletion or tag == "w:del"
+                stack.extend(
+                    (child, inside_deletion)
+                    for child in reversed(elem.childNodes)
+                    if child.nodeType == child.ELEMENT_NODE
+                )
+
+        if "w14" in required_namespaces:
+            self._ensure_w14_namespace()
+        if "w16du" in required_namespaces:
+            self._ensure_w16du_namespace()
+        if "w16cex" in required_namespaces:
+            self._ensure_w16cex_namespace()
+        self._index_nodes(nodes)
+
+    def apply_edits(self, edits):
+        """Apply edits with automatic attribute injection, once for all of them.
+
+        replace_node, insert_after, insert_before and append_to go through here.
+        """
+        results = super().apply_edits(edits)
+        self._inject_attributes_to_nodes([node for nodes in results for node in nodes])
+        return results
 
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
@@ -300,6 +390,7 @@ class DocxXMLEditor(XMLEditor):
             )
 
         # Process all insertions - wrap all children in w:del
+        self._unindex_nodes([elem])
         for ins_elem in ins_elements:
             runs = list(ins_elem.getElementsByTagName("w:r"))
             if not runs:
@@ -337,6 +428,7 @@ class DocxXMLEditor(XMLEditor):
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+        self._index_nodes([elem])
         return [elem]
 
     def revert_deletion(self, elem):
@@ -499,6 +591,7 @@ class DocxXMLEditor(XMLEditor):
             # Check for existing w:delText
             if elem.getElementsByTagName("w:delText"):
                 raise ValueError("w:r element already contains w:delText")
+            self._unindex_nodes([elem])
 
             # Convert w:t → w:delText
             for t_elem in list(elem.getElementsByTagName("w:t")):
@@ -529,6 +622,7 @@ class DocxXMLEditor(XMLEditor):
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+            self._index_nodes([del_wrapper])
             return del_wrapper
 
         elif elem.nodeName == "w:p":
@@ -539,6 +633,7 @@ class DocxXMLEditor(XMLEditor):
             # Check if it's a numbered list item
             pPr_list = elem.getElementsByTagName("w:pPr")
             is_numbered = pPr_list and pPr_list[0].getElementsByTagName("w:numPr")
+            self._unindex_nodes([elem])
 
             if is_numbered:
                 # Add <w:del/> to w:rPr in w:pPr
@@ -587,6 +682,7 @@ class DocxXMLEditor(XMLEditor):
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+            self._index_nodes([elem])
             return elem
 
         else:
@@ -619,6 +715,8 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        overlay=False,
+        incremental_validation=False,
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,6 +728,15 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            overlay: If True, read parts straight from unpacked_dir and keep only the
+                changed parts in a temporary overlay, instead of copying the whole
+                directory (default: False). save() then writes back only those parts,
+                and the validation baseline is packed the first time it is needed.
+                XML parts a lazy unpack left in the source file are extracted into
+                the temporary directory; unpacked_dir is only written by save().
+            incremental_validation: If True, validate() skips the XSD and part-local
+                checks for parts whose content is unchanged from the original
+                (default: False, every part is checked).
         """
         self.original_path = Path(unpacked_dir)
 
@@ -638,12 +745,37 @@ class Document:
 
         # Create temporary directory with subdirectories for unpacked content and baseline
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
-        self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
-
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        self.overlay = overlay
+        self.incremental_validation = incremental_validation
+        self.original_docx = None
+        if overlay:
+            # Changed and new parts only; everything else is read from the original
+            self.unpacked_path = Path(self.temp_dir) / "overlay"
+            (self.unpacked_path / "word").mkdir(parents=True)
+            # XML parts a lazy unpack left in the source file, extracted into a
+            # cache instead of the original directory
+            self._lazy_path = Path(self.temp_dir) / "lazy"
+            self._lazy_path.mkdir()
+            manifest = read_manifest(self.original_path)
+            if manifest:
+                write_manifest(self._lazy_path, manifest)
+                materialize_parts(self._lazy_path, ["*.xml", "*.rels"])
+            # Original content of the parts save() wrote over, for the baseline
+            self._replaced_parts = {}
+        else:
+            self.unpacked_path = Path(self.temp_dir) / "unpacked"
+            shutil.copytree(self.original_path, self.unpacked_path)
+            # Parts a lazy unpack left in the source file go into the copy only
+            materialize_parts(self.unpacked_path)
+
+            # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
+            self.original_docx = Path(self.temp_dir) / "original.docx"
+            pack_document(
+                self.original_path,
+                self.original_docx,
+                validate=False,
+                reuse_unchanged=True,  # Copy parts unedited since unpack.py as is
+            )
 
         self.word_path = self.unpacked_path / "word"
 
@@ -657,6 +789,13 @@ class Document:
 
         # Cache for lazy-loaded editors
         self._editors = {}
+        # Editors returned by doc[...], whose DOM may have been changed directly
+        self._handed_out = set()
+        self._batch = None  # ExitStack of the editors' batches inside batch()
+        self._save_stats = {}  # See save_stats()
+
+        # One w:id allocator for tracked changes and comments in every part
+        self._change_ids = _ChangeIdAllocator(self._scan_annotation_ids())
 
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
@@ -664,12 +803,11 @@ class Document:
         self.comments_ids_path = self.word_path / "commentsIds.xml"
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
-        # Load existing comments and determine next ID (before setup modifies files)
+        # Load existing comments (before setup modifies files)
         self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
 
         # Convenient access to document.xml editor (semi-private)
-        self._document = self["word/document.xml"]
+        self._document = self._editor("word/document.xml")
 
         # Setup tracked changes infrastructure
         self._setup_tracking(track_revisions=track_revisions)
@@ -700,16 +838,71 @@ class Document:
             # Get node from comments.xml
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
+        editor = self._editor(xml_path)
+        self._handed_out.add(xml_path)
+        return editor
+
+    def _editor(self, xml_path):
+        """Get or create the editor of an XML file, like doc[xml_path].
+
+        Editors got this way are only saved when their editing methods changed
+        them, so the Document's own reads don't rewrite parts.
+        """
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
-            if not file_path.exists():
+            source_path = self._source_path(file_path)
+            if not source_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+            editor = DocxXMLEditor(
+                source_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                change_ids=self._change_ids,
             )
+            if source_path != file_path:
+                # Saved into the overlay, never over the original
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                editor.xml_path = file_path
+            self._editors[xml_path] = editor
+            if self._batch is not None:
+                self._batch.enter_context(self._editors[xml_path].batch())
         return self._editors[xml_path]
 
+    @contextmanager
+    def batch(self):
+        """
+        Queue the edits of all XML files in a with block and apply them at its end.
+
+        Each file's fragments are parsed in one pass and get their attributes
+        injected once (see XMLEditor.batch()). replace_node, insert_after,
+        insert_before and append_to are queued, including those made by
+        add_comment(); they return empty lists that are filled when the
+        block ends. Other methods change the document right away. Lookups
+        see the document as it was before the block, so a comment added in
+        the block can't be replied to in the same block.
+
+        Example:
+            with doc.batch():
+                for para_id, xml in replacements.items():
+                    para = doc["word/document.xml"].get_node(
+                        tag="w:p", attrs={"w14:paraId": para_id}
+                    )
+                    doc["word/document.xml"].replace_node(para, xml)
+        """
+        if self._batch is not None:
+            yield  # Nested: the outer block applies the edits
+            return
+        with ExitStack() as stack:
+            for editor in self._editors.values():
+                stack.enter_context(editor.batch())
+            self._batch = stack
+            try:
+                yield
+            finally:
+                self._batch = None
+
     def add_comment(self, start, end, text: str) -> int:
         """
         Add a comment spanning from one element to another.
@@ -727,40 +920,7 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
-
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
-
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
-
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
-
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
-
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
-
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
-
-        self.next_comment_id += 1
-        return comment_id
+        return self.add_comments([(start, end, text)])[0]
 
     def reply_to_comment(
         self,
@@ -780,55 +940,109 @@ class Document:
         Example:
             cm.reply_to_comment(parent_comment_id=0, text="I agree with this change")
         """
-        if parent_comment_id not in self.existing_comments:
-            raise ValueError(f"Parent comment with id={parent_comment_id} not found")
+        return self.add_comments([(None, None, text, parent_comment_id)])[0]
 
-        parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    def add_comments(self, comments) -> list:
+        """
+        Add many comments and replies at once.
 
-        # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
-            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
-        )
-        parent_ref_elem = self._document.get_node(
-            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
-        )
+        Gives the same result as calling add_comment() and reply_to_comment() for
+        each of them in order, but the comments are added to each comments part
+        in a single edit, and their range markers to document.xml in one batch.
 
-        self._document.insert_after(
-            parent_start_elem, self._comment_range_start_xml(comment_id)
-        )
-        parent_ref_run = parent_ref_elem.parentNode
-        self._document.insert_after(
-            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
-        )
-        self._document.insert_after(
-            parent_ref_run, self._comment_ref_run_xml(comment_id)
-        )
+        Args:
+            comments: (start, end, text) tuples for comments, like add_comment(),
+                and (None, None, text, parent_comment_id) tuples for replies,
+                like reply_to_comment(); parents must exist before the call
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        Returns:
+            The comment IDs that were created, in order
 
-        # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
+        Raises:
+            ValueError: If a parent comment is not found or a reply has a start
+                or end; nothing is added then
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        Example:
+            doc.add_comments([
+                (para1, para1, "Dosage missing"),
+                (run, run, "Check the date"),
+                (None, None, "Agreed", 0),  # Reply to comment 0
+            ])
+        """
+        entries = []
+        for start, end, text, *parent in comments:
+            parent_comment_id = parent[0] if parent else None
+            if parent_comment_id is not None:
+                if parent_comment_id not in self.existing_comments:
+                    raise ValueError(
+                        f"Parent comment with id={parent_comment_id} not found"
+                    )
+                if start is not None or end is not None:
+                    raise ValueError(
+                        "Replies are anchored at their parent's range; "
+                        "pass None as start and end"
+                    )
+            entries.append((start, end, text, parent_comment_id))
+
+        comment_ids = []
+        para_ids = []
+        comments_xml = []
+        comments_extended_xml = []
+        comments_ids_xml = []
+        comments_extensible_xml = []
+
+        # Add comment ranges to document.xml, applied together when the batch ends
+        with self._document.batch():
+            for start, end, text, parent_comment_id in entries:
+                comment_id = self._change_ids.allocate()
+                para_id = _generate_hex_id()
+                durable_id = _generate_hex_id()
+
+                if parent_comment_id is None:
+                    parent_para_id = None
+                    self._insert_comment_range(comment_id, start, end)
+                else:
+                    parent_para_id = self.existing_comments[parent_comment_id][
+                        "para_id"
+                    ]
+                    self._insert_reply_range(comment_id, parent_comment_id)
+
+                comments_xml.append(self._comment_xml(comment_id, para_id, text))
+                comments_extended_xml.append(
+                    self._comment_extended_xml(para_id, parent_para_id)
+                )
+                comments_ids_xml.append(self._comment_ids_xml(para_id, durable_id))
+                comments_extensible_xml.append(
+                    self._comment_extensible_xml(durable_id)
+                )
+                comment_ids.append(comment_id)
+                para_ids.append(para_id)
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        if not comment_ids:
+            return comment_ids
 
         # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        for comment_id, para_id in zip(comment_ids, para_ids):
+            self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
-        return comment_id
+        # Add to the four comments parts, one edit each
+        self._append_to_comments_part(
+            self.comments_path, "w:comments", "".join(comments_xml)
+        )
+        self._append_to_comments_part(
+            self.comments_extended_path,
+            "w15:commentsEx",
+            "".join(comments_extended_xml),
+        )
+        self._append_to_comments_part(
+            self.comments_ids_path, "w16cid:commentsIds", "".join(comments_ids_xml)
+        )
+        self._append_to_comments_part(
+            self.comments_extensible_path,
+            "w16cex:commentsExtensible",
+            "".join(comments_extensible_xml),
+        )
+        return comment_ids
 
     def __del__(self):
         """Clean up temporary directory on deletion."""
@@ -842,12 +1056,32 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
+        if self.overlay:
+            # The validators need the whole document in one directory
+            view_path = self._build_view(
+                Path(self.temp_dir) / "view", self._overlay_parts()
+            )
+            materialize_parts(view_path)
+            try:
+                self._run_validators(view_path)
+            finally:
+                shutil.rmtree(view_path)
+        else:
+            self._run_validators(self.unpacked_path)
+
+    def _run_validators(self, unpacked_path):
+        """Validate an unpacked directory against the original document."""
+        original_docx = self._get_original_docx()
+
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            unpacked_path,
+            original_docx,
+            verbose=False,
+            incremental=self.incremental_validation,
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            unpacked_path, original_docx, verbose=False
         )
 
         # Run validations
@@ -861,19 +1095,36 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Files opened with doc[...] are always written, since their DOM may have
+        been changed directly; files the Document only read internally are not
+        rewritten. See save_stats().
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if self._part_exists(self.comments_path):
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
-        # Save all modified XML files in temp directory
-        for editor in self._editors.values():
-            editor.save()
+        # Save all modified XML files in temp directory; editors only read from
+        # by the Document itself are left alone
+        stats = {
+            "parts_written": 0,
+            "parts_skipped": 0,
+            "bytes_written": 0,
+            "serialize_seconds": 0.0,
+        }
+        started = time.perf_counter()
+        for xml_path, editor in self._editors.items():
+            if editor.modified or xml_path in self._handed_out:
+                stats["bytes_written"] += editor.save()
+                stats["parts_written"] += 1
+            else:
+                stats["parts_skipped"] += 1
+        stats["serialize_seconds"] = time.perf_counter() - started
+        self._save_stats = stats
 
         # Validate by default
         if validate:
@@ -881,32 +1132,158 @@ class Document:
 
         # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if not self.overlay:
+            shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+            return
+
+        # Only the changed parts, unless the target is a different directory
+        in_place = target_path.resolve() == self.original_path.resolve()
+        if not in_place:
+            shutil.copytree(self.original_path, target_path, dirs_exist_ok=True)
+        for name, data in self._overlay_parts().items():
+            path = target_path / name
+            if in_place and name not in self._replaced_parts:
+                self._replaced_parts[name] = (
+                    path.read_bytes() if path.exists() else None
+                )
+            # Never write through a hard link, e.g. into a view of the directory
+            if path.exists():
+                path.unlink()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+    def save_stats(self):
+        """Return statistics about the XML parts written by the last save().
+
+        Returns:
+            dict: parts_written, parts_skipped (parts only read by the Document),
+            bytes_written and serialize_seconds, the time spent serializing and
+            writing the parts; empty before the first save()
+        """
+        return dict(self._save_stats)
+
+    # ==================== Private: Session Files ====================
+
+    def _source_path(self, path):
+        """Get the file a path in unpacked_path is read from.
+
+        In overlay mode, parts that were not changed are read from the original
+        directory, or from the cache of parts a lazy unpack left in the source
+        file.
+        """
+        if not self.overlay or path.exists():
+            return path
+        relative_path = path.relative_to(self.unpacked_path)
+        original = self.original_path / relative_path
+        lazy = self._lazy_path / relative_path
+        if not original.exists() and lazy.exists():
+            return lazy
+        return original
+
+    def _part_exists(self, path):
+        """Check if a part exists, changed or not."""
+        return self._source_path(path).exists()
+
+    def _overlay_parts(self):
+        """Get the parts changed in overlay mode, as {name: content}."""
+        return {
+            path.relative_to(self.unpacked_path).as_posix(): path.read_bytes()
+            for path in self.unpacked_path.rglob("*")
+            if path.is_file()
+        }
+
+    def _build_view(self, view_path, parts):
+        """Build a complete copy of the original directory with some parts replaced.
+
+        Unchanged files are hard links where possible, so replaced parts are
+        unlinked before being written.
+
+        Args:
+            view_path: Directory to create
+            parts: {name: content} of the parts to replace; None removes a part
+
+        Returns:
+            Path: view_path
+        """
+        shutil.copytree(self.original_path, view_path, copy_function=link_or_copy)
+        # materialize_parts() rewrites the manifest, which must stay a copy
+        manifest = view_path / MANIFEST_NAME
+        if manifest.exists():
+            manifest.unlink()
+            shutil.copy2(self.original_path / MANIFEST_NAME, manifest)
+
+        for name, data in parts.items():
+            path = view_path / name
+            if path.exists():
+                path.unlink()
+            if data is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+        return view_path
+
+    def _get_original_docx(self):
+        """Get the original document packed as the validation baseline.
+
+        In overlay mode it is packed on first use, from the original directory
+        as it was before any save() wrote to it.
+        """
+        if self.original_docx is None:
+            original_docx = Path(self.temp_dir) / "original.docx"
+            if self._replaced_parts:
+                source_path = self._build_view(
+                    Path(self.temp_dir) / "original", self._replaced_parts
+                )
+                pack_document(
+                    source_path, original_docx, validate=False, reuse_unchanged=True
+                )
+                shutil.rmtree(source_path)
+            else:
+                pack_document(
+                    self.original_path,
+                    original_docx,
+                    validate=False,
+                    reuse_unchanged=True,
+                )
+            self.original_docx = original_docx
+        return self.original_docx
 
     # ==================== Private: Initialization ====================
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+    def _scan_annotation_ids(self):
+        """Get the next free tracked change/comment ID in one pass over word/.
 
-        editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+        Parts are streamed through a parser target, so no trees are built, and
+        elements are matched by namespace whatever prefix a part uses.
+        """
+        change_ids = _ChangeIdAllocator()
+        if self.overlay:
+            names = {
+                path.relative_to(root)
+                for root in (self.original_path, self._lazy_path)
+                for path in (root / "word").rglob("*.xml")
+            }
+            paths = [self._source_path(self.unpacked_path / name) for name in names]
+        else:
+            paths = self.word_path.rglob("*.xml")
+        for path in paths:
+            parser = lxml.etree.XMLParser(
+                target=_AnnotationIdScanner(change_ids),
+                resolve_entities=False,
+                no_network=True,
+                huge_tree=True,
+            )
+            try:
+                lxml.etree.parse(str(path), parser)
+            except lxml.etree.XMLSyntaxError:
+                pass  # Malformed parts fail validation; IDs seen so far count
+        return change_ids.next_id
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if not self._part_exists(self.comments_path):
             return {}
 
-        editor = self["word/comments.xml"]
+        editor = self._editor("word/comments.xml")
         existing = {}
 
         for comment_elem in editor.dom.getElementsByTagName("w:comment"):
@@ -953,13 +1330,13 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
+        if not self._part_exists(path):
             # Copy from template
             shutil.copy(TEMPLATE_DIR / "people.xml", path)
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
-        editor = self["[Content_Types].xml"]
+        editor = self._editor("[Content_Types].xml")
 
         if self._has_override(editor, "/word/people.xml"):
             return
@@ -971,7 +1348,7 @@ class Document:
 
     def _add_relationship_for_people(self, path):
         """Add people.xml relationship to document.xml.rels if not already present."""
-        editor = self["word/_rels/document.xml.rels"]
+        editor = self._editor("word/_rels/document.xml.rels")
 
         if self._has_relationship(editor, "people.xml"):
             return
@@ -996,7 +1373,7 @@ class Document:
         - trackRevisions: early (before defaultTabStop)
         - rsids: late (after compat)
         """
-        editor = self["word/settings.xml"]
+        editor = self._editor("word/settings.xml")
         root = editor.get_node(tag="w:settings")
         prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
 
@@ -1065,70 +1442,78 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+    def _insert_comment_range(self, comment_id, start, end):
+        """Insert the range markers and reference run of a comment."""
+        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
 
-        editor = self["word/comments.xml"]
-        root = editor.get_node(tag="w:comments")
+        # If end node is a paragraph, append comment markup inside it
+        # Otherwise insert after it (for run-level anchors)
+        if end.tagName == "w:p":
+            self._document.append_to(end, self._comment_range_end_xml(comment_id))
+        else:
+            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+
+    def _insert_reply_range(self, comment_id, parent_comment_id):
+        """Insert the range markers and reference run of a reply by its parent's."""
+        parent_start_elem = self._document.get_node(
+            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
+        )
+        parent_ref_elem = self._document.get_node(
+            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
+        )
+
+        self._document.insert_after(
+            parent_start_elem, self._comment_range_start_xml(comment_id)
+        )
+        parent_ref_run = parent_ref_elem.parentNode
+        self._document.insert_after(
+            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
+        )
+        self._document.insert_after(
+            parent_ref_run, self._comment_ref_run_xml(comment_id)
+        )
+
+    def _append_to_comments_part(self, path, root_tag, xml):
+        """Append XML to the root of a comments part, creating it from its template."""
+        if not self._part_exists(path):
+            shutil.copy(TEMPLATE_DIR / path.name, path)
 
+        editor = self._editor(path.relative_to(self.unpacked_path).as_posix())
+        root = editor.get_node(tag=root_tag)
+        editor.append_to(root, xml)
+
+    # ==================== Private: XML Fragments ====================
+
+    def _comment_xml(self, comment_id, para_id, text):
+        """Generate XML for a comment in comments.xml.
+
+        Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r, and
+        w:author, w:date, w:initials on w:comment are automatically added by
+        DocxXMLEditor.
+        """
         escaped_text = (
             text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         )
-        # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
-        # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
+        return f'''<w:comment w:id="{comment_id}">
   <w:p w14:paraId="{para_id}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
 </w:comment>'''
-        editor.append_to(root, comment_xml)
-
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
-
-        editor = self["word/commentsExtended.xml"]
-        root = editor.get_node(tag="w15:commentsEx")
 
+    def _comment_extended_xml(self, para_id, parent_para_id):
+        """Generate XML for a comment in commentsExtended.xml."""
         if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
-
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
-
-        editor = self["word/commentsIds.xml"]
-        root = editor.get_node(tag="w16cid:commentsIds")
-
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
+            return f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
+        return f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
 
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
-
-        editor = self["word/commentsExtensible.xml"]
-        root = editor.get_node(tag="w16cex:commentsExtensible")
+    def _comment_ids_xml(self, para_id, durable_id):
+        """Generate XML for a comment in commentsIds.xml."""
+        return f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
-
-    # ==================== Private: XML Fragments ====================
+    def _comment_extensible_xml(self, durable_id):
+        """Generate XML for a comment in commentsExtensible.xml."""
+        return f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
 
     def _comment_range_start_xml(self, comment_id):
         """Generate XML for comment range start."""
@@ -1183,10 +1568,10 @@ class Document:
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._part_exists(people_path):
             raise ValueError("people.xml should exist after _setup_tracking")
 
-        editor = self["word/people.xml"]
+        editor = self._editor("word/people.xml")
         root = editor.get_node(tag="w15:people")
 
         # Check if author already exists
@@ -1202,7 +1587,7 @@ class Document:
 
     def _ensure_comment_relationships(self):
         """Ensure word/_rels/document.xml.rels has comment relationships."""
-        editor = self["word/_rels/document.xml.rels"]
+        editor = self._editor("word/_rels/document.xml.rels")
 
         if self._has_relationship(editor, "comments.xml"):
             return
@@ -1242,7 +1627,7 @@ class Document:
 
     def _ensure_comment_content_types(self):
         """Ensure [Content_Types].xml has comment content types."""
-        editor = self["[Content_Types].xml"]
+        editor = self._editor("[Content_Types].xml")
 
         if self._has_override(editor, "/word/comments.xml"):
             return
@@ -0,0 +1,446 @@
+import contextlib
+import io
+import itertools
+import os
+import re
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+from pathlib import Path
+
+from lxml import etree
+
+from ooxml.scripts.pack import (
+    MANIFEST_NAME,
+    compression_info,
+    extract_member,
+    new_manifest,
+    pack_document,
+    write_manifest,
+)
+from scripts.document import DocxXMLEditor, Document
+
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14 = "http://schemas.microsoft.com/office/word/2010/wordml"
+W15 = "http://schemas.microsoft.com/office/word/2012/wordml"
+W16CID = "http://schemas.microsoft.com/office/word/2016/wordml/cid"
+W16CEX = "http://schemas.microsoft.com/office/word/2018/wordml/cex"
+
+W_NAMESPACES = (
+    f'xmlns:w="{W}" '
+    f'xmlns:w14="{W14}"'
+)
+
+DOCUMENT_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document {W_NAMESPACES}>
+  <w:body>
+    <w:p w14:paraId="00000001">
+      <w:r>
+        <w:t>First paragraph</w:t>
+      </w:r>
+    </w:p>
+    <w:p w14:paraId="00000002">
+      <w:r>
+        <w:t>Second paragraph</w:t>
+      </w:r>
+    </w:p>
+    <w:p w14:paraId="00000003">
+      <w:r>
+        <w:t>Third paragraph</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+FILES = {
+    "[Content_Types].xml": """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+  <Default Extension="xml" ContentType="application/xml"/>
+  <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+  <Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>
+</Types>
+""",
+    "_rels/.rels": """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>
+""",
+    "word/_rels/document.xml.rels": """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>
+</Relationships>
+""",
+    "word/settings.xml": """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:zoom w:percent="100"/>
+  <w:defaultTabStop w:val="720"/>
+  <w:compat/>
+</w:settings>
+""",
+}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the skill root: python -m unittest scripts.document_test
+class DocumentTests(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.unpacked = Path(self.temp_dir.name) / "unpacked"
+        self.create_unpacked_document(self.unpacked)
+
+    def create_unpacked_document(self, unpacked, document_xml=DOCUMENT_XML):
+        """Helper to create a minimal unpacked document"""
+        for name, content in {**FILES, "word/document.xml": document_xml}.items():
+            path = unpacked / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+
+    def document(self, **kwargs):
+        """Helper to open the unpacked document without the RSID message"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return Document(self.unpacked, rsid="00112233", **kwargs)
+
+    def read(self, name):
+        return (self.unpacked / name).read_text(encoding="utf-8")
+
+
+class TestSave(DocumentTests):
+
+    def test_direct_dom_changes_are_saved(self):
+        """Test that changes made through the DOM of doc[...] are written"""
+        doc = self.document()
+        para = doc["word/document.xml"].get_node(tag="w:p", contains="Second")
+        para.parentNode.removeChild(para)
+        doc.save(validate=False)
+        self.assertNotIn("Second paragraph", self.read("word/document.xml"))
+        self.assertEqual(doc.save_stats()["parts_skipped"], 0)
+
+    def test_parts_only_read_internally_are_skipped(self):
+        """Test that save() leaves parts the Document only read alone"""
+        doc = self.document()
+        doc.save(validate=False)
+        stats = doc.save_stats()
+        # document.xml is opened by the Document but not changed
+        self.assertEqual(stats["parts_skipped"], 1)
+        self.assertEqual(stats["parts_written"], 4)
+        self.assertEqual(self.read("word/document.xml"), DOCUMENT_XML)
+        self.assertIn('w:val="00112233"', self.read("word/settings.xml"))
+        self.assertIn("people.xml", self.read("word/_rels/document.xml.rels"))
+
+
+class TestAttributeInjection(DocumentTests):
+
+    def test_nested_deletions(self):
+        """Test the attributes injected into runs inside and outside w:del"""
+        doc = self.document()
+        editor = doc["word/document.xml"]
+        run = editor.get_node(tag="w:r", contains="Second paragraph")
+        nodes = editor.replace_node(
+            run,
+            '<w:ins w:author="Reviewer"><w:del><w:r><w:delText>old</w:delText></w:r>'
+            "</w:del></w:ins><w:r><w:t> new </w:t></w:r>",
+        )
+        insertion, plain = nodes
+        deletion = insertion.getElementsByTagName("w:del")[0]
+        deleted = deletion.getElementsByTagName("w:r")[0]
+
+        self.assertEqual(deleted.getAttribute("w:rsidDel"), "00112233")
+        self.assertFalse(deleted.hasAttribute("w:rsidR"))
+        self.assertEqual(plain.getAttribute("w:rsidR"), "00112233")
+        self.assertFalse(plain.hasAttribute("w:rsidDel"))
+        text = plain.getElementsByTagName("w:t")[0]
+        self.assertEqual(text.getAttribute("xml:space"), "preserve")
+
+        self.assertEqual(insertion.getAttribute("w:author"), "Reviewer")
+        self.assertEqual(deletion.getAttribute("w:author"), "Claude")
+        ids = {insertion.getAttribute("w:id"), deletion.getAttribute("w:id")}
+        self.assertEqual(len(ids), 2)
+        for change in (insertion, deletion):
+            self.assertEqual(
+                change.getAttribute("w16du:dateUtc"), change.getAttribute("w:date")
+            )
+        self.assertTrue(editor.dom.documentElement.hasAttribute("xmlns:w16du"))
+
+        # Runs added to an existing deletion count as deleted too
+        (added,) = editor.append_to(deletion, "<w:r><w:delText>more</w:delText></w:r>")
+        self.assertEqual(added.getAttribute("w:rsidDel"), "00112233")
+        self.assertFalse(added.hasAttribute("w:rsidR"))
+
+    def test_new_paragraph(self):
+        doc = self.document()
+        editor = doc["word/document.xml"]
+        para = editor.get_node(tag="w:p", contains="Third paragraph")
+        (new,) = editor.insert_after(para, "<w:p><w:r><w:t>Fourth</w:t></w:r></w:p>")
+        for attribute in ("w:rsidR", "w:rsidRDefault", "w:rsidP"):
+            self.assertEqual(new.getAttribute(attribute), "00112233")
+        self.assertRegex(new.getAttribute("w14:paraId"), "^[0-9A-F]{8}$")
+        self.assertRegex(new.getAttribute("w14:textId"), "^[0-9A-F]{8}$")
+        self.assertEqual(
+            new.getElementsByTagName("w:r")[0].getAttribute("w:rsidR"), "00112233"
+        )
+        self.assertEqual(editor.get_node(tag="w:p", contains="Fourth"), new)
+
+
+class TestChangeIds(DocumentTests):
+
+    def test_ids_found_under_any_prefix(self):
+        """Test that IDs in parts binding the w namespace differently are reserved"""
+        footnotes = self.unpacked / "word" / "footnotes.xml"
+        footnotes.write_text(
+            # Unprefixed attributes have no namespace, so w:id needs a prefix
+            f'<footnotes xmlns="{W}" xmlns:v="{W}"><footnote><p>'
+            '<ins v:id="57" v:author="A"><r><t>x</t></r></ins></p></footnote></footnotes>',
+            encoding="utf-8",
+        )
+        endnotes = self.unpacked / "word" / "endnotes.xml"
+        endnotes.write_text(
+            f'<x:endnotes xmlns:x="{W}"><x:endnote><x:p>'
+            '<x:del x:id="41" x:author="A"/></x:p></x:endnote></x:endnotes>',
+            encoding="utf-8",
+        )
+        doc = self.document()
+        editor = doc["word/document.xml"]
+        run = editor.get_node(tag="w:r", contains="First paragraph")
+        (insertion,) = editor.replace_node(run, "<w:ins><w:r><w:t>x</w:t></w:r></w:ins>")
+        self.assertEqual(insertion.getAttribute("w:id"), "58")
+
+    def test_editor_seeds_ids_by_namespace(self):
+        path = self.unpacked / "word" / "footnotes.xml"
+        path.write_text(
+            f'<x:footnotes xmlns:x="{W}"><x:footnote><x:p>'
+            '<x:ins x:id="12" x:author="A"/></x:p></x:footnote></x:footnotes>',
+            encoding="utf-8",
+        )
+        editor = DocxXMLEditor(path, rsid="00112233")
+        self.assertEqual(editor._get_next_change_id(), 13)
+
+
+class TestOverlay(DocumentTests):
+
+    def setUp(self):
+        super().setUp()
+        # Unpack a .docx lazily, leaving word/settings.xml inside it
+        self.source = Path(self.temp_dir.name) / "source.docx"
+        with zipfile.ZipFile(self.source, "w") as zf:
+            for path in sorted(self.unpacked.rglob("*")):
+                if path.is_file():
+                    zf.write(path, path.relative_to(self.unpacked).as_posix())
+        shutil.rmtree(self.unpacked)
+        manifest = new_manifest(self.source)
+        with zipfile.ZipFile(self.source) as zf:
+            for info in zf.infolist():
+                if info.filename == "word/settings.xml":
+                    entry = {"lazy": True, **compression_info(info)}
+                else:
+                    entry = extract_member(zf, info.filename, self.unpacked)
+                manifest["members"][info.filename] = entry
+        write_manifest(self.unpacked, manifest)
+
+    def snapshot(self, directory=None):
+        directory = directory or self.unpacked
+        return {
+            path.relative_to(directory).as_posix(): path.read_bytes()
+            for path in directory.rglob("*")
+            if path.is_file()
+        }
+
+    def test_original_untouched_until_save(self):
+        """Test that only save() writes to the directory, lazy parts included"""
+        before = self.snapshot()
+        doc = self.document(overlay=True)
+        editor = doc["word/document.xml"]
+        para = editor.get_node(tag="w:p", contains="Second")
+        editor.suggest_deletion(para)
+        self.assertIn('w:val="00112233"', doc["word/settings.xml"].dom.toxml())
+        self.assertEqual(self.snapshot(), before)
+
+        doc.save(validate=False)
+        after = self.snapshot()
+        self.assertIn(b"w:del ", after["word/document.xml"])
+        self.assertIn(b'w:val="00112233"', after["word/settings.xml"])
+        self.assertEqual(after[MANIFEST_NAME], before[MANIFEST_NAME])
+
+        # The saved part replaces the lazy one when packing
+        packed = Path(self.temp_dir.name) / "packed.docx"
+        self.assertTrue(pack_document(self.unpacked, packed, reuse_unchanged=True))
+        with zipfile.ZipFile(packed) as zf:
+            self.assertIn(b'w:val="00112233"', zf.read("word/settings.xml"))
+
+    def test_save_does_not_write_through_hard_links(self):
+        linked = Path(self.temp_dir.name) / "linked"
+        shutil.copytree(self.unpacked, linked, copy_function=os.link)
+        before = self.snapshot()
+        self.unpacked = linked
+        doc = self.document(overlay=True)
+        editor = doc["word/document.xml"]
+        editor.suggest_deletion(editor.get_node(tag="w:p", contains="Second"))
+        doc.save(validate=False)
+        self.assertIn(b"w:del ", self.snapshot(linked)["word/document.xml"])
+        self.assertEqual(self.snapshot(Path(self.temp_dir.name) / "unpacked"), before)
+
+
+class TestAddComments(DocumentTests):
+
+    COMMENT_PARTS = (
+        "word/comments.xml",
+        "word/commentsExtended.xml",
+        "word/commentsIds.xml",
+        "word/commentsExtensible.xml",
+    )
+
+    def element(self, name):
+        return etree.fromstring(self.read(name).encode())
+
+    def test_parts_and_replies(self):
+        doc = self.document()
+        editor = doc["word/document.xml"]
+        first = editor.get_node(tag="w:p", contains="First")
+        parent = doc.add_comment(first, first, "Parent")
+        second = editor.get_node(tag="w:p", contains="Second")
+        third = editor.get_node(tag="w:r", contains="Third")
+        ids = doc.add_comments(
+            [
+                (second, second, "On <second>"),
+                (None, None, "Reply", parent),
+                (third, third, "On third"),
+            ]
+        )
+        self.assertEqual(ids, [parent + 1, parent + 2, parent + 3])
+        doc.save(validate=False)
+
+        comments = self.element("word/comments.xml").findall(f"{{{W}}}comment")
+        self.assertEqual(
+            [c.get(f"{{{W}}}id") for c in comments],
+            [str(i) for i in [parent, *ids]],
+        )
+        self.assertEqual(
+            ["".join(c.itertext()).strip() for c in comments],
+            ["Parent", "On <second>", "Reply", "On third"],
+        )
+        para_ids = [c.find(f"{{{W}}}p").get(f"{{{W14}}}paraId") for c in comments]
+        self.assertEqual(len(set(para_ids)), 4)
+
+        # The other parts list the comments in the same order
+        extended = self.element("word/commentsExtended.xml")
+        self.assertEqual([e.get(f"{{{W15}}}paraId") for e in extended], para_ids)
+        self.assertEqual(
+            [e.get(f"{{{W15}}}paraIdParent") for e in extended],
+            [None, None, para_ids[0], None],
+        )
+        comment_ids = self.element("word/commentsIds.xml")
+        self.assertEqual(
+            [e.get(f"{{{W16CID}}}paraId") for e in comment_ids], para_ids
+        )
+        durable_ids = [e.get(f"{{{W16CID}}}durableId") for e in comment_ids]
+        extensible = self.element("word/commentsExtensible.xml")
+        self.assertEqual(
+            [e.get(f"{{{W16CEX}}}durableId") for e in extensible], durable_ids
+        )
+
+        # The reply's markers sit next to its parent's
+        body = self.element("word/document.xml").find(f"{{{W}}}body")
+        markers = [
+            (etree.QName(e).localname, e.get(f"{{{W}}}id"))
+            for e in body.iter(
+                f"{{{W}}}commentRangeStart",
+                f"{{{W}}}commentRangeEnd",
+                f"{{{W}}}commentReference",
+            )
+        ]
+        p, c1, reply, c3 = (str(i) for i in [parent, *ids])
+        self.assertEqual(
+            markers,
+            [
+                ("commentRangeStart", p),
+                ("commentRangeStart", reply),
+                ("commentRangeEnd", p),
+                ("commentReference", p),
+                ("commentReference", reply),
+                ("commentRangeEnd", reply),
+                ("commentRangeStart", c1),
+                ("commentRangeEnd", c1),
+                ("commentReference", c1),
+                ("commentRangeStart", c3),
+                ("commentRangeEnd", c3),
+                ("commentReference", c3),
+            ],
+        )
+
+    def saved_parts(self, add):
+        """Helper to save the comments made by add(doc) with predictable IDs"""
+        counter = itertools.count(1)
+        with mock.patch(
+            "scripts.document._generate_hex_id",
+            side_effect=lambda: f"{next(counter):08X}",
+        ):
+            doc = self.document()
+            add(doc)
+        doc.save(validate=False)
+        timestamp = r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ"
+        return {
+            name: re.sub(timestamp, "DATE", self.read(name))
+            for name in ("word/document.xml", *self.COMMENT_PARTS)
+        }
+
+    def test_same_as_single_calls(self):
+        def anchors(doc):
+            editor = doc["word/document.xml"]
+            return [
+                editor.get_node(tag="w:p", contains="Second"),
+                editor.get_node(tag="w:r", contains="Second"),
+                editor.get_node(tag="w:p", contains="Third"),
+            ]
+
+        def single(doc):
+            para, run, third = anchors(doc)
+            parent = doc.add_comment(para, para, "One")
+            doc.add_comment(run, run, "Two")
+            doc.reply_to_comment(parent, "Three")
+            doc.add_comment(third, third, "Four")
+            doc.reply_to_comment(parent, "Five")
+
+        def bulk(doc):
+            para, run, third = anchors(doc)
+            (parent,) = doc.add_comments([(para, para, "One")])
+            doc.add_comments(
+                [
+                    (run, run, "Two"),
+                    (None, None, "Three", parent),
+                    (third, third, "Four"),
+                    (None, None, "Five", parent),
+                ]
+            )
+
+        expected = self.saved_parts(single)
+        shutil.rmtree(self.unpacked)
+        self.create_unpacked_document(self.unpacked)
+        self.assertEqual(self.saved_parts(bulk), expected)
+
+    def test_invalid_entries_add_nothing(self):
+        doc = self.document()
+        editor = doc["word/document.xml"]
+        para = editor.get_node(tag="w:p", contains="First")
+        before = editor.dom.toxml()
+        with self.assertRaisesRegex(ValueError, "id=7 not found"):
+            doc.add_comments([(para, para, "Comment"), (None, None, "Reply", 7)])
+        self.assertEqual(editor.dom.toxml(), before)
+        self.assertFalse((self.unpacked / "word" / "comments.xml").exists())
+
+        parent = doc.add_comment(para, para, "Parent")
+        before = editor.dom.toxml()
+        with self.assertRaisesRegex(ValueError, "pass None as start and end"):
+            doc.add_comments([(para, para, "Comment"), (para, None, "Reply", parent)])
+        self.assertEqual(editor.dom.toxml(), before)
+        self.assertEqual(doc.add_comments([]), [])
+        self.assertEqual(doc.add_comment(para, para, "Next"), parent + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
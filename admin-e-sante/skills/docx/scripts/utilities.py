@@ -6,8 +6,12 @@ This module provides XMLEditor, a tool for manipulating XML files with support f
 line-number-based node finding and DOM manipulation. Each element is automatically
 annotated with its original line and column position during parsing.
 
+LxmlXMLEditor offers the same API on an lxml tree, which parses and serializes
+large files much faster; create_editor() selects either backend by name.
+
 Example usage:
     editor = XMLEditor("document.xml")
+    editor = create_editor("document.xml", backend="lxml")
 
     # Find node by line number or range
     elem = editor.get_node(tag="w:r", line_number=519)
@@ -26,35 +30,67 @@ Example usage:
     new_elem = editor.replace_node(elem, "<w:r><w:t>new text</w:t></w:r>")
     editor.insert_after(new_elem, "<w:r><w:t>more</w:t></w:r>")
 
+    # Apply many edits in one pass: fragments are parsed together when the block ends
+    with editor.batch():
+        editor.replace_node(elem, "<w:r><w:t>new text</w:t></w:r>")
+        editor.append_to(other_elem, "<w:r><w:t>more</w:t></w:r>")
+
     # Save changes
     editor.save()
 """
 
 import html
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from itertools import accumulate
 from pathlib import Path
 from typing import Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
 
+# Parser for LxmlXMLEditor, hardened like defusedxml: no entity expansion, DTD
+# loading or network access (entity declarations are rejected after parsing)
+LXML_PARSER = lxml.etree.XMLParser(
+    resolve_entities=False, load_dtd=False, no_network=True
+)
 
-class XMLEditor:
-    """
-    Editor for manipulating OOXML XML files with line-number-based node finding.
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
 
-    This class parses XML files and tracks the original line and column position
-    of each element. This enables finding nodes by their line number in the original
-    file, which is useful when working with Read tool output.
+# Editing methods, as named in apply_edits()
+EDIT_OPERATIONS = ("replace_node", "insert_after", "insert_before", "append_to")
 
-    Attributes:
-        xml_path: Path to the XML file being edited
-        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
-        dom: Parsed DOM tree with parse_position attributes on elements
+
+class _BaseXMLEditor:
+    """
+    Backend-independent part of the XML editors: file handling and node lookup.
+
+    Subclasses parse the file and implement the element accessors used by
+    get_node() (_root_element, _iter_elements, _parent_element,
+    _child_elements, _element_tag, _element_line, _element_attribute and
+    _text_chunks), and the parsing and insertion of XML fragments used by the
+    editing methods (_parse_fragments and _apply_edit).
+
+    get_node() answers from indexes built on first use: elements by tag, by
+    attribute value and by line number, and the text of elements searched
+    with contains. The editing methods update them for the nodes they touch,
+    through _index_nodes() and _unindex_nodes(). Changes made directly to the
+    tree are not seen by the indexes, so get_node() checks its matches against
+    the tree and looks again with fresh indexes when they are stale. A single
+    match is only trusted when no element was added next to it or next to one
+    of its ancestors, where a copy of it would most likely go.
+
+    contains is searched once in the text of the whole document, kept as the
+    concatenated text of its blocks (the children of the outermost element
+    with several children, e.g. the paragraphs and tables of w:body). Each
+    match is mapped back to elements through the text spans of the elements
+    in its block. Edits inside a block only refresh that block's text.
     """
 
     def __init__(self, xml_path):
         """
-        Initialize with path to XML file and parse with line number tracking.
+        Check that the file exists and detect its encoding.
 
         Args:
             xml_path: Path to XML file to edit (str or Path)
@@ -69,9 +105,37 @@ class XMLEditor:
         with open(self.xml_path, "rb") as f:
             header = f.read(200).decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
+        self._namespaces = None  # Cache of _namespace_declarations()
+        self._queued = None  # [((operation, element, xml), nodes)] inside batch()
+        self._reset_indexes()
+        self.modified = False  # Set by edits, cleared by save()
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+    def invalidate_indexes(self):
+        """
+        Drop the lookup indexes of get_node(), so they are rebuilt on next use.
+
+        Not needed for correct lookups: get_node() notices direct changes to
+        the tree by itself. Calling it after many direct changes saves the
+        lookup that finds the indexes stale. It also marks the file as
+        modified.
+        """
+        self.modified = True
+        self._reset_indexes()
+
+    def _reset_indexes(self):
+        self._tag_index = None  # tag -> {element: None}
+        self._indexed = {}  # element -> None, for every element in _tag_index
+        self._checked_children = {}  # element -> children, see _children_indexed()
+        self._attr_index = {}  # tag -> {attribute -> {value -> {element: None}}}
+        self._line_index = {}  # tag -> (sorted lines, {line -> {element: None}})
+        self._text_cache = {}  # element -> text, see _element_text()
+        self._blocks = None  # Blocks with text, see _document_text()
+        self._block_index = {}  # block -> position in self._blocks
+        self._block_texts = []
+        self._dirty_blocks = set()  # Positions of blocks whose text changed
+        self._containers = []  # Elements around the blocks, from the root
+        self._text_buffer = None  # (text, block starts), joined from _block_texts
+        self._span_cache = {}  # block -> [(element, start, end)], see _block_spans()
 
     def get_node(
         self,
@@ -94,7 +158,8 @@ class XMLEditor:
                       Supports both entity notation (&#8220;) and Unicode characters (\u201c).
 
         Returns:
-            defusedxml.minidom.Element: The matching DOM element
+            The matching element (defusedxml.minidom.Element for XMLEditor,
+            lxml.etree._Element for LxmlXMLEditor)
 
         Raises:
             ValueError: If node not found or multiple matches found
@@ -109,40 +174,21 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
-
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
-
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        normalized_contains = html.unescape(contains or "")
+
+        indexed = self._tag_index is not None
+        matches = self._find_nodes(tag, attrs, line_number, normalized_contains)
+        if indexed and not (
+            matches
+            and all(self._is_current(elem, normalized_contains) for elem in matches)
+            and (len(matches) > 1 or not self._has_new_neighbours(matches[0]))
+        ):
+            # The tree was changed directly since the indexes were built, e.g.
+            # nodes removed or added through the DOM: look again with fresh ones
+            self._reset_indexes()
+            matches = self._find_nodes(tag, attrs, line_number, normalized_contains)
 
         if not matches:
             # Build descriptive error message
@@ -180,111 +226,571 @@ class XMLEditor:
             )
         return matches[0]
 
-    def _get_element_text(self, elem):
-        """
-        Recursively extract all text content from an element.
-
-        Skips text nodes that contain only whitespace (spaces, tabs, newlines),
-        which typically represent XML formatting rather than document content.
-
-        Args:
-            elem: defusedxml.minidom.Element to extract text from
-
-        Returns:
-            str: Concatenated text from all non-whitespace text nodes within the element
-        """
-        text_parts = []
-        for node in elem.childNodes:
-            if node.nodeType == node.TEXT_NODE:
-                # Skip whitespace-only text nodes (XML formatting)
-                if node.data.strip():
-                    text_parts.append(node.data)
-            elif node.nodeType == node.ELEMENT_NODE:
-                text_parts.append(self._get_element_text(node))
-        return "".join(text_parts)
-
     def replace_node(self, elem, new_content):
         """
-        Replace a DOM element with new XML content.
+        Replace an element with new XML content.
 
         Args:
-            elem: defusedxml.minidom.Element to replace
+            elem: Element to replace
             new_content: String containing XML to replace the node with
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes
 
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
-        return nodes
+        return self._edit("replace_node", elem, new_content)
 
     def insert_after(self, elem, xml_content):
         """
-        Insert XML content after a DOM element.
+        Insert XML content after an element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert after
+            elem: Element to insert after
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes
 
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
-        return nodes
+        return self._edit("insert_after", elem, xml_content)
 
     def insert_before(self, elem, xml_content):
         """
-        Insert XML content before a DOM element.
+        Insert XML content before an element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert before
+            elem: Element to insert before
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes
 
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        return nodes
+        return self._edit("insert_before", elem, xml_content)
 
     def append_to(self, elem, xml_content):
         """
-        Append XML content as a child of a DOM element.
+        Append XML content as the last children of an element.
 
         Args:
-            elem: defusedxml.minidom.Element to append to
+            elem: Element to append to
             xml_content: String containing XML to append
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes
 
         Example:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        nodes = self._parse_fragment(xml_content)
+        return self._edit("append_to", elem, xml_content)
+
+    def apply_edits(self, edits):
+        """
+        Apply several edits, parsing all of their XML fragments in one pass.
+
+        The edits are applied in the given order, with the same result as
+        calling the single-edit methods one after the other.
+
+        Args:
+            edits: (operation, element, xml_content) tuples, where operation is
+                "replace_node", "insert_after", "insert_before" or "append_to"
+
+        Returns:
+            list: The inserted nodes of each edit
+
+        Raises:
+            ValueError: If an operation is unknown
+            AssertionError: If a fragment contains no element nodes
+
+        Example:
+            editor.apply_edits([
+                ("replace_node", old_run, "<w:r><w:t>new</w:t></w:r>"),
+                ("insert_after", para, "<w:p><w:r><w:t>added</w:t></w:r></w:p>"),
+            ])
+        """
+        edits = list(edits)
+        for operation, _, _ in edits:
+            if operation not in EDIT_OPERATIONS:
+                raise ValueError(f"Unknown edit operation: {operation}")
+        fragments = self._parse_fragments([content for _, _, content in edits])
+
+        results = []
+        for (operation, elem, _), fragment in zip(edits, fragments):
+            if operation == "replace_node":
+                self._unindex_nodes([elem])
+            nodes = self._apply_edit(operation, elem, fragment)
+            self._index_nodes(nodes)
+            results.append(nodes)
+        return results
+
+    @contextmanager
+    def batch(self):
+        """
+        Queue the edits made in a with block and apply them together at its end.
+
+        Inside the block, replace_node, insert_after, insert_before and
+        append_to return an empty list, which is filled with the inserted
+        nodes when the block ends. Lookups see the tree as it was before the
+        block. If the block raises, the queued edits are dropped.
+
+        Example:
+            with editor.batch():
+                for para_id, xml in replacements.items():
+                    para = editor.get_node(tag="w:p", attrs={"w14:paraId": para_id})
+                    editor.replace_node(para, xml)
+        """
+        if self._queued is not None:
+            yield  # Nested: the outer block applies the edits
+            return
+        self._queued = []
+        try:
+            yield
+            queued = self._queued
+        finally:
+            self._queued = None
+        results = self.apply_edits(edit for edit, _ in queued)
+        for (_, nodes), inserted in zip(queued, results):
+            nodes.extend(inserted)
+
+    def _edit(self, operation, elem, xml_content):
+        """Apply one edit, or queue it inside batch()."""
+        if self._queued is None:
+            return self.apply_edits([(operation, elem, xml_content)])[0]
+        nodes = []
+        self._queued.append(((operation, elem, xml_content), nodes))
+        return nodes
+
+    def _find_nodes(self, tag, attrs, line_number, contains):
+        """Elements matching the filters of get_node(), contains being normalized."""
+        # Start from the smallest indexed candidate set; all filters are
+        # still checked on each candidate below
+        candidates = self._tag_elements(tag)
+        if line_number is not None:
+            candidates = self._line_elements(tag, line_number)
+        for attr_name, attr_value in (attrs or {}).items():
+            by_value = self._attr_elements(tag, attr_name).get(attr_value, {})
+            if len(by_value) < len(candidates):
+                candidates = by_value
+
+        by_text = None
+        if contains:  # Empty text is in every element
+            by_text = self._text_elements(tag, contains)
+            if len(by_text) < len(candidates):
+                candidates = by_text
+
+        matches = []
+        for elem in candidates:
+            # Check line_number filter
+            if line_number is not None:
+                elem_line = self._element_line(elem)
+
+                # Handle both single line number and range
+                if isinstance(line_number, range):
+                    if elem_line not in line_number:
+                        continue
+                else:
+                    if elem_line != line_number:
+                        continue
+
+            # Check attrs filter
+            if attrs is not None:
+                if not all(
+                    self._element_attribute(elem, attr_name) == attr_value
+                    for attr_name, attr_value in attrs.items()
+                ):
+                    continue
+
+            # Check contains filter
+            if by_text is not None and elem not in by_text:
+                continue
+
+            # If all applicable filters passed, this is a match
+            matches.append(elem)
+        return matches
+
+    def _is_current(self, elem, contains):
+        """Check that an indexed match is still in the tree with the text found."""
+        node = elem
+        while True:
+            parent = self._parent_element(node)
+            if parent is None:
+                break
+            node = parent
+        if node is not self._root_element():
+            return False  # Removed from the tree
+        return not contains or contains in self._get_element_text(elem)
+
+    def _has_new_neighbours(self, elem):
+        """Check for elements added next to elem or its ancestors since indexing."""
+        parent = self._parent_element(elem)
+        while parent is not None:
+            if not self._children_indexed(parent):
+                return True
+            parent = self._parent_element(parent)
+        return False
+
+    def _children_indexed(self, elem):
+        """Check that the child elements of elem are all in the indexes."""
+        return all(map(self._indexed.__contains__, self._child_elements(elem)))
+
+    def _tag_elements(self, tag):
+        """Elements with the given tag, indexing the whole tree on first use."""
+        if self._tag_index is None:
+            self._tag_index = {}
+            self._add_to_indexes(self._iter_elements(self._root_element()))
+        return self._tag_index.get(tag, {})
+
+    def _attr_elements(self, tag, attr_name):
+        """Elements with the given tag by value of an attribute ("" if missing)."""
+        by_attr = self._attr_index.setdefault(tag, {})
+        if attr_name not in by_attr:
+            by_value = {}
+            for elem in self._tag_elements(tag):
+                value = self._element_attribute(elem, attr_name)
+                by_value.setdefault(value, {})[elem] = None
+            by_attr[attr_name] = by_value
+        return by_attr[attr_name]
+
+    def _line_elements(self, tag, line_number):
+        """Elements with the given tag starting at a line or in a line range."""
+        if tag not in self._line_index:
+            by_line = {}
+            for elem in self._tag_elements(tag):
+                line = self._element_line(elem)
+                if line is not None:
+                    by_line.setdefault(line, {})[elem] = None
+            self._line_index[tag] = (sorted(by_line), by_line)
+        lines, by_line = self._line_index[tag]
+
+        if isinstance(line_number, range):
+            if not line_number:
+                return []
+            low = min(line_number[0], line_number[-1])
+            high = max(line_number[0], line_number[-1])
+            keys = [
+                line
+                for line in lines[bisect_left(lines, low) : bisect_right(lines, high)]
+                if line in line_number
+            ]
+        else:
+            keys = [line_number]
+        return [elem for line in keys for elem in by_line.get(line, ())]
+
+    def _text_elements(self, tag, text):
+        """Elements with the given tag whose text contains text (not empty)."""
+        buffer, block_starts = self._document_text()
+        found = {}
+        start = buffer.find(text)
+        while start != -1:
+            i = bisect_right(block_starts, start) - 1
+            block_start, block_end = block_starts[i], block_starts[i + 1]
+            if start + len(text) > block_end:
+                # Spans several blocks, so only containers can hold it
+                start = buffer.find(text, start + 1)
+                continue
+            block_text = buffer[block_start:block_end]
+            for elem, span_start, span_end in self._block_spans(self._blocks[i]):
+                if (
+                    self._element_tag(elem) == tag
+                    and text in block_text[span_start:span_end]
+                ):
+                    found[elem] = None
+            start = buffer.find(text, block_end)
+
+        for elem in self._containers:
+            if self._element_tag(elem) == tag and text in self._element_text(elem):
+                found[elem] = None
+        return found
+
+    def _document_text(self):
+        """
+        Text of the blocks of the document as (text, block starts).
+
+        Blocks are the children of the outermost element with several
+        children, and containers the elements around them; blocks without
+        text are left out. The block starts are the offsets of the text of
+        each block in self._blocks, followed by the text length.
+        """
+        if self._text_buffer is None:
+            for i in self._dirty_blocks if self._blocks is not None else ():
+                block = self._blocks[i]
+                if self._parent_element(block) is not self._containers[-1]:
+                    self._blocks = None  # Removed or moved
+                    break
+                self._block_texts[i] = self._element_text(block)
+            self._dirty_blocks.clear()
+
+            if self._blocks is None:
+                self._find_blocks()
+            block_starts = [0, *accumulate(map(len, self._block_texts))]
+            self._text_buffer = ("".join(self._block_texts), block_starts)
+        return self._text_buffer
+
+    def _find_blocks(self):
+        self._containers = []
+        elem = self._root_element()
+        while True:
+            self._containers.append(elem)
+            children = [
+                chunk for chunk in self._text_chunks(elem) if not isinstance(chunk, str)
+            ]
+            if len(children) != 1:
+                break
+            elem = children[0]
+
+        self._blocks, self._block_texts = [], []
+        for block in children:
+            text = self._element_text(block)
+            if text:
+                self._blocks.append(block)
+                self._block_texts.append(text)
+        self._block_index = {block: i for i, block in enumerate(self._blocks)}
+
+    def _text_changed(self, node):
+        """Record that a node was added, removed or changed, for _document_text()."""
+        if self._blocks is None:
+            return
+        self._text_buffer = None
+        elem = node
+        while elem is not None:
+            i = self._block_index.get(elem)
+            if i is not None:
+                self._dirty_blocks.add(i)
+                return
+            parent = self._parent_element(elem)
+            if parent is self._containers[-1]:
+                # A new block, or one left out so far: only matters with text
+                if self._get_element_text(elem):
+                    break
+                return
+            elem = parent
+        # The text of the blocks or the blocks themselves changed
+        self._blocks = None
+
+    def _block_spans(self, block):
+        """(element, start, end) text offsets of a block and its descendants."""
+        spans = self._span_cache.get(block)
+        if spans is None:
+            spans = self._span_cache[block] = []
+            self._add_spans(block, 0, spans)
+        return spans
+
+    def _add_spans(self, elem, start, spans):
+        end = start
+        for chunk in self._text_chunks(elem):
+            if isinstance(chunk, str):
+                end += len(chunk)
+            else:
+                end = self._add_spans(chunk, end, spans)
+        spans.append((elem, start, end))
+        return end
+
+    def _element_text(self, elem):
+        """_get_element_text() of an element, cached until the element changes."""
+        text = self._text_cache.get(elem)
+        if text is None:
+            text = self._text_cache[elem] = self._get_element_text(
+                elem, self._text_cache
+            )
+        return text
+
+    def _get_element_text(self, elem, cache=None):
+        """
+        Recursively extract all text content from an element.
+
+        Skips text nodes that contain only whitespace (spaces, tabs, newlines),
+        which typically represent XML formatting rather than document content.
+
+        Args:
+            elem: Element to extract text from
+            cache: Optional {element: text} to take the text of descendants from
+
+        Returns:
+            str: Concatenated text from all non-whitespace text nodes within the element
+        """
+        text_parts = []
+        for chunk in self._text_chunks(elem):
+            if not isinstance(chunk, str):
+                text = cache.get(chunk) if cache else None
+                chunk = self._get_element_text(chunk, cache) if text is None else text
+            text_parts.append(chunk)
+        return "".join(text_parts)
+
+    def _add_to_indexes(self, elements):
+        for elem in elements:
+            tag = self._element_tag(elem)
+            self._tag_index.setdefault(tag, {})[elem] = None
+            self._indexed[elem] = None
+            for attr_name, by_value in self._attr_index.get(tag, {}).items():
+                value = self._element_attribute(elem, attr_name)
+                by_value.setdefault(value, {})[elem] = None
+            if tag in self._line_index:
+                line = self._element_line(elem)
+                if line is not None:
+                    lines, by_line = self._line_index[tag]
+                    if line not in by_line:
+                        insort(lines, line)
+                    by_line.setdefault(line, {})[elem] = None
+
+    def _index_nodes(self, nodes):
+        """
+        Update the indexes for nodes just added to the tree or changed in place.
+
+        Indexes the nodes with their descendants and drops the cached text of
+        their ancestors. Every edit goes through here, so this also marks the
+        file as modified.
+        """
+        self.modified = True
+        if self._tag_index is None:
+            return
+        for node in nodes:
+            self._forget_text(self._parent_element(node))
+            self._text_changed(node)
+            self._add_to_indexes(self._iter_elements(node))
+
+    def _unindex_nodes(self, nodes):
+        """
+        Update the indexes for nodes about to be removed or changed in place.
+
+        Must be called while the nodes are still in the tree with their
+        current attributes; changed nodes are indexed again by _index_nodes().
+        """
+        if self._tag_index is None:
+            return
+        for node in nodes:
+            self._forget_text(self._parent_element(node))
+            self._text_changed(node)
+            for elem in self._iter_elements(node):
+                self._text_cache.pop(elem, None)
+                self._span_cache.pop(elem, None)
+                tag = self._element_tag(elem)
+                self._tag_index.get(tag, {}).pop(elem, None)
+                self._indexed.pop(elem, None)
+                for attr_name, by_value in self._attr_index.get(tag, {}).items():
+                    value = self._element_attribute(elem, attr_name)
+                    by_value.get(value, {}).pop(elem, None)
+                if tag in self._line_index:
+                    line = self._element_line(elem)
+                    self._line_index[tag][1].get(line, {}).pop(elem, None)
+
+    def _forget_text(self, elem):
+        """Drop the cached text of an element and of its ancestors."""
+        while elem is not None:
+            self._text_cache.pop(elem, None)
+            self._span_cache.pop(elem, None)
+            elem = self._parent_element(elem)
+
+
+class XMLEditor(_BaseXMLEditor):
+    """
+    Editor for manipulating OOXML XML files with line-number-based node finding.
+
+    This class parses XML files and tracks the original line and column position
+    of each element. This enables finding nodes by their line number in the original
+    file, which is useful when working with Read tool output.
+
+    Attributes:
+        xml_path: Path to the XML file being edited
+        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        dom: Parsed DOM tree with parse_position attributes on elements
+        modified: Whether the editing methods changed the tree since it was loaded
+            or last saved; direct DOM changes are not tracked
+    """
+
+    def __init__(self, xml_path):
+        """
+        Initialize with path to XML file and parse with line number tracking.
+
+        Args:
+            xml_path: Path to XML file to edit (str or Path)
+
+        Raises:
+            ValueError: If the XML file does not exist
+        """
+        super().__init__(xml_path)
+        parser = _create_line_tracking_parser()
+        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+
+    def _root_element(self):
+        return self.dom.documentElement
+
+    def _iter_elements(self, node):
+        # The node itself (if an element) and its descendants, in document order
+        if node.nodeType != node.ELEMENT_NODE:
+            return
+        stack = [node]
+        while stack:
+            elem = stack.pop()
+            yield elem
+            stack.extend(
+                child
+                for child in reversed(elem.childNodes)
+                if child.nodeType == child.ELEMENT_NODE
+            )
+
+    def _parent_element(self, node):
+        parent = node.parentNode
+        if parent is None or parent.nodeType != parent.ELEMENT_NODE:
+            return None
+        return parent
+
+    def _child_elements(self, elem):
+        return [
+            child for child in elem.childNodes if child.nodeType == child.ELEMENT_NODE
+        ]
+
+    def _children_indexed(self, elem):
+        # The child lists already checked are kept, as comparing one with the
+        # current childNodes by identity is much faster than checking again
+        children = elem.childNodes
+        if self._checked_children.get(elem) == children:
+            return True
+        if not super()._children_indexed(elem):
+            return False
+        self._checked_children[elem] = list(children)
+        return True
+
+    def _element_tag(self, elem):
+        return elem.tagName
+
+    def _element_line(self, elem):
+        return getattr(elem, "parse_position", (None,))[0]
+
+    def _element_attribute(self, elem, name):
+        return elem.getAttribute(name)
+
+    def _text_chunks(self, elem):
+        # Text nodes and child elements in document order, for _get_element_text()
+        for node in elem.childNodes:
+            if node.nodeType == node.TEXT_NODE:
+                # Skip whitespace-only text nodes (XML formatting)
+                if node.data.strip():
+                    yield node.data
+            elif node.nodeType == node.ELEMENT_NODE:
+                yield node
+
+    def _apply_edit(self, operation, elem, nodes):
+        """Insert the parsed nodes of one edit, see apply_edits()."""
+        if operation == "append_to":
+            for node in nodes:
+                elem.appendChild(node)
+            return nodes
+
+        parent = elem.parentNode
+        next_sibling = elem.nextSibling if operation == "insert_after" else elem
         for node in nodes:
-            elem.appendChild(node)
+            if next_sibling:
+                parent.insertBefore(node, next_sibling)
+            else:
+                parent.appendChild(node)
+        if operation == "replace_node":
+            parent.removeChild(elem)
         return nodes
 
     def get_next_rid(self):
@@ -305,43 +811,283 @@ class XMLEditor:
 
         Serializes the DOM tree and writes it back to the original file path,
         preserving the original encoding (ascii or utf-8).
+
+        Returns:
+            int: Number of bytes written
         """
         content = self.dom.toxml(encoding=self.encoding)
         self.xml_path.write_bytes(content)
+        self.modified = False
+        return len(content)
 
-    def _parse_fragment(self, xml_content):
+    def _parse_fragments(self, contents):
         """
-        Parse XML fragment and return list of imported nodes.
+        Parse XML fragments in one pass and import their nodes into this document.
 
         Args:
-            xml_content: String containing XML fragment
+            contents: Strings containing XML fragments
 
         Returns:
-            List of defusedxml.minidom.Node objects imported into this document
+            List with the imported defusedxml.minidom.Node objects of each fragment
 
         Raises:
-            AssertionError: If fragment contains no element nodes
-        """
-        # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
-        namespaces = []
-        if root_elem and root_elem.attributes:
-            for i in range(root_elem.attributes.length):
-                attr = root_elem.attributes.item(i)
-                if attr.name.startswith("xmlns"):  # type: ignore
-                    namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
-
-        ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
-        fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
-        ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
+            AssertionError: If a fragment contains no element nodes
+        """
+        # One wrapper element per fragment, inside a root element that
+        # declares the namespaces of the document's root element
+        wrapped = "".join(f"<fragment>{content}</fragment>" for content in contents)
+        fragment_doc = defusedxml.minidom.parseString(
+            f"<root {self._namespace_declarations()}>{wrapped}</root>"
+        )
+        wrappers = fragment_doc.documentElement.childNodes  # type: ignore
+        if len(wrappers) != len(contents):
+            raise ValueError("Each fragment must be well-formed on its own")
+
+        results = []
+        for wrapper in wrappers:
+            nodes = [
+                self.dom.importNode(child, deep=True) for child in wrapper.childNodes
+            ]
+            elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
+            assert elements, "Fragment must contain at least one element"
+            results.append(nodes)
+        return results
+
+    def _namespace_declarations(self):
+        # xmlns attributes of the root element, cached until attributes are added
+        attributes = self.dom.documentElement.attributes  # type: ignore
+        if self._namespaces is None or self._namespaces[0] != attributes.length:
+            declarations = " ".join(
+                f'{attr.name}="{attr.value}"'
+                for attr in attributes.values()
+                if attr.name.startswith("xmlns")
+            )
+            self._namespaces = (attributes.length, declarations)
+        return self._namespaces[1]
+
+
+class LxmlXMLEditor(_BaseXMLEditor):
+    """
+    lxml-backed editor with the same public API as XMLEditor.
+
+    Line numbers come from lxml's sourceline, so no SAX hooks are needed, and
+    parsing and saving large files is much faster than with minidom. Methods
+    take and return lxml elements instead of minidom nodes; text between
+    elements is kept as lxml text/tail strings, so the returned lists of
+    inserted nodes only hold elements (and comments or processing instructions).
+    Unlike XMLEditor, comments in the file are kept when saving.
+
+    Attributes:
+        xml_path: Path to the XML file being edited
+        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        tree: Parsed lxml.etree._ElementTree
+        modified: Whether the editing methods changed the tree since it was loaded
+            or last saved; direct DOM changes are not tracked
+    """
+
+    def __init__(self, xml_path):
+        """
+        Initialize with path to XML file and parse it.
+
+        Args:
+            xml_path: Path to XML file to edit (str or Path)
+
+        Raises:
+            ValueError: If the XML file does not exist or declares entities
+        """
+        super().__init__(xml_path)
+        self.tree = lxml.etree.parse(str(self.xml_path), LXML_PARSER)
+        _reject_entity_declarations(self.tree)
+
+    def _root_element(self):
+        return self.tree.getroot()
+
+    def _iter_elements(self, node):
+        if not isinstance(node.tag, str):
+            return iter(())
+        return node.iter(lxml.etree.Element)
+
+    def _parent_element(self, node):
+        return node.getparent()
+
+    def _child_elements(self, elem):
+        return elem.iterchildren(lxml.etree.Element)
+
+    def _element_tag(self, elem):
+        # The qualified name as written, like minidom's tagName
+        local = elem.tag.rpartition("}")[2]
+        return f"{elem.prefix}:{local}" if elem.prefix else local
+
+    def _element_line(self, elem):
+        return elem.sourceline
+
+    def _element_attribute(self, elem, name):
+        # Resolve the qualified name like getAttribute(); missing is ""
+        prefix, _, local = name.rpartition(":")
+        if prefix == "xml":
+            name = f"{{{XML_NAMESPACE}}}{local}"
+        elif prefix:
+            namespace = elem.nsmap.get(prefix)
+            if namespace is None:
+                return ""
+            name = f"{{{namespace}}}{local}"
+        return elem.get(name, "")
+
+    def _text_chunks(self, elem):
+        # Text and tails (skipping whitespace-only ones) and child elements
+        if elem.text and elem.text.strip():
+            yield elem.text
+        for child in elem:
+            if isinstance(child.tag, str):
+                yield child
+            if child.tail and child.tail.strip():
+                yield child.tail
+
+    def _apply_edit(self, operation, elem, fragment):
+        """
+        Insert the parsed nodes of one edit, see apply_edits().
+
+        Text around the nodes is moved like minidom text nodes would be: a
+        replaced element's tail follows the new nodes, and insert_after puts
+        them directly after the element, before the text following it.
+        """
+        text, nodes = fragment
+        if operation == "insert_after":
+            tail = elem.tail
+            elem.tail = text
+            anchor = elem
+            for node in nodes:
+                anchor.addnext(node)
+                anchor = node
+            anchor.tail = (anchor.tail or "") + (tail or "") or None
+            return nodes
+
+        if operation == "append_to":
+            if text:
+                if len(elem):
+                    elem[-1].tail = (elem[-1].tail or "") + text
+                else:
+                    elem.text = (elem.text or "") + text
+            for node in nodes:
+                elem.append(node)
+            return nodes
+
+        if text:
+            previous = elem.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + text
+            else:
+                parent = elem.getparent()
+                parent.text = (parent.text or "") + text
+        for node in nodes:
+            elem.addprevious(node)
+        if operation == "replace_node":
+            last = nodes[-1]
+            last.tail = (last.tail or "") + (elem.tail or "") or None
+            elem.getparent().remove(elem)
         return nodes
 
+    def get_next_rid(self):
+        """Get the next available rId for relationships files."""
+        max_id = 0
+        for rel_elem in self._tag_elements("Relationship"):
+            rel_id = rel_elem.get("Id", "")
+            if rel_id.startswith("rId"):
+                try:
+                    max_id = max(max_id, int(rel_id[3:]))
+                except ValueError:
+                    pass
+        return f"rId{max_id + 1}"
+
+    def save(self):
+        """
+        Save the edited XML back to the file.
+
+        Writes the same XML declaration as XMLEditor.save(), preserving the
+        original encoding (ascii or utf-8).
+
+        Returns:
+            int: Number of bytes written
+        """
+        declaration = f'<?xml version="1.0" encoding="{self.encoding}"?>'
+        content = declaration.encode() + lxml.etree.tostring(
+            self.tree, encoding=self.encoding, xml_declaration=False
+        )
+        self.xml_path.write_bytes(content)
+        self.modified = False
+        return len(content)
+
+    def _parse_fragments(self, contents):
+        """
+        Parse XML fragments in one pass, with the root element's namespaces.
+
+        Args:
+            contents: Strings containing XML fragments
+
+        Returns:
+            List with a (leading text or None, list of top-level nodes) tuple for
+            each fragment, where each node carries the text following it as its tail
+
+        Raises:
+            AssertionError: If a fragment contains no element nodes
+        """
+        wrapped = "".join(f"<fragment>{content}</fragment>" for content in contents)
+        root = lxml.etree.fromstring(
+            f"<root {self._namespace_declarations()}>{wrapped}</root>", LXML_PARSER
+        )
+        if len(root) != len(contents):
+            raise ValueError("Each fragment must be well-formed on its own")
+        # Like nodes imported by XMLEditor, inserted nodes have no line number
+        for node in root.iter():
+            node.sourceline = 0
+
+        results = []
+        for wrapper in root:
+            nodes = list(wrapper)
+            assert any(
+                isinstance(node.tag, str) for node in nodes
+            ), "Fragment must contain at least one element"
+            results.append((wrapper.text, nodes))
+        return results
+
+    def _namespace_declarations(self):
+        # Namespaces declared on the root element, which lxml can't change
+        if self._namespaces is None:
+            self._namespaces = " ".join(
+                f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+                for prefix, uri in self.tree.getroot().nsmap.items()
+            )
+        return self._namespaces
+
+
+# Editor classes by backend name, for create_editor()
+EDITOR_BACKENDS = {"minidom": XMLEditor, "lxml": LxmlXMLEditor}
+
+
+def create_editor(xml_path, backend="minidom"):
+    """
+    Create an editor for an XML file with the selected backend.
+
+    Args:
+        xml_path: Path to XML file to edit
+        backend: "minidom" for XMLEditor or "lxml" for LxmlXMLEditor
+
+    Returns:
+        XMLEditor or LxmlXMLEditor
+    """
+    try:
+        editor_class = EDITOR_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown editor backend: {backend}") from None
+    return editor_class(xml_path)
+
+
+def _reject_entity_declarations(tree):
+    """Raise ValueError if the document declares entities, as defusedxml does."""
+    dtd = tree.docinfo.internalDTD
+    if dtd is not None and any(True for _ in dtd.iterentities()):
+        raise ValueError(f"{tree.docinfo.URL}: entity declarations are not allowed")
+
 
 def _create_line_tracking_parser():
     """
@@ -0,0 +1,383 @@
+import copy
+import tempfile
+import unittest
+from pathlib import Path
+
+import lxml.etree
+from utilities import EDITOR_BACKENDS, create_editor
+
+
+DOCUMENT_XML = """<?xml version="1.0" encoding="ascii"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml">
+  <w:body>
+    <w:p w14:paraId="00000001">
+      <w:r>
+        <w:t>First paragraph</w:t>
+      </w:r>
+    </w:p>
+    <w:p w14:paraId="00000002">
+      <w:r>
+        <w:t xml:space="preserve">The &#8220;Agreement&#8221; reads </w:t>
+      </w:r>
+      <w:r>
+        <w:t>continues here</w:t>
+      </w:r>
+    </w:p>
+    <w:p w14:paraId="00000003">
+      <w:r>
+        <w:t>Last paragraph</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+RELS_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="styles" Target="styles.xml"/>
+  <Relationship Id="rId7" Type="settings" Target="settings.xml"/>
+  <Relationship Id="custom" Type="theme" Target="theme/theme1.xml"/>
+</Relationships>
+"""
+
+ENTITY_XML = """<?xml version="1.0"?>
+<!DOCTYPE root [<!ENTITY lol "lol">]>
+<root>&lol;</root>
+"""
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class EditorTests:
+    """Tests run against every editor backend (see the subclasses below)"""
+
+    backend = None
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.document = Path(self.temp_dir.name) / "document.xml"
+        self.document.write_text(DOCUMENT_XML, encoding="ascii")
+
+    def editor(self, path=None):
+        return create_editor(path or self.document, backend=self.backend)
+
+    def test_get_node_by_line_number(self):
+        """Test finding elements by line number and line range"""
+        editor = self.editor()
+        elem = editor.get_node(tag="w:t", line_number=6)
+        self.assertEqual(editor._get_element_text(elem), "First paragraph")
+        elem = editor.get_node(tag="w:p", line_number=range(16, 22))
+        self.assertEqual(editor._element_attribute(elem, "w14:paraId"), "00000003")
+
+    def test_get_node_by_attrs(self):
+        """Test finding elements by prefixed and xml: attributes"""
+        editor = self.editor()
+        elem = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000002"})
+        self.assertEqual(editor._element_line(elem), 9)
+        elem = editor.get_node(tag="w:t", attrs={"xml:space": "preserve"})
+        self.assertEqual(editor._element_line(elem), 11)
+
+    def test_get_node_by_contains(self):
+        """Test that contains matches text across runs, entities and Unicode"""
+        editor = self.editor()
+        para = editor.get_node(tag="w:p", contains="Agreement” reads continues")
+        self.assertEqual(editor._element_attribute(para, "w14:paraId"), "00000002")
+        for text in ("&#8220;Agreement", "“Agreement"):
+            with self.subTest(text=text):
+                elem = editor.get_node(tag="w:t", contains=text)
+                self.assertEqual(editor._element_line(elem), 11)
+
+    def test_contains_nested_and_across_blocks(self):
+        """Test contains on nested elements, containers and text spanning blocks"""
+        editor = self.editor()
+        self.assertIs(
+            editor.get_node(tag="w:body", contains="paragraphThe “Agreement"),
+            editor.get_node(tag="w:body"),
+        )
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", contains="paragraphThe")
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:r", contains="reads continues")
+
+        last = editor.get_node(tag="w:p", contains="Last")
+        editor.append_to(last, "<w:p><w:r><w:t>Nested text</w:t></w:r></w:p>")
+        with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+            editor.get_node(tag="w:p", contains="Nested")
+        self.assertIs(editor.get_node(tag="w:p", contains="paragraphNested"), last)
+        elem = editor.get_node(tag="w:t", contains="Nested")
+        self.assertEqual(editor._get_element_text(elem), "Nested text")
+
+    def test_get_node_errors(self):
+        """Test that missing and ambiguous matches raise ValueError"""
+        editor = self.editor()
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", contains="missing")
+        with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+            editor.get_node(tag="w:r", contains="paragraph")
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", attrs={"w:id": "1"}, line_number=4)
+
+    def test_edits(self):
+        """Test the editing methods on one document"""
+        editor = self.editor()
+        first = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+        nodes = editor.insert_before(first, "<w:p><w:r><w:t>Before</w:t></w:r></w:p>")
+        self.assertEqual(len([n for n in nodes if _is_element(n)]), 1)
+        editor.insert_after(
+            first,
+            "<w:p><w:r><w:t>After 1</w:t></w:r></w:p>\n"
+            "<w:p><w:r><w:t>After 2</w:t></w:r></w:p>",
+        )
+        run = editor.get_node(tag="w:r", contains="continues")
+        editor.replace_node(run, "<w:r><w:t>is replaced</w:t></w:r>")
+        last = editor.get_node(tag="w:p", contains="Last")
+        editor.append_to(last, "<w:r><w:t> and more</w:t></w:r>")
+
+        editor.save()
+        reloaded = self.editor()
+        body = reloaded.get_node(tag="w:body")
+        self.assertEqual(
+            reloaded._get_element_text(body),
+            "BeforeFirst paragraphAfter 1After 2"
+            "The “Agreement” reads is replacedLast paragraph and more",
+        )
+        # Inserted nodes have no line numbers and are found by content
+        after = editor.get_node(tag="w:t", contains="After 1")
+        self.assertIsNone(editor._element_line(after))
+
+    def apply_sample_edits(self, editor):
+        """Helper making edits that depend on their order, returning their results"""
+        first = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+        run = editor.get_node(tag="w:r", contains="continues")
+        last = editor.get_node(tag="w:p", contains="Last")
+        return [
+            editor.insert_after(first, "<w:p><w:r><w:t>After 1</w:t></w:r></w:p>"),
+            editor.insert_after(first, " <w:p><w:r><w:t>After 2</w:t></w:r></w:p>"),
+            editor.replace_node(run, "<w:r><w:t>is replaced</w:t></w:r>\n"),
+            editor.insert_before(last, "<!-- note --><w:p/>"),
+            editor.append_to(last, "<w:r><w:t> and more</w:t></w:r>"),
+        ]
+
+    def test_batch_same_result_as_single_edits(self):
+        """Test that batched edits are applied in order when the block ends"""
+        self.apply_sample_edits(self.editor())
+        sequential = self.editor()
+        self.apply_sample_edits(sequential)
+        sequential.save()
+        expected = self.document.read_bytes()
+
+        self.document.write_text(DOCUMENT_XML, encoding="ascii")
+        editor = self.editor()
+        with editor.batch():
+            results = self.apply_sample_edits(editor)
+            self.assertEqual(results, [[], [], [], [], []])
+            # Lookups see the document as it was before the block
+            editor.get_node(tag="w:r", contains="continues")
+        self.assertTrue(all(results))
+        editor.get_node(tag="w:p", contains="After 1")
+        editor.save()
+        self.assertEqual(self.document.read_bytes(), expected)
+
+    def test_batch_dropped_on_error(self):
+        """Test that an exception in the block drops the queued edits"""
+        editor = self.editor()
+        first = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+        with self.assertRaises(KeyError):
+            with editor.batch():
+                editor.insert_after(first, "<w:p><w:r><w:t>Dropped</w:t></w:r></w:p>")
+                raise KeyError("stop")
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", contains="Dropped")
+        with self.assertRaisesRegex(ValueError, "Unknown edit operation"):
+            editor.apply_edits([("remove", first, "<w:p/>")])
+
+    def test_lookups_follow_edits(self):
+        """Test that indexed lookups see the results of earlier edits"""
+        editor = self.editor()
+        # Build the tag, attribute, line and text indexes
+        para = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000002"})
+        editor.get_node(tag="w:t", line_number=range(1, 30), contains="continues")
+        editor.get_node(tag="w:body", contains="continues")
+
+        run = editor.get_node(tag="w:r", contains="continues")
+        editor.replace_node(run, '<w:r w:rsidR="00AB"><w:t>is replaced</w:t></w:r>')
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:t", line_number=range(1, 30), contains="continues")
+        self.assertIs(editor.get_node(tag="w:p", contains="is replaced"), para)
+        editor.get_node(tag="w:body", contains="reads is replaced")
+        new_run = editor.get_node(tag="w:r", attrs={"w:rsidR": "00AB"})
+
+        editor.insert_after(para, '<w:p w14:paraId="00000004"/>')
+        editor.get_node(tag="w:p", attrs={"w14:paraId": "00000004"})
+        editor.append_to(new_run, "<w:t>, twice</w:t>")
+        self.assertIs(editor.get_node(tag="w:p", contains="replaced, twice"), para)
+        # Lines of the original elements are unchanged by the edits
+        last = editor.get_node(tag="w:p", line_number=17)
+        self.assertEqual(editor._element_attribute(last, "w14:paraId"), "00000003")
+
+    def test_lookups_follow_direct_changes(self):
+        """Test that lookups see changes made directly to the tree"""
+        editor = self.editor()
+        first = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+        editor.get_node(tag="w:p", contains="Last")
+        _set_attribute(first, "w14:paraId", "0000000A")
+        self.assertIs(
+            editor.get_node(tag="w:p", attrs={"w14:paraId": "0000000A"}), first
+        )
+
+        # Removed nodes are no longer found, moved ones are found again
+        last = editor.get_node(tag="w:p", line_number=17)
+        _remove(last)
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", contains="Last")
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", line_number=17)
+        _append(_parent(first), last)
+        self.assertIs(editor.get_node(tag="w:p", contains="Last"), last)
+
+        # A copy added next to the only match makes it ambiguous
+        duplicate = _clone(last)
+        _append(_parent(last), duplicate)
+        with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+            editor.get_node(tag="w:p", contains="Last")
+        _remove(duplicate)
+        self.assertIs(editor.get_node(tag="w:p", contains="Last"), last)
+
+        # Changed text
+        text = editor.get_node(tag="w:t", contains="First")
+        _set_text(text, "Changed paragraph")
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", contains="First")
+        self.assertIs(editor.get_node(tag="w:p", contains="Changed"), first)
+
+        _set_attribute(first, "w14:paraId", "0000000B")
+        editor.invalidate_indexes()
+        found = editor.get_node(tag="w:p", attrs={"w14:paraId": "0000000B"})
+        self.assertIs(found, first)
+
+    def test_modified(self):
+        """Test that edits and invalidate_indexes() mark the file as modified"""
+        editor = self.editor()
+        first = editor.get_node(tag="w:p", contains="continues")
+        self.assertFalse(editor.modified)
+        with editor.batch():
+            editor.append_to(first, "<w:r><w:t>, more</w:t></w:r>")
+            self.assertFalse(editor.modified)
+        self.assertTrue(editor.modified)
+        self.assertEqual(editor.save(), self.document.stat().st_size)
+        self.assertFalse(editor.modified)
+
+        editor.invalidate_indexes()
+        self.assertTrue(editor.modified)
+
+    def test_save_keeps_encoding(self):
+        """Test that the XML declaration and ASCII character references are kept"""
+        editor = self.editor()
+        editor.save()
+        data = self.document.read_bytes()
+        self.assertTrue(data.startswith(b'<?xml version="1.0" encoding="ascii"?>'))
+        self.assertIn(b"&#8220;Agreement&#8221;", data)
+
+    def test_get_next_rid(self):
+        """Test the next rId skips non-numeric IDs"""
+        rels = Path(self.temp_dir.name) / "document.xml.rels"
+        rels.write_text(RELS_XML, encoding="utf-8")
+        self.assertEqual(self.editor(rels).get_next_rid(), "rId8")
+
+    def test_entity_declarations_rejected(self):
+        """Test that documents declaring entities are refused"""
+        path = Path(self.temp_dir.name) / "entities.xml"
+        path.write_text(ENTITY_XML, encoding="utf-8")
+        with self.assertRaises(ValueError):
+            self.editor(path)
+
+    def test_fragment_needs_element(self):
+        """Test that fragments without elements are refused"""
+        editor = self.editor()
+        first = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+        with self.assertRaises(AssertionError):
+            editor.insert_after(first, "just text")
+
+
+class TestMinidomEditor(EditorTests, unittest.TestCase):
+    backend = "minidom"
+
+
+class TestLxmlEditor(EditorTests, unittest.TestCase):
+    backend = "lxml"
+
+
+class TestBackendParity(unittest.TestCase):
+    """Same edits through every backend must produce the same document"""
+
+    def test_edits_produce_same_document(self):
+        results = {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for backend in EDITOR_BACKENDS:
+                path = Path(temp_dir) / f"{backend}.xml"
+                path.write_text(DOCUMENT_XML, encoding="ascii")
+                editor = create_editor(path, backend=backend)
+                first = editor.get_node(tag="w:p", line_number=4)
+                editor.insert_after(first, " <w:p/> text <w:p/> ")
+                editor.insert_before(first, "<!-- note --><w:p/>")
+                run = editor.get_node(tag="w:r", contains="Agreement")
+                editor.replace_node(run, "<w:r><w:t>x</w:t></w:r>\n")
+                editor.append_to(editor.get_node(tag="w:body"), "<w:sectPr/>")
+                editor.save()
+                results[backend] = lxml.etree.tostring(
+                    lxml.etree.parse(str(path)), method="c14n"
+                )
+        self.assertEqual(results["lxml"], results["minidom"])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_editor(__file__, backend="expat")
+
+
+def _is_element(node):
+    """Element check for both minidom nodes and lxml elements"""
+    if hasattr(node, "nodeType"):
+        return node.nodeType == node.ELEMENT_NODE
+    return isinstance(node.tag, str)
+
+
+def _parent(node):
+    """Parent of a minidom node or lxml element"""
+    return node.parentNode if hasattr(node, "parentNode") else node.getparent()
+
+
+def _remove(node):
+    """Remove a minidom node or lxml element directly from its parent"""
+    parent = _parent(node)
+    parent.removeChild(node) if hasattr(parent, "removeChild") else parent.remove(node)
+
+
+def _append(parent, node):
+    """Append a child directly to a minidom node or lxml element"""
+    parent.appendChild(node) if hasattr(parent, "appendChild") else parent.append(node)
+
+
+def _clone(node):
+    """Deep copy of a minidom node or lxml element"""
+    return node.cloneNode(True) if hasattr(node, "cloneNode") else copy.deepcopy(node)
+
+
+def _set_text(elem, text):
+    """Set the text of a w:t directly on a minidom or lxml element"""
+    if hasattr(elem, "firstChild"):
+        elem.firstChild.data = text
+    else:
+        elem.text = text
+
+
+def _set_attribute(elem, name, value):
+    """Set a prefixed attribute directly on a minidom or lxml element"""
+    if hasattr(elem, "setAttribute"):
+        elem.setAttribute(name, value)
+    else:
+        prefix, _, local = name.partition(":")
+        elem.set(f"{{{elem.nsmap[prefix]}}}{local}", value)
+
+
+if __name__ == "__main__":
+    unittest.main()
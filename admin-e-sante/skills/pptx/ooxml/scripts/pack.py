@@ -4,28 +4,144 @@ Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting
 
 Example usage:
     python pack.py <input_directory> <office_file> [--force]
+                   [--mode default|fast|small] [--compresslevel N] [--threads N]
+                   [--jobs N] [--reuse-unchanged] [--soffice-workers N]
 """
 
 import argparse
+import collections
+import concurrent.futures
+import contextlib
+import fnmatch
+import functools
+import hashlib
+import io
+import json
+import os
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
+import zlib
 from pathlib import Path
 
+import lxml.etree
+
+try:
+    from . import soffice_pool
+except ImportError:  # Run as a script, or imported from this directory
+    import soffice_pool
+
+# Seconds allowed for a cold-start soffice conversion in validate_document()
+VALIDATION_TIMEOUT = 30
+
+# Manifest written by unpack.py into the unpacked directory; it is never packed.
+# It records the source file and each part as unpacked (size, mtime, SHA-256,
+# compression), so pack_document() can copy unchanged parts from the source.
+# Format: {"source": path, "source_size": int, "source_mtime_ns": int,
+#          "members": {name: {"size", "mtime_ns", "sha256", "compress_type",
+#                             "compress_size"} or {"lazy": true, ...}}}
+MANIFEST_NAME = ".ooxml-manifest.json"
+
+# ZIP general purpose flag for sizes and CRC following the data, and the extra
+# field header ID of Zip64 sizes; both are rewritten when copying a member raw
+_DATA_DESCRIPTOR_FLAG = 0x08
+_ZIP64_EXTRA_ID = 0x0001
+
+# Parser for package parts: no entity expansion, DTD loading or network access
+XML_PARSER = lxml.etree.XMLParser(
+    resolve_entities=False, load_dtd=False, no_network=True, huge_tree=True
+)
+
+# Media formats that are already compressed; deflating them again costs time
+# for little or no gain. EMF/WMF are not on the list, since they deflate well.
+PRECOMPRESSED_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".tif",
+    ".tiff",
+    ".webp",
+    ".wdp",
+    ".mp3",
+    ".m4a",
+    ".mp4",
+    ".m4v",
+    ".mov",
+    ".wmv",
+    ".wma",
+    ".avi",
+    ".zip",
+}
+
+# Compression presets for pack_document()
+# Format: mode -> (deflate level for compressed members, store pre-compressed media)
+COMPRESSION_MODES = {
+    "default": (zlib.Z_DEFAULT_COMPRESSION, True),
+    "fast": (1, True),  # Intermediate artifacts
+    "small": (9, False),  # Final output
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--mode",
+        choices=sorted(COMPRESSION_MODES),
+        default="default",
+        help="Compression preset: fast for intermediate files, small for final output",
+    )
+    parser.add_argument(
+        "--compresslevel",
+        type=int,
+        choices=range(10),
+        metavar="0-9",
+        help="Deflate level, overriding the preset's level",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Threads compressing members in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Processes condensing XML parts in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--reuse-unchanged",
+        action="store_true",
+        help="Copy parts unchanged since unpacking from the source file as is",
+    )
+    parser.add_argument(
+        "--soffice-workers",
+        type=int,
+        default=1,
+        help="soffice processes kept running to validate on; 0 starts soffice "
+        "per file (default: 1)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            mode=args.mode,
+            compresslevel=args.compresslevel,
+            threads=args.threads,
+            jobs=args.jobs,
+            reuse_unchanged=args.reuse_unchanged,
+            soffice_workers=args.soffice_workers,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +158,38 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    mode="default",
+    compresslevel=None,
+    threads=1,
+    jobs=1,
+    soffice_pool=None,
+    reuse_unchanged=False,
+    soffice_workers=1,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        mode: Compression preset from COMPRESSION_MODES ("default", "fast" or
+            "small"); "default" and "fast" store pre-compressed media as is
+        compresslevel: Deflate level 0-9, overriding the preset's level
+        threads: Number of threads compressing members in parallel; members
+            are still written one at a time, in the same order
+        jobs: Number of processes condensing XML parts in parallel; the
+            output is byte-identical to jobs=1
+        soffice_pool: Optional soffice_pool.SofficePool to validate on instead
+            of the process-wide one
+        reuse_unchanged: If True and input_dir was made by unpack.py, parts
+            unchanged since unpacking are copied from the source file without
+            recompressing (default: False); lazy parts are always copied that way
+        soffice_workers: Size of the process-wide soffice_pool.shared_pool()
+            used when soffice_pool is None; 0 starts soffice for this file only
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,34 +202,394 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(f"Unknown compression mode: {mode}")
+    level, store_media = COMPRESSION_MODES[mode]
+    if compresslevel is not None:
+        level = compresslevel
+
+    # Write each part straight into the archive; XML parts are condensed in
+    # memory so the input directory is never copied or modified
+    files = {}
+    for f in input_dir.rglob("*"):
+        if f.is_file() and f.name != MANIFEST_NAME:
+            files[f.relative_to(input_dir).as_posix()] = f
+
+    with contextlib.ExitStack() as stack:
+        # Source file of an unpack.py directory, to copy unchanged parts from
+        source, entries = _open_source(input_dir, reuse_unchanged)
+        source_fp = None
+        if source is not None:
+            stack.callback(source.close)
+            source_fp = stack.enter_context(open(source.filename, "rb"))
+        members = _plan_members(files, source, entries, reuse_unchanged, store_media)
+
+        # Never truncate the source while copying from it
+        write_file = output_file
+        if source is not None and output_file.resolve() == Path(source.filename):
+            write_file = output_file.with_name(output_file.name + ".tmp")
+        write_file.parent.mkdir(parents=True, exist_ok=True)
+        zf = stack.enter_context(
+            zipfile.ZipFile(write_file, "w", zipfile.ZIP_DEFLATED)
+        )
+
+        # Condense XML parts, optionally in worker processes
+        if jobs > 1:
+            executor = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+            )
+            loaded = _ordered_map(executor, _load_member, members, jobs * 2)
+        else:
+            loaded = map(_load_member, members)
+
+        # Deflate members, optionally in worker threads, and write them in order
+        if threads > 1 and _can_append_raw(zf):
+            executor = stack.enter_context(
+                concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+            )
+            deflate = functools.partial(_deflate_member, level=level)
+            for member, data, raw in _ordered_map(
+                executor, deflate, loaded, threads * 2
+            ):
+                if raw is None:
+                    _write_member(zf, member, data, level, source_fp)
+                else:
+                    _write_raw_member(zf, *raw)
+        else:
+            for member, data in loaded:
+                _write_member(zf, member, data, level, source_fp)
+
+    if write_file != output_file:
+        write_file.replace(output_file)
+
+    # The manifest must describe the new file if it replaced the source
+    manifest = read_manifest(input_dir)
+    if manifest and output_file.resolve() == Path(manifest["source"]):
+        _restamp_manifest(input_dir, output_file, members)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(
+            output_file, pool=soffice_pool, workers=soffice_workers
+        ):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+def _open_source(input_dir, reuse_unchanged):
+    """Open the file input_dir was unpacked from, if its parts can be reused.
+
+    Returns:
+        tuple: (ZipFile, manifest member entries), or (None, {}) if there is
+        no manifest, reuse is disabled, or the source file is gone or changed
+        since unpacking
+
+    Raises:
+        ValueError: If lazy parts can't be copied because the source changed
+    """
+    manifest = read_manifest(input_dir)
+    if not manifest:
+        return None, {}
+    lazy = [name for name, entry in manifest["members"].items() if entry.get("lazy")]
+    if not (reuse_unchanged or lazy):
+        return None, {}
+
+    if not _source_unchanged(manifest):
+        if lazy:
+            raise ValueError(
+                f"{manifest['source']} changed since unpacking; "
+                f"can't copy {len(lazy)} lazy part(s) from it"
+            )
+        return None, {}
+
+    return zipfile.ZipFile(manifest["source"]), manifest["members"]
+
+
+def _plan_members(files, source, entries, reuse_unchanged, store_media):
+    """List the members to write as (path, arcname, compressed, source_info).
+
+    source_info is the source file's ZipInfo for members copied from there
+    as is (path is None for lazy parts), else None. Members of the source
+    come first, in its order, followed by new files.
+    """
+    members = []
+    for name, entry in entries.items():
+        path = files.get(name)
+        lazy = entry.get("lazy")
+        if path is None and not lazy:
+            continue  # Deleted since unpacking
+        info = None
+        # A file written over a lazy part since unpacking replaces it
+        if path is None or (
+            reuse_unchanged and not lazy and _is_unchanged(path, entry)
+        ):
+            info = source.getinfo(name)
+            if not _can_copy_raw(info):
+                if path is None:
+                    raise ValueError(f"{name}: can't copy lazy part from source")
+                info = None
+        compressed = _should_compress(name, store_media)
+        members.append((path, Path(name), compressed, info))
+    for name, path in files.items():
+        if name not in entries:
+            compressed = _should_compress(name, store_media)
+            members.append((path, Path(name), compressed, None))
+    return members
+
+
+def _is_unchanged(path, entry):
+    """Check a file against its manifest entry, hashing only if needed."""
+    stat = path.stat()
+    if stat.st_size != entry["size"]:
+        return False
+    if stat.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    return hashlib.sha256(path.read_bytes()).hexdigest() == entry["sha256"]
+
+
+def _can_copy_raw(info):
+    """Check whether a source member's compressed bytes can be copied as is."""
+    encrypted = info.flag_bits & 0x1
+    return not encrypted and info.compress_type in (
+        zipfile.ZIP_STORED,
+        zipfile.ZIP_DEFLATED,
+    )
+
+
+def _should_compress(name, store_media):
+    """Check whether a member should be deflated rather than stored."""
+    return not (store_media and Path(name).suffix.lower() in PRECOMPRESSED_EXTENSIONS)
+
+
+def _is_xml_part(path):
+    # Not Path.suffix, which is empty for the root "_rels/.rels"
+    return path.name.endswith((".xml", ".rels"))
+
+
+def _ordered_map(executor, fn, items, window):
+    """Like executor.map(), but submits at most window items ahead of the
+    consumer, so only a bounded number of results are held in memory."""
+    pending = collections.deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _load_member(member):
+    """Return (member, data) with the condensed bytes of an XML part.
+
+    data is None for other files, which are copied from disk when written.
+    Runs in worker processes when packing with jobs > 1.
+    """
+    path, arcname, _, source_info = member
+    if source_info is not None or not _is_xml_part(path):
+        return member, None
+    return member, condense_xml(path.read_bytes(), name=arcname)
+
+
+def _write_member(zf, member, data, level, source_fp=None):
+    """Write one member to zf, compressing it in the calling thread.
+
+    source_fp is the source file opened in binary mode, for members copied
+    from there.
+    """
+    path, arcname, compressed, source_info = member
+    if source_info is not None:
+        _copy_raw_member(zf, source_fp, source_info)
+        return
+    compress_type = zipfile.ZIP_DEFLATED if compressed else zipfile.ZIP_STORED
+    if data is None:
+        zf.write(path, arcname, compress_type, compresslevel=level)
+    else:
+        zinfo = zipfile.ZipInfo.from_file(path, arcname)
+        zf.writestr(zinfo, data, compress_type=compress_type, compresslevel=level)
+
+
+def _deflate_member(loaded, level):
+    """Deflate a loaded member into a raw deflate stream for _write_raw_member().
+
+    zlib releases the GIL while compressing, so worker threads compress
+    members in parallel while the main thread writes finished ones.
+
+    Returns:
+        tuple: (member, data, raw), where raw is (ZipInfo, compressed bytes,
+        CRC-32, uncompressed size), or None for stored members
+    """
+    member, data = loaded
+    path, arcname, compressed, source_info = member
+    if not compressed or source_info is not None:
+        return member, data, None
+
+    if data is None:
+        data = path.read_bytes()
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    return member, None, (zinfo, deflated, zlib.crc32(data), len(data))
+
+
+def _write_raw_member(zf, zinfo, compressed, crc, file_size):
+    """Append an already compressed member to a ZipFile opened for writing.
+
+    Only call this if _can_append_raw(zf) is True.
+    """
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(compressed)
+    _append_raw(zf, zinfo, compressed)
+
+
+def _can_append_raw(zf):
+    """Check whether _append_raw() supports zf's zipfile implementation.
+
+    zipfile has no public API for writing pre-compressed data, so _append_raw()
+    mirrors ZipFile.writestr() from CPython 3.8 to 3.13. On other versions,
+    members are written through the public API instead.
+    """
+    return (3, 8) <= sys.version_info[:2] <= (3, 13) and all(
+        hasattr(zf, name) for name in ("_writecheck", "_didModify", "fp", "start_dir")
+    )
+
+
+def _append_raw(zf, zinfo, compressed):
+    """Write the local header and data of a member the way ZipFile.writestr() does.
+
+    This is the only code using zipfile internals; see _can_append_raw().
+    """
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    zf._writecheck(zinfo)
+    zf._didModify = True
+    zf.fp.seek(zf.start_dir)
+    zinfo.header_offset = zf.fp.tell()
+    zf.fp.write(zinfo.FileHeader(zip64))
+    zf.fp.write(compressed)
+    zf.start_dir = zf.fp.tell()
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def _copy_raw_member(zf, source_fp, info):
+    """Copy a member's compressed bytes from the source archive to zf.
+
+    The copy keeps the member's flags, extra field and attributes, except the
+    data descriptor flag and Zip64 extra records: its sizes are written in the
+    local header, and zipfile adds Zip64 records itself when needed.
+    """
+    source_fp.seek(info.header_offset)
+    header = struct.unpack(
+        zipfile.structFileHeader, source_fp.read(zipfile.sizeFileHeader)
+    )
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"{info.filename}: bad local file header")
+    # Skip the file name and extra field, whose lengths end the header
+    source_fp.seek(header[10] + header[11], io.SEEK_CUR)
+    compressed = source_fp.read(info.compress_size)
+
+    zinfo = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    for attribute in (
+        "compress_type",
+        "comment",
+        "create_system",
+        "create_version",
+        "extract_version",
+        "internal_attr",
+        "external_attr",
+    ):
+        setattr(zinfo, attribute, getattr(info, attribute))
+    zinfo.flag_bits = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG
+    zinfo.extra = _strip_zip64_extra(info.extra)
+
+    if _can_append_raw(zf):
+        _write_raw_member(zf, zinfo, compressed, info.CRC, info.file_size)
+        return
+    # Let zipfile compress the member again (it resets the flags)
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        compressed = zlib.decompress(compressed, -15)
+    zf.writestr(zinfo, compressed)
+
+
+def _strip_zip64_extra(extra):
+    """Return a ZIP extra field without its Zip64 extended information records."""
+    records = []
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, size = struct.unpack("<HH", extra[offset : offset + 4])
+        if header_id != _ZIP64_EXTRA_ID:
+            records.append(extra[offset : offset + 4 + size])
+        offset += 4 + size
+    return b"".join(records)
+
+
+def _restamp_manifest(input_dir, source_file, members):
+    """Point the manifest of input_dir at its source file after repacking it.
+
+    Parts copied from the old source keep their entries. Other parts are
+    hashed again, since the new source now holds their current content.
+
+    Args:
+        input_dir: Unpacked directory whose manifest to update
+        source_file: The repacked source file
+        members: Members as planned by _plan_members()
+    """
+    old_entries = read_manifest(input_dir)["members"]
+    manifest = new_manifest(source_file)
+    with zipfile.ZipFile(source_file) as zf:
+        for path, arcname, _, source_info in members:
+            name = arcname.as_posix()
+            entry = old_entries.get(name) if source_info is not None else None
+            if entry is None:
+                data = path.read_bytes()
+                stat = path.stat()
+                entry = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+            manifest["members"][name] = {
+                **entry,
+                **compression_info(zf.getinfo(name)),
+            }
+    write_manifest(input_dir, manifest)
+
+
+def validate_document(doc_path, pool=None, timeout=VALIDATION_TIMEOUT, workers=1):
+    """Validate document by converting to HTML with soffice.
+
+    Files are converted on a pool of running soffice workers when the UNO
+    bindings are installed; otherwise, or if the workers can't be started,
+    soffice is started for this file.
+
+    Args:
+        doc_path: Path to the Office file
+        pool: Optional soffice_pool.SofficePool to convert on (default: the
+            process-wide soffice_pool.shared_pool())
+        timeout: Seconds allowed for the conversion
+        workers: Size of the process-wide pool when it is created; 0 starts
+            soffice for this file instead, unless pool is given
+
+    Returns:
+        bool: True if the document converted (or soffice is unavailable)
+    """
+    try:
+        if pool is None and workers > 0:
+            pool = soffice_pool.shared_pool(workers)
+        if pool is not None:
+            ok, error = pool.validate(doc_path, timeout=timeout)
+    except soffice_pool.SofficePoolError as e:
+        print(f"Warning: soffice pool unavailable ({e})", file=sys.stderr)
+    else:
+        if pool is not None:
+            if not ok:
+                print(f"Validation error: {error}", file=sys.stderr)
+            return ok
+
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -111,7 +612,7 @@ def validate_document(doc_path):
                     str(doc_path),
                 ],
                 capture_output=True,
-                timeout=10,
+                timeout=timeout,
                 text=True,
             )
             if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
@@ -130,29 +631,255 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+def condense_xml(data, name="XML part"):
+    """Strip pretty-printing whitespace and comments from an XML part.
+
+    Whitespace-only text and comments are removed, except inside text elements
+    (any element with local name "t", e.g. w:t or a:t), whose content is kept
+    exactly.
+
+    Args:
+        data: Content of the part as bytes
+        name: Part name used in error messages
+
+    Returns:
+        bytes: The condensed part, encoded as UTF-8 with an XML declaration
+
+    Raises:
+        ValueError: If the part is not well-formed or declares entities
+    """
+    tree = _parse_xml(data, name)
+
+    comments = []
+    for node in tree.getroot().iter():
+        parent = node.getparent()
+        if parent is not None and not _is_text_element(parent):
+            # Whitespace between this node and the next one
+            if node.tail and not node.tail.strip():
+                node.tail = None
+            if node.tag is lxml.etree.Comment:
+                comments.append(node)
+        if isinstance(node.tag, str) and not _is_text_element(node):
+            if node.text and not node.text.strip():
+                node.text = None
+
+    # Remove comments, keeping any text that follows them
+    for comment in comments:
+        parent = comment.getparent()
+        if comment.tail:
+            previous = comment.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + comment.tail
+            else:
+                parent.text = (parent.text or "") + comment.tail
+        parent.remove(comment)
+
+    declaration = '<?xml version="1.0" encoding="UTF-8"'
+    if tree.docinfo.standalone is not None:
+        declaration += f' standalone="{"yes" if tree.docinfo.standalone else "no"}"'
+    return (declaration + "?>").encode() + lxml.etree.tostring(tree, encoding="UTF-8")
+
+
+def pretty_print_xml(data, name="XML part"):
+    """Indent an XML part for editing, as unpack.py does.
+
+    Only whitespace between elements is changed; condense_xml() undoes it.
+    Non-ASCII characters are written as character references.
+
+    Args:
+        data: Content of the part as bytes
+        name: Part name used in error messages
+
+    Returns:
+        bytes: The indented part, with an ASCII XML declaration
+
+    Raises:
+        ValueError: If the part is not well-formed or declares entities
+    """
+    tree = _parse_xml(data, name)
+    lxml.etree.indent(tree, space="  ")
+    return (
+        b'<?xml version="1.0" encoding="ascii"?>\n'
+        + lxml.etree.tostring(tree, encoding="ascii", xml_declaration=False)
+        + b"\n"
+    )
+
+
+def _parse_xml(data, name):
+    """Parse a part with XML_PARSER, rejecting entity declarations."""
+    try:
+        tree = lxml.etree.parse(io.BytesIO(data), XML_PARSER)
+    except lxml.etree.XMLSyntaxError as e:
+        raise ValueError(f"{name}: {e}") from e
+    dtd = tree.docinfo.internalDTD
+    if dtd is not None and any(True for _ in dtd.iterentities()):
+        raise ValueError(f"{name}: entity declarations are not allowed")
+    return tree
+
+
+def _is_text_element(elem):
+    """Check whether an element holds document text (w:t, a:t, t, ...)."""
+    tag = elem.tag
+    return isinstance(tag, str) and (tag == "t" or tag.endswith("}t"))
+
+
+def read_manifest(unpacked_dir):
+    """Return the unpack manifest of a directory, or None if it has none."""
+    manifest_file = Path(unpacked_dir) / MANIFEST_NAME
+    if not manifest_file.is_file():
+        return None
+    return json.loads(manifest_file.read_text(encoding="utf-8"))
+
+
+def write_manifest(unpacked_dir, manifest):
+    """Write the unpack manifest of a directory."""
+    manifest_file = Path(unpacked_dir) / MANIFEST_NAME
+    manifest_file.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+
+
+def new_manifest(source_file):
+    """Return an empty manifest for a directory unpacked from source_file."""
+    source_file = Path(source_file).resolve()
+    stat = source_file.stat()
+    return {
+        "source": str(source_file),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "members": {},
+    }
+
+
+def _source_unchanged(manifest):
+    """Check that the manifest's source file wasn't modified since unpacking."""
+    try:
+        stat = Path(manifest["source"]).stat()
+    except OSError:
+        return False
+    return (stat.st_size, stat.st_mtime_ns) == (
+        manifest["source_size"],
+        manifest["source_mtime_ns"],
+    )
+
+
+def member_matches(name, patterns):
+    """Check a member name ("word/document.xml") against glob patterns.
+
+    Patterns may start with "/", as part names do in [Content_Types].xml, and
+    "*" also matches across "/".
+    """
+    return any(fnmatch.fnmatchcase(name, pattern.lstrip("/")) for pattern in patterns)
+
+
+def extract_member(zf, name, output_dir, pretty=True):
+    """Extract one member of an open archive, pretty-printing XML parts.
+
+    Args:
+        zf: Source zipfile.ZipFile
+        name: Member name
+        output_dir: Unpacked directory to write into
+        pretty: If True, XML parts are indented with pretty_print_xml()
+
+    Returns:
+        dict: The member's manifest entry
+
+    Raises:
+        ValueError: If the member name escapes output_dir or an XML part is
+            malformed
+    """
+    output_dir = Path(output_dir)
+    path = output_dir.joinpath(*name.split("/"))
+    if path.resolve() != output_dir.resolve() / name:
+        raise ValueError(f"{name}: member name is outside the output directory")
+
+    data = zf.read(name)
+    if pretty and _is_xml_part(path):
+        data = pretty_print_xml(data, name=name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+    stat = path.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        **compression_info(zf.getinfo(name)),
+    }
+
+
+def compression_info(info):
+    """Return the manifest fields describing how a source member is stored."""
+    return {"compress_type": info.compress_type, "compress_size": info.compress_size}
+
+
+def materialize_parts(unpacked_dir, patterns=None):
+    """Extract parts that a lazy unpack left inside the source file.
+
+    Args:
+        unpacked_dir: Directory unpacked with unpack.py --lazy
+        patterns: Glob patterns selecting the parts (see member_matches);
+            all lazy parts if None
+
+    Returns:
+        list: Names of the parts extracted
+    """
+    manifest = read_manifest(unpacked_dir)
+    if not manifest:
+        return []
+
+    # Files written over lazy parts since unpacking are kept
+    members = manifest["members"]
+    selected = [
+        name
+        for name, entry in members.items()
+        if entry.get("lazy")
+        and (patterns is None or member_matches(name, patterns))
+        and not (Path(unpacked_dir) / name).exists()
+    ]
+    if selected:
+        if not _source_unchanged(manifest):
+            raise ValueError(f"{manifest['source']} changed since unpacking")
+        with zipfile.ZipFile(manifest["source"]) as zf:
+            for name in selected:
+                members[name] = extract_member(zf, name, unpacked_dir)
+        write_manifest(unpacked_dir, manifest)
+    return selected
+
+
+@contextlib.contextmanager
+def materialized_view(unpacked_dir):
+    """Yield a directory with every part of unpacked_dir on disk, leaving it untouched.
+
+    If a lazy unpack left parts inside the source file, they are extracted into
+    a temporary view of the directory, whose other files are hard links (or
+    copies where linking fails). Otherwise unpacked_dir itself is yielded.
+
+    Args:
+        unpacked_dir: Unpacked document directory, possibly from unpack.py --lazy
+    """
+    unpacked_dir = Path(unpacked_dir)
+    manifest = read_manifest(unpacked_dir)
+    if not manifest or not any(
+        entry.get("lazy") for entry in manifest["members"].values()
+    ):
+        yield unpacked_dir
+        return
+
+    with tempfile.TemporaryDirectory(prefix="ooxml_view_") as temp_dir:
+        view_dir = Path(temp_dir) / "unpacked"
+        shutil.copytree(unpacked_dir, view_dir, copy_function=link_or_copy)
+        # materialize_parts() rewrites the manifest, which must not be a link
+        (view_dir / MANIFEST_NAME).unlink()
+        write_manifest(view_dir, manifest)
+        materialize_parts(view_dir)
+        yield view_dir
+
+
+def link_or_copy(src, dst):
+    """Hard-link a file for a read-only view of a directory, or copy it."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
 
 if __name__ == "__main__":
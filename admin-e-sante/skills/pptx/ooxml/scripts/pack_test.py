@@ -0,0 +1,241 @@
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import pack
+from pack import MANIFEST_NAME, pack_document
+from unpack import unpack_document
+
+
+DOCUMENT_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:body>
+    <!-- comment -->
+{paragraphs}
+  </w:body>
+</w:document>
+"""
+
+PARAGRAPH_XML = """    <w:p>
+      <w:r>
+        <w:t xml:space="preserve"> Paragraph {i} </w:t>
+      </w:r>
+    </w:p>"""
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPackDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.input_dir = self.root / "unpacked"
+        self.create_sample_document(self.input_dir)
+
+    def create_sample_document(self, input_dir):
+        """Helper to create an unpacked document with several XML parts and media"""
+        files = {
+            "[Content_Types].xml": '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">\n  <Default Extension="xml" ContentType="application/xml"/>\n</Types>\n',
+            "_rels/.rels": '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\n  <Relationship Id="rId1" Type="t" Target="word/document.xml"/>\n</Relationships>\n',
+        }
+        for n in range(8):
+            paragraphs = "\n".join(PARAGRAPH_XML.format(i=i) for i in range(n * 50))
+            files[f"word/part{n}.xml"] = DOCUMENT_XML.format(paragraphs=paragraphs)
+        for name, content in files.items():
+            path = input_dir / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+
+        media = input_dir / "word" / "media"
+        media.mkdir()
+        (media / "image1.png").write_bytes(os.urandom(4096))
+        (media / "image2.emf").write_bytes(bytes(range(256)) * 16)
+
+        # Fixed timestamps, so repeated packs are comparable byte for byte
+        for path in input_dir.rglob("*"):
+            os.utime(path, (1700000000, 1700000000))
+
+    def pack(self, name, **kwargs):
+        output_file = self.root / name
+        self.assertTrue(pack_document(self.input_dir, output_file, **kwargs))
+        return output_file.read_bytes()
+
+    def test_jobs_output_identical_to_serial(self):
+        """Test that condensing parts in worker processes doesn't change the output"""
+        serial = self.pack("serial.docx")
+        self.assertEqual(self.pack("jobs.docx", jobs=2), serial)
+
+    def test_jobs_and_threads_output_identical_to_serial(self):
+        """Test that parallel condensing and compression don't change the output"""
+        for mode in ("default", "fast", "small"):
+            with self.subTest(mode=mode):
+                serial = self.pack("serial.docx", mode=mode)
+                parallel = self.pack("parallel.docx", mode=mode, jobs=2, threads=3)
+                self.assertEqual(parallel, serial)
+
+    def test_xml_parts_condensed(self):
+        """Test that whitespace and comments are removed, but not from w:t"""
+        self.pack("out.docx", jobs=2)
+        with zipfile.ZipFile(self.root / "out.docx") as zf:
+            self.assertIsNone(zf.testzip())
+            data = zf.read("word/part1.xml").decode("utf-8")
+        self.assertNotIn("comment", data)
+        self.assertNotIn("\n  ", data)
+        self.assertIn('<w:t xml:space="preserve"> Paragraph 0 </w:t>', data)
+
+    def test_precompressed_media_stored(self):
+        """Test that PNGs are stored except in small mode, and EMFs are deflated"""
+        for mode, png_type in (
+            ("default", zipfile.ZIP_STORED),
+            ("fast", zipfile.ZIP_STORED),
+            ("small", zipfile.ZIP_DEFLATED),
+        ):
+            with self.subTest(mode=mode):
+                self.pack("out.docx", mode=mode, threads=2)
+                with zipfile.ZipFile(self.root / "out.docx") as zf:
+                    png = zf.getinfo("word/media/image1.png")
+                    emf = zf.getinfo("word/media/image2.emf")
+                self.assertEqual(png.compress_type, png_type)
+                self.assertEqual(emf.compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_invalid_xml_raises_with_jobs(self):
+        """Test that syntax errors in worker processes are reported as ValueError"""
+        (self.input_dir / "word" / "part3.xml").write_text("<w:p>", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            pack_document(self.input_dir, self.root / "bad.docx", jobs=2)
+
+    def test_unchanged_members_copied_from_source(self):
+        """Test that repacking an unpack.py directory only re-encodes edited parts"""
+        self.pack("source.docx", mode="small")
+        source = self.root / "source.docx"
+        unpacked = self.root / "roundtrip"
+        unpack_document(source, unpacked)
+        self.assertTrue((unpacked / MANIFEST_NAME).exists())
+
+        part = unpacked / "word" / "part2.xml"
+        part.write_text(
+            part.read_text(encoding="utf-8").replace("Paragraph 7 ", "Edited"),
+            encoding="utf-8",
+        )
+        self.assertTrue(
+            pack_document(unpacked, self.root / "out.docx", reuse_unchanged=True)
+        )
+
+        with zipfile.ZipFile(source) as original, zipfile.ZipFile(
+            self.root / "out.docx"
+        ) as packed:
+            self.assertIsNone(packed.testzip())
+            self.assertEqual(packed.namelist(), original.namelist())
+            for name in original.namelist():
+                with self.subTest(name=name):
+                    before, after = original.getinfo(name), packed.getinfo(name)
+                    if name == "word/part2.xml":
+                        self.assertIn(b"Edited", packed.read(name))
+                    else:
+                        self.assertEqual(packed.read(name), original.read(name))
+                        self.assertEqual(after.compress_size, before.compress_size)
+
+    def test_lazy_members_copied_from_source(self):
+        """Test that parts left inside the source by a lazy unpack are packed"""
+        self.pack("source.docx")
+        source = self.root / "source.docx"
+        unpacked = self.root / "lazy"
+        lazy = unpack_document(source, unpacked, only=["word/part1.xml"], lazy=True)
+        self.assertIn("word/media/image1.png", lazy)
+        self.assertFalse((unpacked / "word" / "media").exists())
+
+        for kwargs in ({}, {"jobs": 2, "threads": 2}):
+            with self.subTest(**kwargs):
+                self.assertTrue(
+                    pack_document(unpacked, self.root / "out.docx", **kwargs)
+                )
+                with zipfile.ZipFile(source) as original, zipfile.ZipFile(
+                    self.root / "out.docx"
+                ) as packed:
+                    self.assertEqual(packed.namelist(), original.namelist())
+                    for name in lazy:
+                        self.assertEqual(packed.read(name), original.read(name))
+
+    def test_unchanged_members_recompressed_by_default(self):
+        """Test that parts are copied from the source only if asked to"""
+        self.pack("source.docx", mode="small")
+        unpacked = self.root / "roundtrip"
+        unpack_document(self.root / "source.docx", unpacked)
+        self.assertTrue(pack_document(unpacked, self.root / "out.docx"))
+        with zipfile.ZipFile(self.root / "source.docx") as original, zipfile.ZipFile(
+            self.root / "out.docx"
+        ) as packed:
+            # Condensed again from the pretty-printed part
+            self.assertNotEqual(packed.read("_rels/.rels"), original.read("_rels/.rels"))
+
+    def add_raw_member(self, source):
+        """Helper adding a member with a UTF-8 name and extra field to source"""
+        zinfo = zipfile.ZipInfo("word/media/\u00e9.bin", date_time=(2020, 1, 2, 3, 4, 6))
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo.extra = b"\x99\x99\x04\x00abcd"
+        with zipfile.ZipFile(source, "a") as zf:
+            zf.writestr(zinfo, b"raw" * 100)
+        return zinfo.filename
+
+    def test_copied_members_keep_flags_and_extra(self):
+        """Test that members copied raw keep their header fields"""
+        self.pack("source.docx")
+        source = self.root / "source.docx"
+        name = self.add_raw_member(source)
+        unpacked = self.root / "lazy"
+        unpack_document(source, unpacked, only=["word/part1.xml"], lazy=True)
+
+        for can_append_raw in (True, False):
+            with self.subTest(can_append_raw=can_append_raw), mock.patch.object(
+                pack, "_can_append_raw", return_value=can_append_raw
+            ):
+                self.assertTrue(pack_document(unpacked, self.root / "out.docx"))
+                with zipfile.ZipFile(source) as original, zipfile.ZipFile(
+                    self.root / "out.docx"
+                ) as packed:
+                    self.assertIsNone(packed.testzip())
+                    before, after = original.getinfo(name), packed.getinfo(name)
+                    self.assertEqual(packed.read(name), b"raw" * 100)
+                    self.assertEqual(after.extra, before.extra)
+                    self.assertEqual(after.date_time, before.date_time)
+                    self.assertTrue(after.flag_bits & 0x800)
+
+    def test_in_place_pack_restamps_manifest(self):
+        """Test that a directory can still be packed after replacing its source"""
+        self.pack("source.docx")
+        source = self.root / "source.docx"
+        unpacked = self.root / "lazy"
+        unpack_document(source, unpacked, only=["word/part1.xml"], lazy=True)
+        part = unpacked / "word" / "part1.xml"
+        part.write_text(
+            part.read_text(encoding="utf-8").replace("Paragraph 7 ", "Edited"),
+            encoding="utf-8",
+        )
+
+        self.assertTrue(pack_document(unpacked, source, reuse_unchanged=True))
+        manifest = json.loads((unpacked / MANIFEST_NAME).read_text(encoding="utf-8"))
+        self.assertEqual(manifest["source_size"], source.stat().st_size)
+
+        self.assertTrue(
+            pack_document(unpacked, self.root / "out.docx", reuse_unchanged=True)
+        )
+        with zipfile.ZipFile(source) as first, zipfile.ZipFile(
+            self.root / "out.docx"
+        ) as second:
+            self.assertIn(b"Edited", second.read("word/part1.xml"))
+            for name in first.namelist():
+                with self.subTest(name=name):
+                    self.assertEqual(second.read(name), first.read(name))
+                    self.assertEqual(
+                        second.getinfo(name).compress_size,
+                        first.getinfo(name).compress_size,
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,29 +1,104 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--only PATTERN ...] [--lazy]
+
+With --only, only parts matching the glob patterns (plus [Content_Types].xml
+and the .rels files) are pretty-printed; other parts are extracted as is, or
+with --lazy left inside the Office file until materialize_parts() (in pack.py)
+extracts them.
+
+A manifest of the unpacked parts (pack.MANIFEST_NAME) lets pack.py copy lazy
+and unchanged parts from the Office file instead of re-encoding them.
+"""
+
+import argparse
 import random
 import sys
-import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+from pack import (
+    MANIFEST_NAME,
+    compression_info,
+    extract_member,
+    member_matches,
+    new_manifest,
+    write_manifest,
+)
+
+# Parts always unpacked and formatted, since they describe the package structure
+STRUCTURE_PATTERNS = ["[[]Content_Types].xml", "*.rels"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack and format XML contents of Office files"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="PATTERN",
+        help="Only format parts matching these globs, e.g. 'ppt/slides/slide3.xml'",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Leave parts not matched by --only inside the Office file",
+    )
+    args = parser.parse_args()
+
+    try:
+        unpack_document(args.office_file, args.output_dir, args.only, args.lazy)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, only=None, lazy=False):
+    """Unpack an Office file into a directory, pretty-printing its XML parts.
+
+    Args:
+        input_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to unpack into (created if missing)
+        only: Glob patterns of the parts to format (see pack.member_matches);
+            all parts if None
+        lazy: If True, parts not matched by only are not extracted; they are
+            marked as lazy in the directory's manifest instead
+
+    Returns:
+        list: Names of the parts left inside input_file
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    patterns = None if only is None else list(only) + STRUCTURE_PATTERNS
+
+    manifest = new_manifest(input_file)
+    members = manifest["members"]
+    lazy_members = []
+    with zipfile.ZipFile(input_file) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            if info.is_dir() or name == MANIFEST_NAME:
+                continue
+            if patterns is None or member_matches(name, patterns):
+                members[name] = extract_member(zf, name, output_path)
+            elif lazy:
+                members[name] = {"lazy": True, **compression_info(info)}
+                lazy_members.append(name)
+            else:
+                members[name] = extract_member(zf, name, output_path, pretty=False)
+
+    write_manifest(output_path, manifest)
+    return lazy_members
+
+
+if __name__ == "__main__":
+    main()
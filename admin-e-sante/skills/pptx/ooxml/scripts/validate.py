@@ -3,14 +3,21 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--incremental]
+                       [--cache-dir DIR] [--streaming]
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from pack import materialized_view
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 
 def main():
@@ -30,6 +37,31 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for XSD validation (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip XSD and per-part checks for parts unchanged from the original",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for a persistent XSD result cache shared between runs",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help=(
+            "Stream parts through the structural checks to bound memory use; "
+            "XSD validation still parses each checked part in full, so combine "
+            "with --incremental to skip unchanged parts"
+        ),
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -52,12 +84,24 @@ def main():
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
 
-    # Run validators
+    # Run validators, on a view holding any parts a lazy unpack left inside
+    # the original file (unpacked_dir itself is never written to)
     success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    with materialized_view(unpacked_dir) as view_dir:
+        for V in validators:
+            options = (
+                {
+                    "jobs": args.jobs,
+                    "incremental": args.incremental,
+                    "cache_dir": args.cache_dir,
+                    "streaming": args.streaming,
+                }
+                if issubclass(V, BaseSchemaValidator)
+                else {}
+            )
+            validator = V(view_dir, original_file, verbose=args.verbose, **options)
+            if not validator.validate():
+                success = False
 
     if success:
         print("All validations PASSED!")
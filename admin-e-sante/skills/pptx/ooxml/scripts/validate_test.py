@@ -0,0 +1,502 @@
+import contextlib
+import io
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+from pack import materialized_view
+from unpack import unpack_document
+from validation import DOCXSchemaValidator, RedliningValidator
+from validation import base
+from validation.cache import XSDResultCache
+from validation.package import content_digest, stream_digest
+from validation.worddiff import word_diff
+
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+DOCUMENT_ATTRIBUTES = (
+    f'xmlns:w="{W}" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    f'xmlns:mc="{MC}" '
+    'xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml" '
+    'mc:Ignorable="w14"'
+)
+
+PARAGRAPH_XML = (
+    '<w:p w14:paraId="{id:08X}"><w:r><w:rPr><w:b/></w:rPr>'
+    '<w:t xml:space="preserve">Paragraph {i}: </w:t></w:r>'
+    "<w:r><w:t>patient admitted for observation</w:t></w:r>{bookmark}</w:p>"
+)
+
+FILES = {
+    "[Content_Types].xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/><Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/><Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/></Types>',
+    "_rels/.rels": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/></Relationships>',
+    "word/_rels/document.xml.rels": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/><Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/></Relationships>',
+    "word/settings.xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:settings xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:zoom w:percent="100"/><w:defaultTabStop w:val="720"/><w:compat/></w:settings>',
+    "word/styles.xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style></w:styles>',
+}
+
+
+def create_sample_docx(path, paragraphs=30, settings=""):
+    """Helper to create a small .docx that passes validation
+
+    settings is extra XML inserted at the end of word/settings.xml.
+    """
+    body = "".join(
+        PARAGRAPH_XML.format(
+            id=i + 1,
+            i=i,
+            bookmark=(
+                f'<w:bookmarkStart w:id="{i}" w:name="b{i}"/><w:bookmarkEnd w:id="{i}"/>'
+                if i % 10 == 0
+                else ""
+            ),
+        )
+        for i in range(paragraphs)
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f"<w:document {DOCUMENT_ATTRIBUTES}><w:body>{body}"
+        '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/></w:sectPr></w:body></w:document>'
+    )
+    files = {**FILES, "word/document.xml": document}
+    files["word/settings.xml"] = files["word/settings.xml"].replace(
+        "</w:settings>", f"{settings}</w:settings>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+
+
+def break_document(unpacked):
+    """Helper making edits that each trigger one structural or XSD check"""
+    document = unpacked / "word" / "document.xml"
+    text = document.read_text(encoding="ascii")
+    text = text.replace('<w:bookmarkStart w:id="10"', '<w:bookmarkStart w:id="0"', 1)
+    text = text.replace(
+        "<w:sectPr>",
+        '<w:p><w:ins w:id="90" w:author="X"><w:r><w:delText>x</w:delText></w:r></w:ins>'
+        '<w:del w:id="91" w:author="X"><w:r><w:t>y</w:t></w:r></w:del>'
+        '<w:r><w:drawing r:id="rId99"/></w:r><w:r><w:t> lead</w:t></w:r></w:p>'
+        "<w:p><w:foo/></w:p><w:sectPr>",
+        1,
+    )
+    document.write_text(text, encoding="ascii")
+    settings = unpacked / "word" / "settings.xml"
+    settings.write_text(
+        settings.read_text(encoding="ascii").replace("<w:zoom ", "<w:zoomBad "),
+        encoding="ascii",
+    )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class ValidatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.original = self.root / "original.docx"
+        create_sample_docx(self.original)
+        self.unpacked = self.root / "unpacked"
+        unpack_document(self.original, self.unpacked)
+
+    def validate(self, validator_class=DOCXSchemaValidator, **options):
+        """Helper returning (result, printed output) of a validator run"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            validator = validator_class(self.unpacked, self.original, **options)
+            result = validator.validate()
+        return result, output.getvalue()
+
+
+class TestOriginalPackage(ValidatorTests):
+
+    def test_errors_in_original_are_ignored(self):
+        """Test that XSD errors already in the original file are not reported"""
+        create_sample_docx(self.original, settings="<w:bogusSetting/>")
+        unpack_document(self.original, self.unpacked)
+        result, output = self.validate()
+        self.assertTrue(result, output)
+
+        settings = self.unpacked / "word" / "settings.xml"
+        settings.write_text(
+            settings.read_text(encoding="ascii").replace(
+                'w:percent="100"', 'w:percent="full"'
+            ),
+            encoding="ascii",
+        )
+        result, output = self.validate()
+        self.assertFalse(result)
+        self.assertIn("word/settings.xml: 1 new error(s)", output)
+        self.assertIn("'full' is not a valid value", output)
+        self.assertNotIn("bogusSetting", output)
+
+
+class TestContentDigest(unittest.TestCase):
+
+    def digest(self, body, root_attributes=""):
+        """Helper returning the digest of a paragraph, checking both ways to compute it"""
+        xml = f'<w:p xmlns:w="{W}" {root_attributes}>{body}</w:p>'.encode()
+        digest = content_digest(lxml.etree.parse(io.BytesIO(xml)))
+        self.assertEqual(stream_digest(io.BytesIO(xml)), digest)
+        return digest
+
+    def test_formatting_whitespace_is_ignored(self):
+        self.assertEqual(
+            self.digest("\n  <w:r>\n    <w:t>a</w:t>\n  </w:r>\n"),
+            self.digest("<w:r><w:t>a</w:t></w:r>"),
+        )
+
+    def test_text_element_whitespace_is_kept(self):
+        for tag in ["w:t", "w:delText", "w:instrText"]:
+            with self.subTest(tag=tag):
+                self.assertNotEqual(
+                    self.digest(f"<w:r><{tag}> </{tag}></w:r>"),
+                    self.digest(f"<w:r><{tag}/></w:r>"),
+                )
+
+    def test_preserved_whitespace_is_kept(self):
+        preserve = 'xml:space="preserve"'
+        self.assertNotEqual(
+            self.digest("<w:r><w:x> </w:x></w:r>", preserve),
+            self.digest("<w:r><w:x/></w:r>", preserve),
+        )
+        self.assertNotEqual(
+            self.digest("<w:r> <w:x/></w:r>", preserve),
+            self.digest("<w:r><w:x/></w:r>", preserve),
+        )
+        self.assertEqual(
+            self.digest('<w:r xml:space="default"><w:x> </w:x></w:r>', preserve),
+            self.digest('<w:r xml:space="default"><w:x/></w:r>', preserve),
+        )
+
+    def test_comment_tails(self):
+        self.assertEqual(
+            self.digest("<w:r/><!-- a -->\n  <?pi b?>\n  <w:r/>"),
+            self.digest("<w:r/><w:r/>"),
+        )
+        self.assertNotEqual(
+            self.digest("<w:r/><!-- a -->text<w:r/>"),
+            self.digest("<w:r/><w:r/>"),
+        )
+
+    def test_stream_digest_of_file(self):
+        """Test that stream_digest() of a large file matches content_digest()"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "sample.docx"
+            create_sample_docx(path, paragraphs=2000)
+            unpack_document(path, Path(temp_dir) / "unpacked")
+            document = Path(temp_dir) / "unpacked" / "word" / "document.xml"
+            self.assertEqual(
+                stream_digest(document), content_digest(lxml.etree.parse(str(document)))
+            )
+
+
+class TestChecks(ValidatorTests):
+
+    def assertReported(self, output, *lines):
+        """Assert that each line starts a line of output (long XSD messages are cut)"""
+        reported = output.splitlines()
+        for line in lines:
+            self.assertTrue(
+                any(r.startswith(line) for r in reported), f"{line!r} not in {output}"
+            )
+
+    def test_clean_document_passes(self):
+        result, output = self.validate()
+        self.assertTrue(result, output)
+
+    def test_xsd_errors(self):
+        """Test the XSD errors reported for a broken document"""
+        break_document(self.unpacked)
+        result, output = self.validate()
+        self.assertFalse(result)
+        self.assertReported(
+            output,
+            "  word/document.xml: 2 new error(s)",
+            "    - Element '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}drawing', attribute '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'",
+            "    - Element '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}foo': This element is not expected.",
+            "  word/settings.xml: 1 new error(s)",
+            "    - Element '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}zoomBad': This element is not expected.",
+        )
+        self.assertNotIn("relationship validation errors", output)
+        self.assertNotIn("content type declaration errors", output)
+
+    def test_rule_errors(self):
+        """Test the errors the single-pass rule walk reports for a broken document"""
+        break_document(self.unpacked)
+        result, output = self.validate()
+        self.assertFalse(result)
+        self.assertReported(
+            output,
+            "  word/document.xml: Line 126: Duplicate id='0' in <bookmarkstart> (first occurrence at line 14)",
+            "  word/document.xml: Line 340: w:t element with whitespace missing xml:space='preserve': ' lead'",
+            "  word/document.xml: Line 340: <w:t> found within <w:del>: 'y'",
+            "  word/document.xml: Line 340: <w:delText> within <w:ins>: 'x'",
+            "  word/document.xml: Line 340: <drawing> references non-existent relationship 'rId99' (valid IDs: rId1, rId2)",
+            "Paragraphs: 30 → 32 (+2)",
+        )
+
+
+IGNORABLE = 'mc:Ignorable="w14"'
+
+# Root attributes declaring an extension namespace x that Word may ignore
+EXTENDED = 'mc:Ignorable="w14 x" xmlns:x="urn:example"'
+
+
+class TestPrepareForXsd(ValidatorTests):
+
+    def prepare(self, body, clean=True):
+        xml = (
+            f"<w:document {DOCUMENT_ATTRIBUTES.replace(IGNORABLE, EXTENDED)}>"
+            f"<w:body>{body}</w:body></w:document>"
+        )
+        tree = lxml.etree.parse(io.BytesIO(xml.encode()))
+        before = lxml.etree.tostring(tree)
+        validator = DOCXSchemaValidator(self.unpacked, self.original)
+        prepared = validator._prepare_for_xsd(tree, clean)
+        self.assertEqual(lxml.etree.tostring(tree), before)
+        return prepared.getroot()
+
+    def test_template_tags(self):
+        """Test that template tags are removed, except as w:t content"""
+        root = self.prepare("<w:p>{{ a }}<w:r><w:t>{{ b }}</w:t></w:r>{{ c }}</w:p>")
+        paragraph = root[0][0]
+        self.assertFalse(paragraph.text)
+        self.assertFalse(paragraph[0].tail)
+        self.assertEqual(paragraph[0][0].text, "{{ b }}")
+
+    def test_foreign_namespaces(self):
+        """Test that mc:Ignorable and content in foreign namespaces are removed"""
+        body = '<w:p x:a="1"><x:extra><w:r/></x:extra>tail<w:r/></w:p>'
+        root = self.prepare(body)
+        self.assertNotIn(f"{{{MC}}}Ignorable", root.attrib)
+        paragraph = root[0][0]
+        self.assertEqual(paragraph.attrib, {})
+        self.assertEqual([child.tag for child in paragraph], [f"{{{W}}}r"])
+        self.assertFalse(paragraph.text)
+
+        root = self.prepare(body, clean=False)
+        self.assertNotIn(f"{{{MC}}}Ignorable", root.attrib)
+        self.assertEqual(len(root[0][0]), 2)
+        self.assertEqual(root[0][0].get("{urn:example}a"), "1")
+
+    def test_document_with_template_tags_and_extensions(self):
+        """Test that the preprocessing lets a document with both pass validation"""
+        document = self.unpacked / "word" / "document.xml"
+        text = document.read_text(encoding="ascii")
+        text = text.replace(IGNORABLE, EXTENDED)
+        text = text.replace(
+            "<w:sectPr>", "<w:p x:a='1'>{{ signature }}<x:extra/></w:p><w:sectPr>", 1
+        )
+        document.write_text(text, encoding="ascii")
+        result, output = self.validate()
+        self.assertTrue(result, output)
+
+
+class TestOptions(ValidatorTests):
+    """Options that change how the checks run must not change what they report"""
+
+    def setUp(self):
+        super().setUp()
+        break_document(self.unpacked)
+
+    def assertSameReport(self, **options):
+        self.assertEqual(self.validate(**options), self.validate())
+
+    def test_jobs(self):
+        self.assertSameReport(jobs=2)
+
+    def test_incremental(self):
+        self.assertSameReport(incremental=True)
+
+    def test_streaming(self):
+        self.assertSameReport(streaming=True)
+        self.assertSameReport(streaming=True, incremental=True)
+
+
+class TestRedlining(ValidatorTests):
+
+    def edit_paragraphs(self, edit):
+        """Helper calling edit(paragraphs) on the parsed document.xml and saving it"""
+        document = self.unpacked / "word" / "document.xml"
+        tree = lxml.etree.parse(str(document))
+        edit(tree.getroot().findall(f".//{{{W}}}p"))
+        tree.write(str(document), encoding="UTF-8", xml_declaration=True)
+
+    def track_change(self, paragraphs):
+        """Replace the text of paragraph 1 with tracked changes by Claude"""
+        run = paragraphs[1][1]
+        deletion, insertion = list(
+            lxml.etree.fromstring(
+                f'<w:body xmlns:w="{W}">'
+                '<w:del w:id="901" w:author="Claude"><w:r>'
+                "<w:delText>patient admitted for observation</w:delText></w:r></w:del>"
+                '<w:ins w:id="902" w:author="Claude"><w:r>'
+                "<w:t>patient discharged</w:t></w:r></w:ins></w:body>"
+            )
+        )
+        run.addprevious(deletion)
+        run.addprevious(insertion)
+        paragraphs[1].remove(run)
+
+    def untracked_change(self, paragraphs):
+        """Change the text of paragraphs 5 and 8 directly"""
+        paragraphs[5][1][0].text = "client admitted for observation"
+        paragraphs[8][1][0].text = "patient admitted for tests"
+
+    def test_tracked_changes_pass(self):
+        self.edit_paragraphs(self.track_change)
+        result, output = self.validate(RedliningValidator, verbose=True)
+        self.assertTrue(result, output)
+        self.assertIn("PASSED - All changes by Claude are properly tracked", output)
+
+    def test_untracked_change_is_reported(self):
+        """Test the word diff of text changed outside tracked changes"""
+        self.edit_paragraphs(self.track_change)
+        self.edit_paragraphs(self.untracked_change)
+        result, output = self.validate(RedliningValidator)
+        self.assertFalse(result)
+        self.assertTrue(
+            output.endswith(
+                "Differences:\n"
+                "============\n"
+                "Paragraph 5: [-pat-]{+cl+}ient admitted for observation\n"
+                "Paragraph 8: patient admitted for "
+                "[-obs-]{+t+}e[-rva-]{+s+}t[-ion-]{+s+}\n"
+            ),
+            output,
+        )
+
+    def test_diff_stops_after_max_regions(self):
+        original = "\n".join(f"line {i}" for i in range(5))
+        modified = original.replace("line", "row")
+        self.assertEqual(
+            word_diff(original, modified, max_regions=1),
+            "[-line-]{+row+} 0\n[-line-]{+row+} 1\n"
+            "[-line-]{+row+} 2\n[-line-]{+row+} 3\n[-line-]{+row+} 4",
+        )
+        modified = modified.replace("row 2", "line 2")
+        self.assertEqual(
+            word_diff(original, modified, max_regions=1),
+            "[-line-]{+row+} 0\n[-line-]{+row+} 1\n... 1 more changed region(s)",
+        )
+
+    def test_only_claude_changes_are_checked(self):
+        """Test that without tracked changes by Claude nothing is compared"""
+        self.edit_paragraphs(self.untracked_change)
+        result, output = self.validate(RedliningValidator)
+        self.assertTrue(result, output)
+
+
+class TestLazyUnpack(ValidatorTests):
+
+    def setUp(self):
+        super().setUp()
+        self.unpacked = self.root / "lazy"
+        lazy_parts = unpack_document(
+            self.original, self.unpacked, only=["word/document.xml"], lazy=True
+        )
+        self.assertIn("word/settings.xml", lazy_parts)
+
+    def snapshot(self):
+        return {
+            path.relative_to(self.unpacked): path.read_bytes()
+            for path in self.unpacked.rglob("*")
+            if path.is_file()
+        }
+
+    def test_materialized_view(self):
+        """Test that lazy parts are extracted into a view, not the directory"""
+        before = self.snapshot()
+        with materialized_view(self.unpacked) as view_dir:
+            self.assertNotEqual(view_dir, self.unpacked)
+            self.assertTrue((view_dir / "word" / "settings.xml").is_file())
+            validator = DOCXSchemaValidator(view_dir, self.original)
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(validator.validate())
+        self.assertFalse(view_dir.exists())
+        self.assertEqual(self.snapshot(), before)
+
+    def test_validate_script(self):
+        """Test that validate.py checks a lazy unpack without writing to it"""
+        before = self.snapshot()
+        result = subprocess.run(
+            [sys.executable, "validate.py", self.unpacked, "--original", self.original],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertIn("All validations PASSED!", result.stdout)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_unpack_without_lazy_parts(self):
+        unpacked = self.root / "unpacked"
+        with materialized_view(unpacked) as view_dir:
+            self.assertEqual(view_dir, unpacked)
+
+
+class TestSchemaCache(ValidatorTests):
+
+    def test_result_cache_skips_schema_compilation(self):
+        """Test that a warm result cache validates without compiling schemas"""
+        cache_dir = self.root / "cache"
+        self.assertTrue(self.validate(cache_dir=cache_dir)[0])
+
+        base._SCHEMA_CACHE.clear()
+        result, output = self.validate(cache_dir=cache_dir, verbose=True)
+        self.assertTrue(result)
+        self.assertIn("Result cache: 6 hit(s), 0 miss(es)", output)
+        self.assertEqual(base._SCHEMA_CACHE, {})
+
+    def test_cached_results_match_uncached(self):
+        """Test that cold and warm cache runs report like an uncached run"""
+        break_document(self.unpacked)
+        cache_dir = self.root / "cache"
+        expected = self.validate()
+        self.assertEqual(self.validate(cache_dir=cache_dir), expected)
+        self.assertEqual(self.validate(cache_dir=cache_dir), expected)
+
+    def test_changed_part_misses_cache(self):
+        """Test that the cache is keyed on the exact bytes of each part"""
+        cache_dir = self.root / "cache"
+        self.validate(cache_dir=cache_dir)
+        document = self.unpacked / "word" / "document.xml"
+        document.write_bytes(document.read_bytes() + b"\n")
+        result, output = self.validate(cache_dir=cache_dir, verbose=True)
+        self.assertTrue(result)
+        self.assertIn("Result cache: 5 hit(s), 1 miss(es)", output)
+
+    def test_unusable_cache_dir(self):
+        """Test that a cache directory that can't be created only causes misses"""
+        blocker = self.root / "file"
+        blocker.write_text("")
+        cache = XSDResultCache(blocker / "cache")
+        key = (self.root / "schema.xsd", 0, False, "digest")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, True, set())
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        # Errors are still found when every part misses the cache
+        break_document(self.unpacked)
+        expected = self.validate()
+        self.assertFalse(expected[0])
+        result, output = self.validate(cache_dir=blocker / "cache", verbose=True)
+        self.assertEqual(result, expected[0])
+        self.assertIn("Result cache: 0 hit(s), 6 miss(es)", output)
+        for line in expected[1].splitlines():
+            if "Result cache" not in line:
+                self.assertIn(line, output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,11 +2,60 @@
 Base validator with common validation logic for document files.
 """
 
+import concurrent.futures
+import copy
+import hashlib
+import os
 import re
 from pathlib import Path
 
 import lxml.etree
 
+from .cache import XSDResultCache
+from .package import OriginalPackage, content_digest, stream_digest
+from .rules import RelationshipIdRule, UniqueIdRule, iterparse_elements
+
+# Template placeholders ({{ ... }}) removed from text before XSD validation
+TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+# Nonzero if any text or tail node contains "{{". Counting only the first match
+# per parent keeps libxml2 fast on parts with many template tags.
+_COUNT_TEMPLATE_TEXT = lxml.etree.XPath("count(//text()[contains(., '{{')][1])")
+
+# Manifest left by a lazy unpack (pack.MANIFEST_NAME); not a package part
+MANIFEST_NAME = ".ooxml-manifest.json"
+
+# Compiled XSD schemas shared by every validator in this process.
+# Format: resolved schema path -> (schema mtime_ns, lxml.etree.XMLSchema)
+# lxml can't serialize a compiled schema, so there is no on-disk copy. Across
+# runs, the XSD result cache (cache_dir) plays that role: schemas are only
+# loaded on a cache miss, so a run on cached content compiles none.
+_SCHEMA_CACHE = {}
+
+# Validator owned by an XSD worker process (see _validate_files_against_xsd)
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, cache_dir):
+    """Create the validator used by this worker process for all its files."""
+    global _worker_validator
+    _worker_validator = validator_class(
+        unpacked_dir, original_file, cache_dir=cache_dir
+    )
+
+
+def _validate_file_in_worker(xml_file):
+    """Validate one file against XSD inside a worker process.
+
+    Returns:
+        tuple: (validate_file_against_xsd result, (cache hits, cache misses))
+    """
+    assert _worker_validator is not None
+    cache = _worker_validator.xsd_cache
+    before = (cache.hits, cache.misses) if cache else (0, 0)
+    result = _worker_validator.validate_file_against_xsd(xml_file, verbose=False)
+    after = (cache.hits, cache.misses) if cache else (0, 0)
+    return result, (after[0] - before[0], after[1] - before[1])
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -41,6 +90,10 @@ class BaseSchemaValidator:
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    # Checks that run in the shared single-pass walk over each part
+    # Subclasses extend this with format-specific rules
+    RULES = (UniqueIdRule, RelationshipIdRule)
+
     # Unified schema mappings for all Office document types
     SCHEMA_MAPPINGS = {
         # Document type specific schemas
@@ -103,10 +156,40 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        jobs=1,
+        incremental=False,
+        cache_dir=None,
+        streaming=False,
+    ):
+        """
+        Args:
+            unpacked_dir: Path to unpacked Office document directory
+            original_file: Path to original file (.docx/.pptx/.xlsx)
+            verbose: Enable verbose output
+            jobs: Number of worker processes for XSD validation (0 = one per CPU)
+            incremental: Skip XSD and part-local checks for parts whose content
+                is unchanged from the original file
+            cache_dir: Directory for the persistent XSD result cache
+                (see XSDResultCache); no cache is used if None
+            streaming: Run the structural checks and incremental-mode digests
+                over streamed parts instead of keeping every parsed tree in
+                memory, for very large documents. XSD validation still needs a
+                whole tree, so each part that is checked against a schema is
+                parsed in full, one at a time.
+        """
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.jobs = jobs or os.cpu_count() or 1
+        self.incremental = incremental
+        self.cache_dir = cache_dir
+        self.xsd_cache = XSDResultCache(cache_dir) if cache_dir else None
+        self.streaming = streaming
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -120,6 +203,235 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by all checks, keyed by file path
+        self._parsed_parts = {}
+
+        # Errors collected by the single-pass rule walk, keyed by rule class
+        self._rule_results = None
+
+        # Incremental mode: whether each part matches the original, keyed by file path
+        self._unchanged_parts = {}
+
+    def _parse_part(self, xml_file):
+        """Return the parsed lxml tree for a file, parsing each file at most once.
+
+        Trees are shared between all checks and must be treated as read-only;
+        checks that need to modify a tree should use _copy_part() instead.
+        Parse errors are cached and re-raised on every call. In streaming mode
+        only .rels trees are kept, so other parts are parsed again on each call.
+        """
+        xml_file = Path(xml_file)
+        if xml_file not in self._parsed_parts:
+            try:
+                tree = lxml.etree.parse(str(xml_file))
+            except Exception as e:
+                self._parsed_parts[xml_file] = e
+                raise
+            if self.streaming and xml_file.suffix != ".rels":
+                return tree
+            self._parsed_parts[xml_file] = tree
+        result = self._parsed_parts[xml_file]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _part_root(self, xml_file):
+        """Return the root element of a part, with its attributes and namespaces.
+
+        In streaming mode only the start tag is read, so the returned element
+        has no children.
+        """
+        if not self.streaming:
+            return self._parse_part(xml_file).getroot()
+        for _, elem in lxml.etree.iterparse(str(xml_file), events=("start",)):
+            return elem
+
+    def _copy_part(self, xml_file):
+        """Return a private, modifiable copy of a file's parsed tree."""
+        return copy.deepcopy(self._parse_part(xml_file))
+
+    def _is_unchanged(self, xml_file):
+        """Check whether a part has the same content as in the original file.
+
+        Parts are compared byte for byte first, then by content_digest(), so
+        parts that were only re-formatted (e.g. pretty-printed by unpack.py)
+        also count as unchanged. Parts that are new or fail to parse do not.
+        """
+        xml_file = Path(xml_file)
+        if xml_file not in self._unchanged_parts:
+            member_name = xml_file.relative_to(self.unpacked_dir).as_posix()
+            package = self.original_package
+            try:
+                unchanged = package.has(member_name) and (
+                    package.read(member_name) == xml_file.read_bytes()
+                    or self._part_digest(xml_file)
+                    == package.digest(member_name, keep=not self.streaming)
+                )
+            except Exception:
+                unchanged = False
+            self._unchanged_parts[xml_file] = unchanged
+        return self._unchanged_parts[xml_file]
+
+    def _part_digest(self, xml_file):
+        """Return the content_digest() of a file, streamed in streaming mode."""
+        if self.streaming:
+            return stream_digest(xml_file)
+        return content_digest(self._parse_part(xml_file))
+
+    def _get_rule(self, rule_class):
+        """Return the finished instance of a rule, running the shared walk on first use.
+
+        All rules in RULES are evaluated together in one traversal per part, so
+        the validate_* wrappers only report results.
+        """
+        if self._rule_results is None:
+            self._rule_results = {
+                type(rule): rule for rule in self._run_rules(self.RULES)
+            }
+        return self._rule_results[rule_class]
+
+    def _rule_errors(self, rule_class):
+        """Return the errors found by a rule in the shared walk."""
+        return self._get_rule(rule_class).errors
+
+    def _run_rules(self, rule_classes):
+        """Walk each XML part once, dispatching element events to all rules.
+
+        Args:
+            rule_classes: ValidationRule subclasses to run
+
+        Returns:
+            list: The rule instances, holding their collected errors
+        """
+        rules = [rule_class(self) for rule_class in rule_classes]
+
+        for xml_file in self.xml_files:
+            candidates = [rule for rule in rules if rule.wants_part(xml_file)]
+            if (
+                self.incremental
+                and any(rule.PART_LOCAL for rule in candidates)
+                and self._is_unchanged(xml_file)
+            ):
+                candidates = [rule for rule in candidates if not rule.PART_LOCAL]
+            if not candidates:
+                continue
+
+            if self.streaming:
+                self._stream_part(xml_file, candidates)
+                continue
+
+            try:
+                root = self._parse_part(xml_file).getroot()
+            except Exception as e:
+                for rule in candidates:
+                    rule.part_error(xml_file, e)
+                continue
+
+            active = []
+            for rule in candidates:
+                try:
+                    if rule.begin_part(xml_file, root):
+                        active.append(rule)
+                except Exception as e:
+                    rule.part_error(xml_file, e)
+            if not active:
+                continue
+
+            failed = self._walk_part(root, active)
+            for rule in active:
+                if rule in failed:
+                    rule.part_error(xml_file, failed[rule])
+                else:
+                    rule.end_part()
+
+        return rules
+
+    def _stream_part(self, xml_file, rules):
+        """Run rules over a part with iterparse, without keeping its tree."""
+        active = []
+        for rule in rules:
+            try:
+                if rule.begin_part(xml_file, None):
+                    active.append(rule)
+            except Exception as e:
+                rule.part_error(xml_file, e)
+        if not active:
+            return
+
+        try:
+            failed = self._dispatch_events(iterparse_elements(xml_file), active)
+        except Exception as e:
+            # The part is not well-formed; report it to every rule
+            failed = dict.fromkeys(active, e)
+
+        for rule in active:
+            if rule in failed:
+                rule.part_error(xml_file, failed[rule])
+            else:
+                rule.end_part()
+
+    def _walk_part(self, root, rules):
+        """Dispatch start/end events for every element under root to rules.
+
+        Returns:
+            dict: Rules that raised while handling events, mapped to the exception
+        """
+        if any(rule.END_TAGS is None or rule.END_TAGS for rule in rules):
+            events = lxml.etree.iterwalk(root, events=("start", "end"))
+        else:
+            events = (("start", elem) for elem in root.iter())
+        return self._dispatch_events(events, rules)
+
+    def _dispatch_events(self, events, rules):
+        """Pass (event, element) pairs to the rules that want them.
+
+        Returns:
+            dict: Rules that raised while handling events, mapped to the exception
+        """
+        start_all, start_by_tag = self._dispatch_table(rules, "START_TAGS")
+        end_all, end_by_tag = self._dispatch_table(rules, "END_TAGS")
+        failed = {}
+
+        for event, elem in events:
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue  # Skip comments and processing instructions
+            if event == "start":
+                handlers = start_all + start_by_tag.get(tag, [])
+            else:
+                handlers = end_all + end_by_tag.get(tag, [])
+            for rule in handlers:
+                if rule in failed:
+                    continue
+                try:
+                    if event == "start":
+                        rule.start(elem)
+                    else:
+                        rule.end(elem)
+                except Exception as e:
+                    failed[rule] = e
+
+        return failed
+
+    @staticmethod
+    def _dispatch_table(rules, attribute):
+        """Split rules into those wanting every element and a tag -> rules map."""
+        every = []
+        by_tag = {}
+        for rule in rules:
+            tags = getattr(rule, attribute)
+            if tags is None:
+                every.append(rule)
+            else:
+                for tag in tags:
+                    by_tag.setdefault(tag, []).append(rule)
+        return every, by_tag
+
+    @property
+    def original_package(self):
+        """Shared in-memory view of the original file (see OriginalPackage)."""
+        return OriginalPackage.open(self.original_file)
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
@@ -131,7 +443,11 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                if self.streaming:
+                    for _ in iterparse_elements(xml_file):
+                        pass
+                else:
+                    self._parse_part(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -159,7 +475,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._part_root(xml_file)
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -185,84 +501,7 @@ class BaseSchemaValidator:
 
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
-
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors(UniqueIdRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -293,7 +532,7 @@ class BaseSchemaValidator:
         for file_path in self.unpacked_dir.rglob("*"):
             if (
                 file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
+                and file_path.name not in ("[Content_Types].xml", MANIFEST_NAME)
                 and not file_path.name.endswith(".rels")
             ):  # This file is not referenced by .rels
                 all_files.append(file_path.resolve())
@@ -310,7 +549,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse_part(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -390,87 +629,7 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
-        errors = []
-
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
-
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
-
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+        errors = self._rule_errors(RelationshipIdRule)
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -531,7 +690,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse_part(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -577,7 +736,9 @@ class BaseSchemaValidator:
 
             # Get all files in the unpacked directory
             all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            all_files = [
+                f for f in all_files if f.is_file() and f.name != MANIFEST_NAME
+            ]
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -593,7 +754,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._part_root(xml_file).tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -673,7 +834,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -691,13 +852,22 @@ class BaseSchemaValidator:
         original_error_count = 0
         valid_count = 0
         skipped_count = 0
+        unchanged_count = 0
+
+        # In incremental mode, unchanged parts cannot have new errors
+        xml_files = self.xml_files
+        if self.incremental:
+            xml_files = [f for f in xml_files if not self._is_unchanged(f)]
+        results = dict(zip(xml_files, self._validate_files_against_xsd(xml_files)))
 
         for xml_file in self.xml_files:
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
+            if xml_file not in results:
+                unchanged_count += 1
+                continue
+
+            is_valid, new_file_errors = results[xml_file]
             if is_valid is None:
                 skipped_count += 1
                 continue
@@ -712,7 +882,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -722,6 +892,13 @@ class BaseSchemaValidator:
             print(f"Validated {len(self.xml_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
+            if self.incremental:
+                print(f"  - Skipped (unchanged from original): {unchanged_count}")
+            if self.xsd_cache:
+                print(
+                    f"  - Result cache: {self.xsd_cache.hits} hit(s), "
+                    f"{self.xsd_cache.misses} miss(es)"
+                )
             if original_error_count:
                 print(f"  - With original errors (ignored): {original_error_count}")
             print(
@@ -738,6 +915,41 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd on each file, in parallel when jobs > 1.
+
+        Each worker process builds its own validator, so schemas are compiled
+        and the original package is read once per worker. Results are returned
+        in the order of xml_files regardless of completion order.
+
+        Returns:
+            list: (is_valid, new_errors_set) tuples, one per file
+        """
+        if self.jobs <= 1 or len(xml_files) < 2:
+            return [self.validate_file_against_xsd(f, verbose=False) for f in xml_files]
+
+        # Submit the largest parts first so they don't end up running last
+        by_size = sorted(xml_files, key=lambda f: f.stat().st_size, reverse=True)
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(self.jobs, len(xml_files)),
+            initializer=_init_xsd_worker,
+            initargs=(
+                type(self),
+                self.unpacked_dir,
+                self.original_file,
+                self.cache_dir,
+            ),
+        ) as executor:
+            futures = {f: executor.submit(_validate_file_in_worker, f) for f in by_size}
+            results = []
+            for f in xml_files:
+                result, (hits, misses) = futures[f].result()
+                if self.xsd_cache:
+                    self.xsd_cache.hits += hits
+                    self.xsd_cache.misses += misses
+                results.append(result)
+            return results
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,66 +974,29 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
-
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
-
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
-
-        return lxml.etree.ElementTree(xml_copy)
-
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
-
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
-
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+    def _load_schema(self, schema_path):
+        """Return the compiled XMLSchema for a schema path.
 
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+        Compiling the OOXML schemas dominates validation time, so each schema is
+        compiled once per process and reused until its mtime changes. Only
+        called on XSD result cache misses (see _validate_part_xsd()).
+        """
+        schema_path = Path(schema_path).resolve()
+        mtime = schema_path.stat().st_mtime_ns
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+        cached = _SCHEMA_CACHE.get(schema_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
 
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(
+                xsd_file, parser=parser, base_url=str(schema_path)
+            )
+            schema = lxml.etree.XMLSchema(xsd_doc)
 
-        return xml_doc
+        _SCHEMA_CACHE[schema_path] = (mtime, schema)
+        return schema
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
@@ -830,121 +1005,164 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            return self._validate_part_xsd(
+                xml_file.read_bytes,
+                lambda: self._parse_part(xml_file),
+                schema_path,
+                xml_file.relative_to(base_path),
+            )
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        except Exception as e:
+            return False, {str(e)}
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+    def _validate_part_xsd(self, read, parse, schema_path, relative_path):
+        """Validate a part against an XSD schema without modifying its tree.
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        The part is only parsed on XSD result cache misses.
 
-            # Validate
-            if schema.validate(xml_doc):
-                return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
+        Args:
+            read: Callable returning the raw bytes of the part (the cache key)
+            parse: Callable returning the parsed lxml tree of the part
+            schema_path: Path to the XSD schema for the part
+            relative_path: Path of the part inside the package (e.g. word/document.xml)
 
-        except Exception as e:
-            return False, {str(e)}
+        Returns:
+            tuple: (is_valid, errors_set)
+        """
+        clean = bool(
+            relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
+
+        # Reuse the result of an earlier run on identical content
+        cache_key = None
+        if self.xsd_cache:
+            cache_key = self._xsd_cache_key(read(), schema_path, clean)
+            cached = self.xsd_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Load schema
+        schema = self._load_schema(schema_path)
+
+        # Preprocess a copy of the XML
+        xml_doc = self._prepare_for_xsd(parse(), clean)
+
+        # Validate
+        if schema.validate(xml_doc):
+            is_valid, errors = True, set()
+        else:
+            errors = set()
+            for error in schema.error_log:
+                # Store normalized error message (without line numbers for comparison)
+                errors.add(error.message)
+            is_valid = False
+
+        if cache_key:
+            self.xsd_cache.put(cache_key, is_valid, errors)
+        return is_valid, errors
+
+    def _xsd_cache_key(self, data, schema_path, clean):
+        """Build the XSDResultCache key for validating part bytes against a schema."""
+        schema_path = Path(schema_path).resolve()
+        digest = hashlib.sha256(data)
+        return schema_path, schema_path.stat().st_mtime_ns, clean, digest.hexdigest()
 
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The original package is read in memory and its baseline errors are
+        memoized, so each part of the original is validated at most once.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        member_name = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        package = self.original_package
+        if not package.has(member_name):
+            # File didn't exist in original, so no original errors
+            return set()
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
+        def compute_errors():
+            try:
+                _, errors = self._validate_part_xsd(
+                    lambda: package.read(member_name),
+                    lambda: package.parse(member_name, keep=not self.streaming),
+                    schema_path,
+                    relative_path,
+                )
+            except Exception as e:
+                errors = {str(e)}
             return errors if errors else set()
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
+        return package.memoize(("xsd", member_name, schema_path), compute_errors)
 
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+    def _prepare_for_xsd(self, xml_doc, clean):
+        """Return a copy of a tree preprocessed for XSD validation.
 
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
-        """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
+        The tree is deep-copied once and then modified in place:
+        - template tags ({{ ... }}) are removed from text and tails, except in
+          *:t elements, where they are document content
+        - mc:Ignorable is removed from the root element
+        - if clean is True, attributes and elements (with their tails) outside
+          OOXML_NAMESPACES are removed
 
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
+        Foreign namespaces are found from the namespace declarations and
+        stripped with lxml's wildcard strip functions, so apart from parts that
+        contain template tags, no element-by-element Python work is needed.
 
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
+        Args:
+            xml_doc: Parsed lxml tree, which is not modified
+            clean: Remove content in non-OOXML namespaces
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+        Returns:
+            lxml.etree._ElementTree: The preprocessed copy
+        """
+        xml_copy = copy.deepcopy(xml_doc)
+        root = xml_copy.getroot()
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
+
+        # Strip template tags (comments are skipped by iterating elements only).
+        # Most parts have none, which a single XPath test finds out cheaply.
+        if _COUNT_TEMPLATE_TEXT(root):
+            for elem in root.iter(lxml.etree.Element):
+                tag = elem.tag
+                if tag.endswith("}t") or tag == "t":
+                    continue
+                if elem.text and "{{" in elem.text:
+                    elem.text = TEMPLATE_TAG_PATTERN.sub("", elem.text)
+                if elem.tail and "{{" in elem.tail:
+                    elem.tail = TEMPLATE_TAG_PATTERN.sub("", elem.tail)
+
+        if clean:
+            # Every namespace in use is declared somewhere (apart from xml:)
+            declared = {
+                namespace
+                for _, (_, namespace) in lxml.etree.iterwalk(
+                    root, events=("start-ns",)
+                )
+            }
+            foreign = [
+                f"{{{namespace}}}*"
+                for namespace in sorted(declared - self.OOXML_NAMESPACES)
+            ]
+            if foreign:
+                # The root element itself is never removed
+                lxml.etree.strip_attributes(root, *foreign)
+                lxml.etree.strip_elements(root, *foreign, with_tail=True)
+
+        return xml_copy
 
 
 if __name__ == "__main__":
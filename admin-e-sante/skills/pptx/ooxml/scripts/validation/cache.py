@@ -0,0 +1,128 @@
+"""
+On-disk cache of XSD validation results, shared between runs and processes.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+# File name of the cache database inside the cache directory
+CACHE_FILE = "xsd-results.sqlite"
+
+# SQL condition selecting the row for a normalized cache key
+_KEY_CONDITION = "schema = ? AND schema_mtime = ? AND clean = ? AND digest = ?"
+
+
+class XSDResultCache:
+    """SQLite-backed map from (schema, part content) to XSD validation results.
+
+    Entries are keyed by the schema path and mtime, whether foreign namespaces
+    were cleaned before validation, and a hash of the raw part bytes, so any
+    change to the schema or the part misses the cache. Re-formatting a part
+    (e.g. pretty-printing) also misses it, which costs a validation but never
+    returns a wrong result.
+
+    The database uses WAL journaling and a busy timeout, so several validator
+    processes can read and write it at once. The least recently used entries
+    are evicted once max_entries is exceeded. Database errors, and a cache
+    directory that can't be created, never fail validation; they are treated
+    as cache misses.
+    """
+
+    def __init__(self, cache_dir, max_entries=10000, timeout=30):
+        """
+        Args:
+            cache_dir: Directory holding the cache database (created if missing)
+            max_entries: Maximum number of results kept before evicting old ones
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.path = Path(cache_dir) / CACHE_FILE
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+
+    def _connect(self):
+        """Open the database on first use, creating the table if needed."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " schema TEXT NOT NULL,"
+                " schema_mtime INTEGER NOT NULL,"
+                " clean INTEGER NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " is_valid INTEGER NOT NULL,"
+                " errors TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (schema, schema_mtime, clean, digest))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, key):
+        """Return the cached (is_valid, errors_set) for key, or None on a miss.
+
+        Args:
+            key: (schema_path, schema_mtime_ns, clean, digest) tuple
+        """
+        key = self._normalize(key)
+        try:
+            connection = self._connect()
+            row = connection.execute(
+                f"SELECT is_valid, errors FROM results WHERE {_KEY_CONDITION}",
+                key,
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    f"UPDATE results SET last_used = ? WHERE {_KEY_CONDITION}",
+                    (time.time(), *key),
+                )
+        except (sqlite3.Error, OSError):
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bool(row[0]), set(json.loads(row[1]))
+
+    def put(self, key, is_valid, errors):
+        """Store a validation result and evict entries beyond max_entries."""
+        try:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *self._normalize(key),
+                    int(bool(is_valid)),
+                    json.dumps(sorted(errors)),
+                    time.time(),
+                ),
+            )
+            connection.execute(
+                "DELETE FROM results WHERE rowid IN ("
+                " SELECT rowid FROM results ORDER BY last_used DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        except (sqlite3.Error, OSError):
+            pass
+
+    @staticmethod
+    def _normalize(key):
+        schema_path, schema_mtime, clean, digest = key
+        return str(schema_path), int(schema_mtime), int(bool(clean)), digest
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,193 @@
+"""
+Read-only view of the original Office file used as the validation baseline.
+"""
+
+import hashlib
+import io
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+
+import lxml.etree
+
+# Packages shared by every validator in this process, most recently used last.
+# Format: resolved path -> OriginalPackage
+_PACKAGES = OrderedDict()
+_MAX_PACKAGES = 4
+
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# Local names of elements whose text is always content, even if whitespace-only
+_TEXT_ELEMENTS = {"t", "delText", "instrText", "delInstrText"}
+
+
+def content_digest(tree):
+    """Return a digest of an XML tree that ignores formatting-only differences.
+
+    Element names, attributes, root namespace declarations and text are hashed,
+    while whitespace-only text between elements (e.g. from pretty-printing) and
+    comments are ignored. Whitespace is kept wherever it is document content:
+    in text-holding elements such as w:t, w:delText and w:instrText, and
+    anywhere xml:space="preserve" applies.
+    """
+    events = lxml.etree.iterwalk(
+        tree.getroot(), events=("start", "end", "comment", "pi")
+    )
+    return _digest_events(events, prune=False)
+
+
+def stream_digest(source):
+    """Return the content_digest() of an XML file without building its tree.
+
+    Elements are discarded as soon as they have been hashed, so memory use is
+    bounded by the depth of the document rather than its size.
+
+    Args:
+        source: File path or file-like object to parse
+    """
+    if isinstance(source, Path):
+        source = str(source)
+    events = lxml.etree.iterparse(source, events=("start", "end", "comment", "pi"))
+    return _digest_events(events, prune=True)
+
+
+def _digest_events(events, prune):
+    """Hash start/end/comment/pi events of a tree walk or an iterparse stream.
+
+    Text and tails are read as late as possible: an element's text when its
+    first child or its end is reached, and a node's tail when the next sibling
+    or the end of its parent is reached. Both are complete by then, even while
+    iterparse is still building the tree. With prune=True, nodes are removed
+    from the tree once their tail has been hashed.
+    """
+    digest = hashlib.sha256()
+
+    def update(*parts):
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+
+    def significant(text, keep):
+        return text if text and (keep or text.strip()) else None
+
+    # One frame per open element: [element, preserve, text pending, last child].
+    # xml:space is inherited, so each frame records whether it applies.
+    stack = []
+
+    def flush(frame):
+        elem, preserve, text_pending, child = frame
+        if text_pending:
+            keep = preserve or elem.tag.rpartition("}")[2] in _TEXT_ELEMENTS
+            if significant(elem.text, keep):
+                update("#text", elem.text)
+            frame[2] = False
+        if child is not None:
+            # Comments and processing instructions are skipped, but not their tails
+            if significant(child.tail, preserve):
+                update("#tail", child.tail)
+            if prune:
+                elem.remove(child)
+            frame[3] = None
+
+    for event, node in events:
+        if not stack and event != "start":
+            continue  # Outside the root element
+        if stack:
+            flush(stack[-1])
+        if event == "start":
+            if not stack:
+                nsmap = sorted((k or "", v) for k, v in node.nsmap.items())
+                digest.update(repr(nsmap).encode())
+            space = node.get(_XML_SPACE)
+            preserve = stack[-1][1] if stack else False
+            if space is not None:
+                preserve = space == "preserve"
+            update("<", node.tag, *(f"{k}={v}" for k, v in sorted(node.attrib.items())))
+            stack.append([node, preserve, True, None])
+        elif event == "end":
+            stack.pop()
+            update(">")
+            if stack:
+                stack[-1][3] = node
+        else:
+            stack[-1][3] = node
+
+    return digest.hexdigest()
+
+
+class OriginalPackage:
+    """In-memory reader for the members of an original .docx/.pptx/.xlsx file.
+
+    The archive is read into memory once and members are decompressed on demand,
+    so validators never extract the original to disk. Parsed trees and any
+    derived results (such as baseline XSD errors) are memoized per member.
+
+    Trees returned by parse() are shared and must not be modified.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        stat = self.path.stat()
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self._zip = zipfile.ZipFile(io.BytesIO(self.path.read_bytes()))
+        self._names = set(self._zip.namelist())
+        self._trees = {}
+        self._memo = {}
+
+    @classmethod
+    def open(cls, path):
+        """Return the shared package for path, reloading it if the file changed."""
+        key = Path(path).resolve()
+        stat = key.stat()
+        package = _PACKAGES.get(key)
+        if package is None or package.signature != (stat.st_mtime_ns, stat.st_size):
+            package = cls(key)
+            _PACKAGES[key] = package
+            while len(_PACKAGES) > _MAX_PACKAGES:
+                _PACKAGES.popitem(last=False)
+        _PACKAGES.move_to_end(key)
+        return package
+
+    def has(self, name):
+        """Check whether the package contains a member (e.g. 'word/document.xml')."""
+        return name in self._names
+
+    def read(self, name):
+        """Return the raw bytes of a member."""
+        return self._zip.read(name)
+
+    def parse(self, name, keep=True):
+        """Return the parsed lxml tree of a member, parsing it at most once.
+
+        With keep=False a tree that is not already cached is parsed for this
+        call only, which bounds memory when members are very large.
+        """
+        if name in self._trees:
+            return self._trees[name]
+        tree = lxml.etree.parse(io.BytesIO(self.read(name)))
+        if keep:
+            self._trees[name] = tree
+        return tree
+
+    def digest(self, name, keep=True):
+        """Return the content_digest() of a member, computing it at most once.
+
+        With keep=False a member that is not already parsed is streamed instead.
+        """
+
+        def compute():
+            if keep or name in self._trees:
+                return content_digest(self.parse(name))
+            return stream_digest(io.BytesIO(self.read(name)))
+
+        return self.memoize(("digest", name), compute)
+
+    def memoize(self, key, compute):
+        """Return a cached result for key, calling compute() on first use."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
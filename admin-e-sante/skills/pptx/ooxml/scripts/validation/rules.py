@@ -0,0 +1,249 @@
+"""
+Rules for the single-pass validation walk over each XML part.
+
+Instead of walking every tree once per check, each rule declares which element
+tags it wants to see, and BaseSchemaValidator walks every part once,
+dispatching start/end events to all interested rules.
+"""
+
+from pathlib import Path
+
+import lxml.etree
+
+
+class ValidationRule:
+    """Base class for checks that run during the shared tree walk.
+
+    Subclasses set START_TAGS and END_TAGS to the Clark-notation tags
+    ("{namespace}local") they want events for. None means every element and an
+    empty set means no events. Text content is only guaranteed to be available
+    in end events.
+
+    Rules must not modify the tree or look at ancestors/descendants; state that
+    depends on nesting (e.g. "inside w:del") is tracked with start/end events.
+    This lets the same rules run on parsed trees and on streamed parts (see
+    iterparse_elements), where elements are discarded after their end event.
+    """
+
+    START_TAGS = frozenset()
+    END_TAGS = frozenset()
+
+    # True if the rule only reports problems found within each part, so that
+    # incremental validation may skip parts unchanged from the original. Rules
+    # that compare state across parts (e.g. global IDs) must leave this False.
+    PART_LOCAL = False
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+        self.xml_file = None
+
+    def begin_part(self, xml_file, root):
+        """Prepare for a new part. Return False to skip this part entirely.
+
+        root is the part's root element, or None when the part is streamed.
+        """
+        self.xml_file = xml_file
+        return True
+
+    def start(self, elem):
+        """Handle the start of an element in START_TAGS."""
+
+    def end(self, elem):
+        """Handle the end of an element in END_TAGS."""
+
+    def end_part(self):
+        """Finish processing the current part."""
+
+    def wants_part(self, xml_file):
+        """Check whether this rule inspects the given file at all."""
+        return True
+
+    def part_error(self, xml_file, error):
+        """Record an error raised while parsing or processing a part."""
+        self.errors.append(f"  {self.relative_path(xml_file)}: Error: {error}")
+
+    def relative_path(self, xml_file):
+        return xml_file.relative_to(self.validator.unpacked_dir)
+
+
+def iterparse_elements(source):
+    """Yield ("start"/"end", element) events for an XML file in bounded memory.
+
+    Each element is cleared after its end event and removed from its parent
+    together with earlier siblings, so only the path from the root to the
+    current element stays in memory. Attributes are available at start events
+    and text at end events, by which time its children have been cleared.
+
+    Args:
+        source: File path or file-like object to parse
+    """
+    if isinstance(source, Path):
+        source = str(source)
+    for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+        yield event, elem
+        if event == "end":
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def local_name(tag):
+    """Return the lowercase local name of a Clark-notation tag or attribute."""
+    return tag.split("}")[-1].lower() if "}" in tag else tag.lower()
+
+
+class UniqueIdRule(ValidationRule):
+    """IDs listed in UNIQUE_ID_REQUIREMENTS must be unique per file or globally.
+
+    Elements inside mc:AlternateContent are ignored, since the same content is
+    legitimately repeated in each mc:Choice/mc:Fallback branch.
+    """
+
+    START_TAGS = None
+    END_TAGS = None
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.alternate_content_tag = f"{{{validator.MC_NAMESPACE}}}AlternateContent"
+        self.global_ids = {}  # Track globally unique IDs across all files
+
+    def begin_part(self, xml_file, root):
+        super().begin_part(xml_file, root)
+        self.file_ids = {}  # Track IDs that must be unique within this file
+        self.skip_depth = 0
+        return True
+
+    def start(self, elem):
+        if elem.tag == self.alternate_content_tag:
+            self.skip_depth += 1
+        if self.skip_depth:
+            return
+
+        # Check if this element type has ID uniqueness requirements
+        tag = local_name(elem.tag)
+        if tag not in self.requirements:
+            return
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            if local_name(attr) == attr_name:
+                id_value = value
+                break
+        if id_value is None:
+            return
+
+        relative_path = self.relative_path(self.xml_file)
+        if scope == "global":
+            # Check global uniqueness
+            if id_value in self.global_ids:
+                prev_file, prev_line, prev_tag = self.global_ids[id_value]
+                self.errors.append(
+                    f"  {relative_path}: "
+                    f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
+                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                )
+            else:
+                self.global_ids[id_value] = (relative_path, elem.sourceline, tag)
+        elif scope == "file":
+            # Check file-level uniqueness
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.errors.append(
+                    f"  {relative_path}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {ids[id_value]})"
+                )
+            else:
+                ids[id_value] = elem.sourceline
+
+    def end(self, elem):
+        if elem.tag == self.alternate_content_tag:
+            self.skip_depth -= 1
+
+
+class RelationshipIdRule(ValidationRule):
+    """r:id attributes must reference an existing ID in the part's .rels file."""
+
+    START_TAGS = None
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.rid_attr = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+
+    def wants_part(self, xml_file):
+        # Skip .rels files themselves and parts without a .rels file (that's okay)
+        # For dir/file.xml, it's dir/_rels/file.xml.rels
+        return xml_file.suffix != ".rels" and self._rels_file(xml_file).exists()
+
+    def _rels_file(self, xml_file):
+        return xml_file.parent / "_rels" / f"{xml_file.name}.rels"
+
+    def begin_part(self, xml_file, root):
+        super().begin_part(xml_file, root)
+        validator = self.validator
+        rels_file = self._rels_file(xml_file)
+
+        # Parse the .rels file to get valid relationship IDs and their types
+        rels_root = validator._parse_part(rels_file).getroot()
+        self.rid_to_type = {}
+
+        for rel in rels_root.findall(
+            f".//{{{validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            rid = rel.get("Id")
+            rel_type = rel.get("Type", "")
+            if rid:
+                # Check for duplicate rIds
+                if rid in self.rid_to_type:
+                    self.errors.append(
+                        f"  {self.relative_path(rels_file)}: Line {rel.sourceline}: "
+                        f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                    )
+                # Extract just the type name from the full URL
+                type_name = rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                self.rid_to_type[rid] = type_name
+        return True
+
+    def start(self, elem):
+        # Check for r:id attribute (relationship ID)
+        rid_attr = elem.get(self.rid_attr)
+        if not rid_attr:
+            return
+
+        validator = self.validator
+        rid_to_type = self.rid_to_type
+        xml_rel_path = self.relative_path(self.xml_file)
+        elem_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+
+        # Check if the ID exists
+        if rid_attr not in rid_to_type:
+            self.errors.append(
+                f"  {xml_rel_path}: Line {elem.sourceline}: "
+                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+            )
+        # Check if we have type expectations for this element
+        elif validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        f"  {xml_rel_path}: Line {elem.sourceline}: "
+                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship"
+                    )
+
+    def part_error(self, xml_file, error):
+        self.errors.append(f"  Error processing {self.relative_path(xml_file)}: {error}")
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,224 @@
+"""
+In-process word diff of document text, in the style of git's --word-diff=plain.
+"""
+
+import re
+
+# Most insertions + deletions Myers' algorithm looks for at each level before
+# giving up: between paragraph lists, then within one changed region
+MAX_LINE_EDITS = 1000
+MAX_CHAR_EDITS = 400
+MAX_WORD_EDITS = 400
+
+# Tokens for the word-level fallback: runs of whitespace and of other characters
+WORD_PATTERN = re.compile(r"\s+|\S+")
+
+
+def myers_opcodes(a, b, max_edits=None):
+    """Return difflib-style opcodes turning sequence a into sequence b.
+
+    Uses Myers' O(ND) algorithm after trimming the common prefix and suffix.
+    Opcodes are (tag, i1, i2, j1, j2) tuples with tag "equal", "replace",
+    "delete" or "insert", as in difflib.SequenceMatcher.get_opcodes().
+
+    Args:
+        a: Original sequence (string or list)
+        b: Modified sequence
+        max_edits: Give up once more than this many insertions + deletions
+            are needed (None = no limit)
+
+    Returns:
+        list: The opcodes, or None if max_edits was exceeded
+    """
+    n, m = len(a), len(b)
+    prefix, suffix = _common_affixes(a, b)
+    edits = _myers_edits(a[prefix : n - suffix], b[prefix : m - suffix], max_edits)
+    if edits is None:
+        return None
+
+    opcodes = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    for tag, i1, i2, j1, j2 in edits:
+        opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(("equal", n - suffix, n, m - suffix, m))
+    return opcodes
+
+
+def _common_affixes(a, b):
+    """Return the lengths of the common prefix and (non-overlapping) suffix."""
+    n, m = len(a), len(b)
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and suffix < m - prefix
+        and a[n - 1 - suffix] == b[m - 1 - suffix]
+    ):
+        suffix += 1
+    return prefix, suffix
+
+
+def _myers_edits(a, b, max_edits):
+    """Myers' greedy shortest edit script as opcodes, or None past max_edits."""
+    n, m = len(a), len(b)
+    limit = n + m if max_edits is None else min(n + m, max_edits)
+
+    # v maps diagonal k = x - y to the furthest x reached on it; trace[d]
+    # holds v as it was before round d, for backtracking
+    v = {1: 0}
+    trace = []
+    for d in range(limit + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]  # Come from diagonal k + 1 by an insertion
+            else:
+                x = v[k - 1] + 1  # Come from diagonal k - 1 by a deletion
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, n, m):
+    """Recover the opcodes from the Myers trace, walking back from (n, m)."""
+    steps = []  # (kind, x, y) in reverse order
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            steps.append(("equal", x, y))
+        if x == prev_x:
+            y -= 1
+            steps.append(("insert", x, y))
+        else:
+            x -= 1
+            steps.append(("delete", x, y))
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        steps.append(("equal", x, y))
+
+    # Group consecutive steps into equal and changed runs
+    runs = []
+    for kind, x, y in reversed(steps):
+        group = "equal" if kind == "equal" else "change"
+        if not runs or runs[-1][0] != group:
+            runs.append([group, x, x, y, y])
+        if kind != "insert":
+            runs[-1][2] = x + 1
+        if kind != "delete":
+            runs[-1][4] = y + 1
+
+    return [(_opcode_tag(*run), *run[1:]) for run in runs]
+
+
+def _opcode_tag(group, i1, i2, j1, j2):
+    if group == "equal":
+        return "equal"
+    if i1 < i2 and j1 < j2:
+        return "replace"
+    return "delete" if i1 < i2 else "insert"
+
+
+def word_diff(original_text, modified_text, max_regions=20):
+    """Show the differences between two texts as [-deleted-]{+inserted+} markup.
+
+    Paragraphs (lines) are aligned first; each changed region is then diffed
+    character by character, falling back to words and finally to the whole
+    region when the difference is too large. Only changed lines are shown,
+    without context, like git diff --word-diff=plain -U0.
+
+    Args:
+        original_text: Original text, one paragraph per line
+        modified_text: Modified text, one paragraph per line
+        max_regions: Stop after this many changed regions
+
+    Returns:
+        str: The marked-up changed lines, or None if the texts are equal
+    """
+    if original_text == modified_text:
+        return None
+
+    old_lines = original_text.split("\n")
+    new_lines = modified_text.split("\n")
+    opcodes = myers_opcodes(old_lines, new_lines, MAX_LINE_EDITS)
+    if opcodes is None:
+        # Too many paragraph changes to align: treat everything between the
+        # common prefix and suffix as one changed region
+        prefix, suffix = _common_affixes(old_lines, new_lines)
+        opcodes = [
+            (
+                "replace",
+                prefix,
+                len(old_lines) - suffix,
+                prefix,
+                len(new_lines) - suffix,
+            )
+        ]
+
+    changes = [op for op in opcodes if op[0] != "equal"]
+    output = []
+    for _, i1, i2, j1, j2 in changes[:max_regions]:
+        old = "\n".join(old_lines[i1:i2])
+        new = "\n".join(new_lines[j1:j2])
+        output.extend(
+            line for line in _mark_up_region(old, new).split("\n") if line.strip()
+        )
+    if len(changes) > max_regions:
+        output.append(f"... {len(changes) - max_regions} more changed region(s)")
+    return "\n".join(output)
+
+
+def _mark_up_region(old, new):
+    """Render one changed region with character- or word-level markup."""
+    for tokens, max_edits in ((list, MAX_CHAR_EDITS), (_words, MAX_WORD_EDITS)):
+        a, b = tokens(old), tokens(new)
+        opcodes = myers_opcodes(a, b, max_edits)
+        if opcodes is not None:
+            break
+    else:
+        a, b = [old], [new]
+        opcodes = [("replace", 0, 1, 0, 1)]
+
+    parts = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            parts.append("".join(a[i1:i2]))
+            continue
+        parts.append(_wrap("".join(a[i1:i2]), "[-", "-]"))
+        parts.append(_wrap("".join(b[j1:j2]), "{+", "+}"))
+    return "".join(parts)
+
+
+def _words(text):
+    return WORD_PATTERN.findall(text)
+
+
+def _wrap(text, open_marker, close_marker):
+    """Wrap text in markers, line by line so that markers never span lines."""
+    return "\n".join(
+        f"{open_marker}{piece}{close_marker}" if piece else piece
+        for piece in text.split("\n")
+    )
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")